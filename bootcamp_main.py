@@ -4,6 +4,7 @@ Bootcamp F2025
 Main process to setup and manage all the other working processes
 """
 
+import asyncio
 import multiprocessing as mp
 import time
 
@@ -12,10 +13,17 @@ from pymavlink import mavutil
 from modules.common.modules.logger import logger
 from modules.common.modules.logger import logger_main_setup
 from modules.common.modules.read_yaml import read_yaml
+from modules.async_pipeline import async_pipeline
 from modules.command import command
+from modules.command import command_gate
 from modules.command import command_worker
+from modules.flight_recorder import flight_recorder
 from modules.heartbeat import heartbeat_receiver_worker
 from modules.heartbeat import heartbeat_sender_worker
+from modules.mavlink_router import mavlink_router_worker
+from modules.mavlink_router import router_connection
+from modules.rate_converter import rate_converter
+from modules.rate_converter import rate_converter_worker
 from modules.telemetry import telemetry_worker
 from utilities.workers import queue_proxy_wrapper
 from utilities.workers import worker_controller
@@ -31,7 +39,33 @@ CONNECTION_STRING = "tcp:localhost:12345"
 # Set queue max sizes (<= 0 for infinity)
 COMMAND_QUEUE_SIZE = 5
 TELEMETRY_QUEUE_SIZE = 10
+# Command only needs the latest telemetry, TELEMETRY_QUEUE_SIZE is ignored if conflating
+TELEMETRY_QUEUE_CONFLATE = False
+# Output telemetry on every position or attitude message, extrapolating the other
+TELEMETRY_FUSION = False
+# Reduce telemetry to the rate each consumer needs, 0 Hz for every telemetry
+USE_RATE_CONVERTER = False
+COMMAND_TELEMETRY_RATE = 0.0  # Hz
+TELEMETRY_STATUS_RATE = 1.0  # Hz
+TELEMETRY_STATUS_MODE = rate_converter.RateMode.AVERAGE
+# What workers do when main is slow to read
+COMMAND_QUEUE_POLICY = queue_proxy_wrapper.OverflowPolicy.BLOCK_TIMEOUT
+COMMAND_QUEUE_PUT_TIMEOUT = 0.1  # seconds
+HB_QUEUE_POLICY = queue_proxy_wrapper.OverflowPolicy.DROP_OLDEST
 HB_QUEUE_SIZE = 5
+QUEUE_SHUTDOWN_TIMEOUT = 1.0  # seconds
+# Record queue depth, blocking and latency, logged every QUEUE_STATISTICS_PERIOD
+QUEUE_INSTRUMENTATION = False
+QUEUE_STATISTICS_PERIOD = 10.0  # seconds
+# "processes" runs each worker in its own process, "asyncio" runs them all as coroutines
+EXECUTION_MODE = "processes"
+RUN_TIME = 100  # seconds
+# Route all MAVLink traffic through one process which owns the connection
+USE_ROUTER = False
+ROUTER_QUEUE_SIZE = 10
+# Record all traffic, requires the router or asyncio
+RECORD_FLIGHT = False
+RECORDING_DIRECTORY = "logs/recordings"
 
 # Set worker counts
 HB_RECEIVER_WORKER_COUNT = 1
@@ -41,6 +75,10 @@ COMMAND_WORKER_COUNT = 1
 # Any other constants
 HEARTBEAT_TIME = 1.0
 TARGET_POSITION = command.Position(0.0, 0.0, 5.0)
+# Suppress repeated commands the drone is already executing
+USE_COMMAND_GATE = False
+COMMAND_MIN_INTERVAL = 1.0  # seconds
+COMMAND_IN_FLIGHT_TIMEOUT = 5.0  # seconds
 # =================================================================================================
 #                            ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
 # =================================================================================================
@@ -79,21 +117,161 @@ def main() -> int:
     # =============================================================================================
     #                          ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
     # =============================================================================================
+    gate = None
+    if USE_COMMAND_GATE:
+        result, gate = command_gate.CommandGate.create(
+            COMMAND_MIN_INTERVAL, COMMAND_IN_FLIGHT_TIMEOUT
+        )
+        if not result:
+            main_logger.error("Failed to create command gate!")
+            return -1
+
+    recording_path = None
+    if RECORD_FLIGHT:
+        recording_path = f"{RECORDING_DIRECTORY}/flight_{time.strftime('%Y%m%d_%H%M%S')}"
+
+    if EXECUTION_MODE == "asyncio":
+        recorder = None
+        if recording_path is not None:
+            result, recorder = flight_recorder.FlightRecorder.create(recording_path)
+            if not result:
+                main_logger.error("Failed to create flight recorder!")
+                return -1
+
+            # Get Pylance to stop complaining
+            assert recorder is not None
+
+            recorder.attach(connection)
+
+        result, pipeline = async_pipeline.AsyncPipeline.create(
+            connection, TARGET_POSITION, HEARTBEAT_TIME, main_logger, gate
+        )
+        if not result:
+            main_logger.error("Failed to create async pipeline!")
+            return -1
+
+        # Get Pylance to stop complaining
+        assert pipeline is not None
+
+        asyncio.run(pipeline.run(RUN_TIME))
+        if recorder is not None:
+            recorder.close()
+        main_logger.info("Stopped")
+        return 0
+
     # Create a worker controller
     controller = worker_controller.WorkerController()
     # Create a multiprocess manager for synchronized queues
     mp_manager = mp.Manager()
     # Create queues
-    telemetry_queue = queue_proxy_wrapper.QueueProxyWrapper(mp_manager, TELEMETRY_QUEUE_SIZE)
-    hb_queue = queue_proxy_wrapper.QueueProxyWrapper(mp_manager, HB_QUEUE_SIZE)
-    command_queue = queue_proxy_wrapper.QueueProxyWrapper(mp_manager, COMMAND_QUEUE_SIZE)
+    # The rate converter needs every telemetry, otherwise this is what Command reads
+    telemetry_queue = queue_proxy_wrapper.QueueProxyWrapper(
+        mp_manager,
+        TELEMETRY_QUEUE_SIZE,
+        conflate=TELEMETRY_QUEUE_CONFLATE and not USE_RATE_CONVERTER,
+        instrument=QUEUE_INSTRUMENTATION,
+    )
+    hb_queue = queue_proxy_wrapper.QueueProxyWrapper(
+        mp_manager,
+        HB_QUEUE_SIZE,
+        instrument=QUEUE_INSTRUMENTATION,
+        overflow_policy=HB_QUEUE_POLICY,
+    )
+    command_queue = queue_proxy_wrapper.QueueProxyWrapper(
+        mp_manager,
+        COMMAND_QUEUE_SIZE,
+        instrument=QUEUE_INSTRUMENTATION,
+        overflow_policy=COMMAND_QUEUE_POLICY,
+        put_timeout=COMMAND_QUEUE_PUT_TIMEOUT,
+    )
+    named_queues = [
+        ("Heartbeat", hb_queue),
+        ("Telemetry", telemetry_queue),
+        ("Command", command_queue),
+    ]
+    command_telemetry_queue = telemetry_queue
+    status_telemetry_queue = None
+    if USE_RATE_CONVERTER:
+        command_telemetry_queue = queue_proxy_wrapper.QueueProxyWrapper(
+            mp_manager,
+            TELEMETRY_QUEUE_SIZE,
+            conflate=TELEMETRY_QUEUE_CONFLATE,
+            instrument=QUEUE_INSTRUMENTATION,
+        )
+        status_telemetry_queue = queue_proxy_wrapper.QueueProxyWrapper(
+            mp_manager,
+            TELEMETRY_QUEUE_SIZE,
+            instrument=QUEUE_INSTRUMENTATION,
+            overflow_policy=queue_proxy_wrapper.OverflowPolicy.DROP_OLDEST,
+        )
+        named_queues += [
+            ("Command telemetry", command_telemetry_queue),
+            ("Status telemetry", status_telemetry_queue),
+        ]
+
+    # Each worker gets its own view of the router, otherwise they share the connection
+    hb_sender_connection = connection
+    hb_receiver_connection = connection
+    telemetry_connection = connection
+    command_connection = connection
+    if USE_ROUTER:
+        # Sends wait rather than drop, inbound messages drop the oldest rather than stall the router
+        outbound_queue = queue_proxy_wrapper.QueueProxyWrapper(
+            mp_manager, ROUTER_QUEUE_SIZE, instrument=QUEUE_INSTRUMENTATION
+        )
+        hb_inbound_queue = queue_proxy_wrapper.QueueProxyWrapper(
+            mp_manager,
+            ROUTER_QUEUE_SIZE,
+            instrument=QUEUE_INSTRUMENTATION,
+            overflow_policy=queue_proxy_wrapper.OverflowPolicy.DROP_OLDEST,
+        )
+        telemetry_inbound_queue = queue_proxy_wrapper.QueueProxyWrapper(
+            mp_manager,
+            ROUTER_QUEUE_SIZE,
+            instrument=QUEUE_INSTRUMENTATION,
+            overflow_policy=queue_proxy_wrapper.OverflowPolicy.DROP_OLDEST,
+        )
+        named_queues += [
+            ("Router outbound", outbound_queue),
+            ("Router heartbeat", hb_inbound_queue),
+            ("Router telemetry", telemetry_inbound_queue),
+        ]
+        subscriptions = {
+            "HEARTBEAT": [hb_inbound_queue],
+            "ATTITUDE": [telemetry_inbound_queue],
+            "LOCAL_POSITION_NED": [telemetry_inbound_queue],
+        }
+
+        hb_sender_connection = router_connection.RouterConnection(None, outbound_queue)
+        hb_receiver_connection = router_connection.RouterConnection(
+            hb_inbound_queue, outbound_queue
+        )
+        telemetry_connection = router_connection.RouterConnection(
+            telemetry_inbound_queue, outbound_queue
+        )
+        command_connection = router_connection.RouterConnection(None, outbound_queue)
 
     # Create worker properties for each worker type (what inputs it takes, how many workers)
+    # Router
+    if USE_ROUTER:
+        check, router_properties = worker_manager.WorkerProperties.create(
+            count=1,
+            target=mavlink_router_worker.mavlink_router_worker,
+            work_arguments=(connection, subscriptions, recording_path),
+            input_queues=[outbound_queue],
+            output_queues=[],
+            controller=controller,
+            local_logger=main_logger,
+        )
+        if not check:
+            main_logger.error("Failed to create router properties!")
+            return -1
+
     # Heartbeat sender
     check, hb_sender_properties = worker_manager.WorkerProperties.create(
         count=HB_SENDER_WORKER_COUNT,
         target=heartbeat_sender_worker.heartbeat_sender_worker,
-        work_arguments=(connection, None),
+        work_arguments=(hb_sender_connection,),
         input_queues=[],
         output_queues=[],
         controller=controller,
@@ -106,7 +284,7 @@ def main() -> int:
     check, hb_receiver_properties = worker_manager.WorkerProperties.create(
         count=HB_RECEIVER_WORKER_COUNT,
         target=heartbeat_receiver_worker.heartbeat_receiver_worker,
-        work_arguments=(connection, HEARTBEAT_TIME),
+        work_arguments=(hb_receiver_connection, HEARTBEAT_TIME),
         input_queues=[],
         output_queues=[hb_queue],
         controller=controller,
@@ -120,7 +298,7 @@ def main() -> int:
     check, telemetry_properties = worker_manager.WorkerProperties.create(
         count=TELEMETRY_WORKER_COUNT,
         target=telemetry_worker.telemetry_worker,
-        work_arguments=(connection, None),
+        work_arguments=(telemetry_connection, TELEMETRY_FUSION),
         input_queues=[],
         output_queues=[telemetry_queue],
         controller=controller,
@@ -129,12 +307,36 @@ def main() -> int:
     if not check:
         main_logger.error("Failed to create telemetry properties!")
         return -1
+    # Rate converter
+    if USE_RATE_CONVERTER:
+        check, rate_converter_properties = worker_manager.WorkerProperties.create(
+            count=1,
+            target=rate_converter_worker.rate_converter_worker,
+            work_arguments=(
+                [
+                    (
+                        command_telemetry_queue,
+                        COMMAND_TELEMETRY_RATE,
+                        rate_converter.RateMode.LATEST,
+                    ),
+                    (status_telemetry_queue, TELEMETRY_STATUS_RATE, TELEMETRY_STATUS_MODE),
+                ],
+            ),
+            input_queues=[telemetry_queue],
+            output_queues=[],
+            controller=controller,
+            local_logger=main_logger,
+        )
+        if not check:
+            main_logger.error("Failed to create rate converter properties!")
+            return -1
+
     # Command
     check, command_properties = worker_manager.WorkerProperties.create(
         count=COMMAND_WORKER_COUNT,
         target=command_worker.command_worker,
-        work_arguments=(connection, TARGET_POSITION, None),
-        input_queues=[telemetry_queue],
+        work_arguments=(command_connection, TARGET_POSITION, gate),
+        input_queues=[command_telemetry_queue],
         output_queues=[command_queue],
         controller=controller,
         local_logger=main_logger,
@@ -144,6 +346,13 @@ def main() -> int:
         return -1
 
     # Create the workers (processes) and obtain their managers
+    # Router
+    if USE_ROUTER:
+        result, router_manager = worker_manager.WorkerManager.create(router_properties, main_logger)
+        if not result:
+            main_logger.error("Failed to create router manager!")
+            return -1
+
     # Heartbeat sender
     result, hb_sender_manager = worker_manager.WorkerManager.create(
         hb_sender_properties, main_logger
@@ -168,6 +377,15 @@ def main() -> int:
         main_logger.error("Failed to create telemetry manager!")
         return -1
 
+    # Rate converter
+    if USE_RATE_CONVERTER:
+        result, rate_converter_manager = worker_manager.WorkerManager.create(
+            rate_converter_properties, main_logger
+        )
+        if not result:
+            main_logger.error("Failed to create rate converter manager!")
+            return -1
+
     # Command
     result, command_manager = worker_manager.WorkerManager.create(command_properties, main_logger)
     if not result:
@@ -175,34 +393,63 @@ def main() -> int:
         return -1
 
     # Start worker processes
+    if USE_ROUTER:
+        router_manager.start_workers()
     hb_sender_manager.start_workers()
     hb_receiver_manager.start_workers()
     telemetry_manager.start_workers()
+    if USE_RATE_CONVERTER:
+        rate_converter_manager.start_workers()
     command_manager.start_workers()
 
     main_logger.info("Started")
 
     # Main's work: read from all queues that output to main, and log any commands that we make
-    # Continue running for 100 seconds or until the drone disconnects
+    # Continue running for RUN_TIME seconds or until the drone disconnects
     start = time.time()
-    while time.time() - start < 100:
-        command_data = command_queue.queue.get(timeout=0.1)
-        if command_data is not None:
+    last_statistics_time = start
+    # Disconnected before the first heartbeat is still connecting, so it does not stop
+    connected = False
+    while time.time() - start < RUN_TIME:
+        if time.time() - last_statistics_time >= QUEUE_STATISTICS_PERIOD:
+            last_statistics_time = time.time()
+            for name, worker_queue in named_queues:
+                result, statistics = worker_queue.get_statistics()
+                if result:
+                    main_logger.info(f"{name} queue: {statistics}")
+
+        result, command_data = command_queue.get(0.1)
+        if result and command_data is not None:
             main_logger.info(f"Received heartbeat: {command_data}")
 
-        heartbeat_data = hb_queue.queue.get(timeout=0.1)
-        if heartbeat_data is not None:
-            if heartbeat_data == "DISCONNECTED":
+        result, heartbeat_data = hb_queue.get(0.1)
+        if result and heartbeat_data is not None:
+            status, checked_time = heartbeat_data
+            if status == "DISCONNECTED" and connected:
                 break
-            main_logger.info(f"Received heartbeat: {heartbeat_data}")
+
+            connected = connected or status == "CONNECTED"
+            main_logger.info(f"Received heartbeat: {status} at {checked_time}")
+
+        if status_telemetry_queue is not None:
+            result, telemetry_data = status_telemetry_queue.get(0.0)
+            if result and telemetry_data is not None:
+                main_logger.info(f"Telemetry status: {telemetry_data}")
     # Stop the processes
     controller.request_exit()
     main_logger.info("Requested exit")
-
-    # Fill and drain queues from END TO START
-    hb_queue.fill_and_drain_queue()
-    telemetry_queue.fill_and_drain_queue()
-    command_queue.fill_and_drain_queue()
+    for name, worker_queue in named_queues:
+        drop_counts = {
+            policy.name: count for policy, count in worker_queue.get_drop_counts().items()
+        }
+        main_logger.info(f"{name} queue dropped: {drop_counts}")
+
+    # Shut down queues, which wakes every blocked worker so the order does not matter
+    for name, worker_queue in named_queues:
+        result, discarded = worker_queue.shutdown(QUEUE_SHUTDOWN_TIMEOUT)
+        if not result:
+            main_logger.warning(f"{name} queue did not shut down in time")
+        main_logger.info(f"{name} queue discarded {discarded} items")
 
     main_logger.info("Queues cleared")
 
@@ -211,6 +458,10 @@ def main() -> int:
     hb_receiver_manager.join_workers()
     hb_sender_manager.join_workers()
     telemetry_manager.join_workers()
+    if USE_RATE_CONVERTER:
+        rate_converter_manager.join_workers()
+    if USE_ROUTER:
+        router_manager.join_workers()
 
     main_logger.info("Stopped")
 
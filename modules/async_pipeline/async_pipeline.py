@@ -0,0 +1,304 @@
+"""
+Runs the whole pipeline as coroutines in a single process.
+"""
+
+import asyncio
+import collections
+import time
+from typing import Tuple, Union
+
+from pymavlink import mavutil
+
+from ..command import command
+from ..command import command_gate
+from ..common.modules.logger import logger
+from ..heartbeat import heartbeat_receiver
+from ..heartbeat import heartbeat_sender
+from ..telemetry import telemetry
+
+
+class BufferedConnection:
+    """
+    The parts of `mavutil.mavfile` the components use, fed by the pipeline's reader.
+    Never blocks, components await `wait_for_types()` instead.
+    """
+
+    __MAX_BUFFERED = 64
+
+    def __init__(self, connection: mavutil.mavfile) -> None:
+        """
+        connection: Shared connection, which sends directly.
+        """
+        self.mav = connection.mav
+        # Latest message of each type, for conditions
+        self.messages = {}
+        self.__buffer = collections.deque(maxlen=self.__MAX_BUFFERED)
+        self.__received = asyncio.Event()
+
+    def push(self, msg: mavutil.mavlink.MAVLink_message) -> None:
+        """
+        Buffers a message from the reader, dropping the oldest if full.
+        """
+        self.__buffer.append(msg)
+        self.__received.set()
+
+    async def wait_for_types(self, types: "list[str]", timeout: float) -> bool:
+        """
+        Waits until at least one message of each type is buffered.
+
+        timeout: Time waiting in seconds before giving up.
+
+        Returns whether all types are buffered.
+        """
+        try:
+            async with asyncio.timeout(timeout):
+                while not set(types).issubset(msg.get_type() for msg in self.__buffer):
+                    self.__received.clear()
+                    await self.__received.wait()
+        except TimeoutError:
+            return False
+
+        return True
+
+    def recv_msg(self) -> "mavutil.mavlink.MAVLink_message | None":
+        """
+        Oldest buffered message.
+        """
+        if len(self.__buffer) == 0:
+            return None
+
+        msg = self.__buffer.popleft()
+        self.messages[msg.get_type()] = msg
+        return msg
+
+    def recv_match(
+        self,
+        condition: "str | None" = None,
+        type: "str | list[str] | set[str] | None" = None,  # pylint: disable=redefined-builtin
+        blocking: bool = False,  # pylint: disable=unused-argument
+        timeout: "float | None" = None,  # pylint: disable=unused-argument
+    ) -> "mavutil.mavlink.MAVLink_message | None":
+        """
+        Oldest buffered message matching the condition and type, discarding any others.
+        Same arguments as `mavutil.mavfile.recv_match()`, but always returns immediately.
+        """
+        if type is not None and not isinstance(type, (list, set)):
+            type = [type]
+
+        while True:
+            msg = self.recv_msg()
+            if msg is None:
+                return None
+
+            if type is not None and msg.get_type() not in type:
+                continue
+
+            if not mavutil.evaluate_condition(condition, self.messages):
+                continue
+
+            return msg
+
+
+class AsyncPipeline:  # pylint: disable=too-many-instance-attributes
+    """
+    Hosts the heartbeat sender, heartbeat receiver, telemetry and command as coroutines
+    over the non-blocking connection, linked by asyncio queues.
+    The event loop reads the connection when it is readable and buffers each message
+    for the components which use its type.
+    """
+
+    __private_key = object()
+
+    __TELEMETRY_TYPES = ["LOCAL_POSITION_NED", "ATTITUDE"]
+    __TELEMETRY_TIMEOUT = 1.0  # seconds
+    __OUTPUT_QUEUE_SIZE = 5
+
+    @classmethod
+    def create(
+        cls,
+        connection: mavutil.mavfile,
+        target: command.Position,
+        heartbeat_time: float,
+        local_logger: logger.Logger,
+        gate: command_gate.CommandGate | None = None,
+    ) -> Tuple[bool, Union["AsyncPipeline", None]]:
+        """
+        Falliable create (instantiation) method to create an AsyncPipeline object.
+
+        connection: Connection with a file descriptor, used only by the pipeline.
+        target: Target position for commands.
+        heartbeat_time: Period in seconds of sending and checking heartbeats.
+        gate: Suppresses repeated commands, None to send every command.
+        """
+        if connection is None or getattr(connection, "fd", None) is None:
+            return False, None
+
+        if heartbeat_time <= 0.0:
+            return False, None
+
+        return True, AsyncPipeline(
+            cls.__private_key, connection, target, heartbeat_time, local_logger, gate
+        )
+
+    def __init__(
+        self,
+        key: object,
+        connection: mavutil.mavfile,
+        target: command.Position,
+        heartbeat_time: float,
+        local_logger: logger.Logger,
+        gate: command_gate.CommandGate | None,
+    ) -> None:
+        assert key is AsyncPipeline.__private_key, "Use create() method"
+
+        self.connection = connection
+        self.__target = target
+        self.__heartbeat_time = heartbeat_time
+        self.__log = local_logger
+        self.__gate = gate
+
+        # Created in the event loop by run()
+        self.__subscriptions = {}
+        self.__telemetry_queue = None
+        self.__hb_queue = None
+        self.__command_queue = None
+
+    async def run(self, duration: float) -> None:
+        """
+        Runs until the duration in seconds passes or the drone disconnects.
+        """
+        hb_receiver_connection = BufferedConnection(self.connection)
+        telemetry_connection = BufferedConnection(self.connection)
+        self.__subscriptions = {
+            "HEARTBEAT": [hb_receiver_connection],
+            "ATTITUDE": [telemetry_connection],
+            "LOCAL_POSITION_NED": [telemetry_connection],
+        }
+        # Command only needs the latest telemetry
+        self.__telemetry_queue = asyncio.Queue(1)
+        self.__hb_queue = asyncio.Queue(self.__OUTPUT_QUEUE_SIZE)
+        self.__command_queue = asyncio.Queue(self.__OUTPUT_QUEUE_SIZE)
+
+        _, hb_sender_instance = heartbeat_sender.HeartbeatSender.create(self.connection, self.__log)
+        _, hb_receiver_instance = heartbeat_receiver.HeartbeatReceiver.create(
+            hb_receiver_connection,
+            self.__log,
+            heartbeat_receiver.DISCONNECT_THRESHOLD * self.__heartbeat_time,
+        )
+        _, telemetry_instance = telemetry.Telemetry.create(telemetry_connection, self.__log)
+        _, command_instance = command.Command.create(
+            self.connection, self.__target, self.__log, self.__gate
+        )
+
+        loop = asyncio.get_running_loop()
+        loop.add_reader(self.connection.fd, self.__read)
+        tasks = [
+            asyncio.create_task(self.__run_hb_sender(hb_sender_instance)),
+            asyncio.create_task(self.__run_hb_receiver(hb_receiver_instance)),
+            asyncio.create_task(self.__run_telemetry(telemetry_instance, telemetry_connection)),
+            asyncio.create_task(self.__run_command(command_instance)),
+        ]
+        self.__log.info("Started")
+
+        try:
+            async with asyncio.timeout(duration):
+                await self.__report()
+        except TimeoutError:
+            pass
+        finally:
+            loop.remove_reader(self.connection.fd)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def __read(self) -> None:
+        """
+        Buffers every message already received, called by the event loop when readable.
+        """
+        msg = self.connection.recv_msg()
+        while msg is not None:
+            for subscriber in self.__subscriptions.get(msg.get_type(), []):
+                subscriber.push(msg)
+
+            msg = self.connection.recv_msg()
+
+    async def __report(self) -> None:
+        """
+        Main's work: log heartbeat statuses and commands until the drone disconnects.
+        Disconnected before the first heartbeat is still connecting, so it does not stop.
+        """
+        connected = False
+        hb_task = asyncio.create_task(self.__hb_queue.get())
+        command_task = asyncio.create_task(self.__command_queue.get())
+        try:
+            while True:
+                done, _ = await asyncio.wait(
+                    [hb_task, command_task], return_when=asyncio.FIRST_COMPLETED
+                )
+                if command_task in done:
+                    self.__log.info(f"Received command: {command_task.result()}")
+                    command_task = asyncio.create_task(self.__command_queue.get())
+
+                if hb_task in done:
+                    status, checked_time = hb_task.result()
+                    if status == "DISCONNECTED" and connected:
+                        return
+
+                    connected = connected or status == "CONNECTED"
+                    self.__log.info(f"Received heartbeat: {status} at {checked_time}")
+                    hb_task = asyncio.create_task(self.__hb_queue.get())
+        finally:
+            hb_task.cancel()
+            command_task.cancel()
+
+    async def __run_hb_sender(self, hb_sender_instance: heartbeat_sender.HeartbeatSender) -> None:
+        """
+        Sends a heartbeat every period.
+        """
+        while True:
+            if not hb_sender_instance.run_hb_sender():
+                self.__log.error("Failed to send heartbeat.")
+
+            await asyncio.sleep(self.__heartbeat_time)
+
+    async def __run_hb_receiver(
+        self, hb_receiver_instance: heartbeat_receiver.HeartbeatReceiver
+    ) -> None:
+        """
+        Checks for a heartbeat every period.
+        """
+        while True:
+            await asyncio.sleep(self.__heartbeat_time)
+            status = hb_receiver_instance.run_hb_receiver()
+            await self.__hb_queue.put((status, time.strftime("%H:%M:%S")))
+
+    async def __run_telemetry(
+        self, telemetry_instance: telemetry.Telemetry, telemetry_connection: BufferedConnection
+    ) -> None:
+        """
+        Combines position and attitude once both are buffered.
+        """
+        while True:
+            if not await telemetry_connection.wait_for_types(
+                self.__TELEMETRY_TYPES, self.__TELEMETRY_TIMEOUT
+            ):
+                continue
+
+            data = telemetry_instance.run_telemetry()
+            if data is None:
+                continue
+
+            # Replace telemetry command has not used yet
+            if self.__telemetry_queue.full():
+                self.__telemetry_queue.get_nowait()
+            self.__telemetry_queue.put_nowait(data)
+
+    async def __run_command(self, command_instance: command.Command) -> None:
+        """
+        Makes a decision for each telemetry.
+        """
+        while True:
+            data = await self.__telemetry_queue.get()
+            result = command_instance.run_cmd(data)
+            if result != "":
+                await self.__command_queue.put(result)
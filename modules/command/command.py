@@ -6,8 +6,11 @@ import math
 from typing import Union, Tuple
 from pymavlink import mavutil
 
+from utilities.logging_tools import sampled_logger
+from . import command_gate
 from ..common.modules.logger import logger
 from ..telemetry import telemetry
+from ..telemetry import telemetry_history
 
 
 class Position:
@@ -32,17 +35,34 @@ class Command:  # pylint: disable=too-many-instance-attributes
 
     __private_key = object()
 
+    __HEIGHT_TOLERANCE = 0.5  # m
+    __ANGLE_TOLERANCE = 5  # deg
+    __HISTORY_MEMORY_BUDGET = 1_000_000  # bytes
+    # Per telemetry messages are logged at most this often
+    __LOG_INTERVAL = 1.0  # seconds
+
     @classmethod
     def create(
         cls,
         connection: mavutil.mavfile,
         target: Position,
         local_logger: logger.Logger,
+        gate: command_gate.CommandGate | None = None,
     ) -> Tuple[bool, Union["Telemetry", None]]:
         """
         Falliable create (instantiation) method to create a Command object.
+
+        gate: Suppresses repeated commands, None to send every command.
         """
-        command = cls(cls.__private_key, connection, target, local_logger)
+        result, history = telemetry_history.TelemetryHistory.create(cls.__HISTORY_MEMORY_BUDGET)
+        if not result:
+            return False, None
+
+        _, hot_logger = sampled_logger.SampledLogger.create(local_logger, cls.__LOG_INTERVAL)
+
+        command = cls(
+            cls.__private_key, connection, target, local_logger, gate, history, hot_logger
+        )
         local_logger.info("Command initialized")
         return True, command
 
@@ -52,6 +72,9 @@ class Command:  # pylint: disable=too-many-instance-attributes
         connection: mavutil.mavfile,
         target: Position,
         local_logger: logger.Logger,
+        gate: command_gate.CommandGate | None,
+        history: telemetry_history.TelemetryHistory,
+        hot_logger: sampled_logger.SampledLogger,
     ) -> None:
         assert key is Command.__private_key, "Use create() method"
 
@@ -59,27 +82,22 @@ class Command:  # pylint: disable=too-many-instance-attributes
         self.connection = connection
         self.target = target
         self.logger = local_logger
-        self.velocity_data = []
+        self.gate = gate
+        self.history = history
+        self.hot_logger = hot_logger
 
     def run_cmd(self, telemetry_data: telemetry.TelemetryData) -> str:
         """
         Make a decision based on received telemetry data.
         """
         # Calculate average velocity in x, y, z
-        vx, vy, vz = telemetry_data.x_velocity, telemetry_data.y_velocity, telemetry_data.z_velocity
-        self.velocity_data.append([vx, vy, vz])
-        sum_vx = 0
-        sum_vy = 0
-        sum_vz = 0
-        for v in self.velocity_data:
-            sum_vx += v[0]
-            sum_vy += v[1]
-            sum_vz += v[2]
-        avg_vx = sum_vx / (len(self.velocity_data) * 1.0)
-        avg_vy = sum_vy / (len(self.velocity_data) * 1.0)
-        avg_vz = sum_vz / (len(self.velocity_data) * 1.0)
+        if not self.history.append(telemetry_data):
+            self.hot_logger.warning("Telemetry older than history, not recorded")
+        avg_vx = self.history.mean("x_velocity")
+        avg_vy = self.history.mean("y_velocity")
+        avg_vz = self.history.mean("z_velocity")
         # Log average velocity for this trip so far
-        self.logger.info(f"Average Velocity: {avg_vx}, {avg_vy}, {avg_vz}")
+        self.hot_logger.info("Average Velocity: {}, {}, {}", avg_vx, avg_vy, avg_vz)
 
         # Use COMMAND_LONG (76) message, assume the target_system=1 and target_componenet=0
         # The appropriate commands to use are instructed below
@@ -87,7 +105,14 @@ class Command:  # pylint: disable=too-many-instance-attributes
         # Adjust height using the comand MAV_CMD_CONDITION_CHANGE_ALT (113)
         # String to return to main: "CHANGE_ALTITUDE: {amount you changed it by, delta height in meters}"
 
-        if abs(self.target.z - telemetry_data.z) > 0.5:  # need to adjust altitude
+        if abs(self.target.z - telemetry_data.z) > self.__HEIGHT_TOLERANCE:  # adjust altitude
+            if not self.__should_send(
+                mavutil.mavlink.MAV_CMD_CONDITION_CHANGE_ALT,
+                (self.target.z,),
+                self.__HEIGHT_TOLERANCE,
+            ):
+                return ""
+
             self.connection.mav.command_long_send(
                 1,  # target_system
                 0,  # target_component
@@ -114,7 +139,16 @@ class Command:  # pylint: disable=too-many-instance-attributes
         now_yaw_deg = math.degrees(telemetry_data.yaw)
         yaw_angle = (target_yaw_deg - now_yaw_deg + 180) % 360 - 180
 
-        if (abs(yaw_angle)) > 5:  # need to adjust direction
+        if (abs(yaw_angle)) > self.__ANGLE_TOLERANCE:  # need to adjust direction
+            # The heading to the target does not change while turning on the spot
+            if not self.__should_send(
+                mavutil.mavlink.MAV_CMD_CONDITION_YAW,
+                (target_yaw_deg,),
+                self.__ANGLE_TOLERANCE,
+                is_angle=True,
+            ):
+                return ""
+
             direction = -1  # if angle positive, counter-clockwise
             if yaw_angle <= 0:
                 direction = 1  # if angle negative, clockwise
@@ -134,6 +168,21 @@ class Command:  # pylint: disable=too-many-instance-attributes
             return f"CHANGE YAW: {yaw_angle}"
         return ""
 
+    def __should_send(
+        self,
+        command_id: int,
+        targets: "tuple[float, ...]",
+        tolerance: float,
+        is_angle: bool = False,
+    ) -> bool:
+        """
+        Asks the gate, if any.
+        """
+        if self.gate is None:
+            return True
+
+        return self.gate.should_send(command_id, targets, tolerance, is_angle)
+
 
 # =================================================================================================
 #                            ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
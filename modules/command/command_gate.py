@@ -0,0 +1,91 @@
+"""
+Outbound command de-duplication and rate limiting.
+"""
+
+import time
+from typing import Tuple, Union
+
+
+class CommandGate:
+    """
+    Decides whether a command is worth sending.
+
+    A command is suppressed if the same command was sent less than the minimum interval ago,
+    or if an equivalent command is still in flight.
+    Commands are equivalent if each target value is within the caller's tolerance.
+    A command is in flight until the in flight timeout, after which it is assumed lost.
+    """
+
+    __private_key = object()
+
+    @classmethod
+    def create(
+        cls, min_interval: float, in_flight_timeout: float
+    ) -> Tuple[bool, Union["CommandGate", None]]:
+        """
+        Falliable create (instantiation) method to create a CommandGate object.
+
+        min_interval: Minimum time in seconds between sends of the same command.
+        in_flight_timeout: Time in seconds an equivalent command is suppressed for.
+        """
+        if min_interval < 0.0 or in_flight_timeout < min_interval:
+            return False, None
+
+        return True, CommandGate(cls.__private_key, min_interval, in_flight_timeout)
+
+    def __init__(self, key: object, min_interval: float, in_flight_timeout: float) -> None:
+        assert key is CommandGate.__private_key, "Use create() method"
+
+        self.__min_interval = min_interval
+        self.__in_flight_timeout = in_flight_timeout
+
+        # Command ID to (time sent, target values)
+        self.__last_sent = {}
+        self.sent_counts = {}
+        self.suppressed_counts = {}
+
+    def should_send(
+        self,
+        command_id: int,
+        targets: "tuple[float, ...]",
+        tolerance: float,
+        is_angle: bool = False,
+    ) -> bool:
+        """
+        Records the decision, the caller must send the command if True.
+
+        command_id: MAV_CMD of the command.
+        targets: Values the command converges to, for comparing commands.
+        tolerance: Maximum difference of target values of equivalent commands.
+        is_angle: Targets are angles in degrees, so differences wrap to [-180, 180) .
+        """
+        now = time.monotonic()
+        last = self.__last_sent.get(command_id)
+        if last is not None:
+            last_time, last_targets = last
+            elapsed = now - last_time
+            equivalent = all(
+                abs(self.__difference(target, last_target, is_angle)) <= tolerance
+                for target, last_target in zip(targets, last_targets)
+            )
+            if elapsed < self.__min_interval or (equivalent and elapsed < self.__in_flight_timeout):
+                self.suppressed_counts[command_id] = self.suppressed_counts.get(command_id, 0) + 1
+                return False
+
+        self.__last_sent[command_id] = (now, targets)
+        self.sent_counts[command_id] = self.sent_counts.get(command_id, 0) + 1
+        return True
+
+    @staticmethod
+    def __difference(target: float, last_target: float, is_angle: bool) -> float:
+        """
+        Difference of target values, the shortest way around for angles.
+        """
+        difference = target - last_target
+        if is_angle:
+            difference = (difference + 180) % 360 - 180
+
+        return difference
+
+    def __str__(self) -> str:
+        return f"sent: {sum(self.sent_counts.values())}, suppressed: {sum(self.suppressed_counts.values())}"
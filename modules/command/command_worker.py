@@ -10,6 +10,7 @@ from pymavlink import mavutil
 from utilities.workers import queue_proxy_wrapper
 from utilities.workers import worker_controller
 from . import command
+from . import command_gate
 from ..common.modules.logger import logger
 
 
@@ -19,6 +20,7 @@ from ..common.modules.logger import logger
 def command_worker(
     connection: mavutil.mavfile,
     target: command.Position,
+    gate: command_gate.CommandGate | None,
     input_queue: queue_proxy_wrapper.QueueProxyWrapper,
     output_queue: queue_proxy_wrapper.QueueProxyWrapper,
     controller: worker_controller.WorkerController,
@@ -28,6 +30,7 @@ def command_worker(
 
     connection: connection instance
     target: target position for commands
+    gate: suppresses repeated commands, None to send every command
     input_queue: receive telemetry data
     output_queue: output to other process
     controller: how the main process communicates to this worker process.
@@ -53,20 +56,20 @@ def command_worker(
     #                          ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
     # =============================================================================================
     # Instantiate class object (command.Command)
-    check, command_instance = command.Command.create(connection, target, local_logger)
+    check, command_instance = command.Command.create(connection, target, local_logger, gate)
     if not check:
         local_logger.error("Error with creating instance")
     # Main loop: do work.
-    while not controller.is_exit_requested():
+    # Sleeps in the queue until telemetry arrives, stops on exit or sentinel
+    for msg in input_queue.consume(controller):
         controller.check_pause()
-        if input_queue.queue.empty():  # no data
-            continue
-        msg = input_queue.queue.get(timeout=1.0)
-        if msg is None:
-            continue
         result = command_instance.run_cmd(msg)
         if result != "":
-            output_queue.queue.put(result)
+            output_queue.put(result)
+
+    if command_instance.gate is not None:
+        local_logger.info(f"Command gate: {command_instance.gate}")
+    local_logger.info(f"Command logging: {command_instance.hot_logger}")
 
 
 # =================================================================================================
@@ -0,0 +1,264 @@
+"""
+Append-only recording of raw MAVLink frames with a sidecar index.
+
+Both files start with a magic number.
+Each data file record is a header followed by the raw frame:
+time (float64, seconds since the epoch), direction (uint8), frame length (uint16)
+Each index file entry is fixed size, in time order:
+time (float64), message ID (uint32), direction (uint8), data file offset of the record (uint64)
+All values are little endian without padding.
+"""
+
+import bisect
+import collections
+import collections.abc
+import io
+import mmap
+import pathlib
+import struct
+import threading
+import time
+from typing import Tuple, Union
+
+from pymavlink import mavutil
+
+
+DATA_MAGIC = b"MAVREC1\x00"
+INDEX_MAGIC = b"MAVIDX1\x00"
+DATA_RECORD_HEADER = struct.Struct("<dBH")
+INDEX_ENTRY = struct.Struct("<dIBQ")
+
+DIRECTION_INBOUND = 0
+DIRECTION_OUTBOUND = 1
+
+DATA_SUFFIX = ".bin"
+INDEX_SUFFIX = ".idx"
+
+
+class FlightRecorder:  # pylint: disable=too-many-instance-attributes
+    """
+    Records every frame received and sent on a connection.
+
+    The connection's thread only appends to an in memory buffer,
+    and a background thread writes the files.
+    """
+
+    __private_key = object()
+
+    __WRITE_PERIOD = 0.05  # seconds
+
+    @classmethod
+    def create(cls, path: "str | pathlib.Path") -> Tuple[bool, Union["FlightRecorder", None]]:
+        """
+        Falliable create (instantiation) method to create a FlightRecorder object.
+
+        path: Recording name, the data and index files add DATA_SUFFIX and INDEX_SUFFIX.
+        """
+        path = pathlib.Path(path)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # pylint: disable-next=consider-using-with
+            data_file = open(path.with_suffix(DATA_SUFFIX), "xb")
+        except OSError:
+            return False, None
+
+        try:
+            # pylint: disable-next=consider-using-with
+            index_file = open(path.with_suffix(INDEX_SUFFIX), "xb")
+        except OSError:
+            data_file.close()
+            return False, None
+
+        return True, FlightRecorder(cls.__private_key, data_file, index_file)
+
+    def __init__(
+        self,
+        key: object,
+        data_file: io.BufferedWriter,
+        index_file: io.BufferedWriter,
+    ) -> None:
+        assert key is FlightRecorder.__private_key, "Use create() method"
+
+        self.__data_file = data_file
+        self.__index_file = index_file
+        self.__data_file.write(DATA_MAGIC)
+        self.__index_file.write(INDEX_MAGIC)
+        self.__offset = len(DATA_MAGIC)
+        self.__last_time = 0.0
+
+        # (time, direction, message ID, frame), appending and popping are thread safe
+        self.__pending = collections.deque()
+        self.__stop = threading.Event()
+        self.__writer = threading.Thread(target=self.__write_loop, daemon=True)
+        self.__writer.start()
+
+        self.recorded_count = 0
+
+    def attach(self, connection: mavutil.mavfile) -> None:
+        """
+        Records the connection's inbound messages and outbound sends.
+        Replaces any existing send callback.
+        """
+        connection.message_hooks.append(self.__on_receive)
+        connection.mav.set_send_callback(self.__on_send)
+
+    def record(self, direction: int, msg_id: int, frame: bytes) -> None:
+        """
+        Queues a frame for writing.
+
+        direction: DIRECTION_INBOUND or DIRECTION_OUTBOUND.
+        msg_id: MAVLink message ID.
+        frame: Raw frame including header and checksum.
+        """
+        self.__pending.append((time.time(), direction, msg_id, frame))
+
+    def close(self) -> None:
+        """
+        Writes everything recorded so far and closes the files.
+        """
+        if self.__stop.is_set():
+            return
+
+        self.__stop.set()
+        self.__writer.join()
+        self.__data_file.close()
+        self.__index_file.close()
+
+    def __on_receive(self, _: mavutil.mavfile, msg: mavutil.mavlink.MAVLink_message) -> None:
+        """
+        Connection message hook.
+        """
+        # Bad data has no frame
+        if msg.get_msgId() < 0:
+            return
+
+        self.record(DIRECTION_INBOUND, msg.get_msgId(), msg.get_msgbuf())
+
+    def __on_send(self, msg: mavutil.mavlink.MAVLink_message) -> None:
+        """
+        MAVLink send callback, after the message is packed.
+        """
+        self.record(DIRECTION_OUTBOUND, msg.get_msgId(), msg.get_msgbuf())
+
+    def __write_loop(self) -> None:
+        """
+        Writes pending frames periodically until closed.
+        """
+        while not self.__stop.wait(self.__WRITE_PERIOD):
+            self.__write_pending()
+
+        self.__write_pending()
+
+    def __write_pending(self) -> None:
+        """
+        Appends pending frames to the data and index files.
+        """
+        if len(self.__pending) == 0:
+            return
+
+        while len(self.__pending) > 0:
+            record_time, direction, msg_id, frame = self.__pending.popleft()
+            # The index must stay sorted even if the clock steps back
+            record_time = max(record_time, self.__last_time)
+            self.__last_time = record_time
+
+            self.__data_file.write(DATA_RECORD_HEADER.pack(record_time, direction, len(frame)))
+            self.__data_file.write(frame)
+            self.__index_file.write(INDEX_ENTRY.pack(record_time, msg_id, direction, self.__offset))
+            self.__offset += DATA_RECORD_HEADER.size + len(frame)
+            self.recorded_count += 1
+
+        # Index entries must not be visible to readers before their records
+        self.__data_file.flush()
+        self.__index_file.flush()
+
+
+class FlightLogReader:
+    """
+    Reads a recording through memory maps, using the index to find a time range
+    without reading the frames before it.
+    """
+
+    __private_key = object()
+
+    @classmethod
+    def create(cls, path: "str | pathlib.Path") -> Tuple[bool, Union["FlightLogReader", None]]:
+        """
+        Falliable create (instantiation) method to create a FlightLogReader object.
+
+        path: Recording name, as passed to `FlightRecorder.create()`.
+        """
+        path = pathlib.Path(path)
+        try:
+            with open(path.with_suffix(DATA_SUFFIX), "rb") as data_file:
+                data = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+            with open(path.with_suffix(INDEX_SUFFIX), "rb") as index_file:
+                index = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False, None
+
+        if data[: len(DATA_MAGIC)] != DATA_MAGIC or index[: len(INDEX_MAGIC)] != INDEX_MAGIC:
+            data.close()
+            index.close()
+            return False, None
+
+        return True, FlightLogReader(cls.__private_key, data, index)
+
+    def __init__(self, key: object, data: mmap.mmap, index: mmap.mmap) -> None:
+        assert key is FlightLogReader.__private_key, "Use create() method"
+
+        self.__data = data
+        self.__data_view = memoryview(data)
+        self.__index = index
+        # Ignores a partially written last entry
+        self.__count = (len(index) - len(INDEX_MAGIC)) // INDEX_ENTRY.size
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __getitem__(self, position: int) -> "tuple[float, int, int, int]":
+        """
+        Index entry: time, message ID, direction, data file offset.
+        """
+        if not 0 <= position < self.__count:
+            raise IndexError(position)
+
+        return INDEX_ENTRY.unpack_from(self.__index, len(INDEX_MAGIC) + position * INDEX_ENTRY.size)
+
+    def find(self, start_time: float) -> int:
+        """
+        Position of the first entry at or after the time.
+        """
+        return bisect.bisect_left(self, start_time, key=lambda entry: entry[0])
+
+    def read(
+        self,
+        start_time: float = 0.0,
+        end_time: float = float("inf"),
+        msg_ids: "set[int] | None" = None,
+    ) -> "collections.abc.Iterator[tuple[float, int, memoryview]]":
+        """
+        Yields time, direction and frame of each record in [start_time, end_time).
+        Frames are views of the memory map, copy them to keep them after closing.
+
+        msg_ids: Only these message IDs, None for all.
+        """
+        for position in range(self.find(start_time), self.__count):
+            record_time, msg_id, direction, offset = self[position]
+            if record_time >= end_time:
+                return
+
+            if msg_ids is not None and msg_id not in msg_ids:
+                continue
+
+            _, _, length = DATA_RECORD_HEADER.unpack_from(self.__data, offset)
+            start = offset + DATA_RECORD_HEADER.size
+            yield record_time, direction, self.__data_view[start : start + length]
+
+    def close(self) -> None:
+        """
+        Unmaps the files, which fails if frame views are still referenced.
+        """
+        self.__data_view.release()
+        self.__data.close()
+        self.__index.close()
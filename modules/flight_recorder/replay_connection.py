@@ -0,0 +1,189 @@
+"""
+Replays a recording through the parts of `mavutil.mavfile` the workers use.
+"""
+
+import pathlib
+import time
+from typing import Tuple, Union
+
+from pymavlink import mavutil
+
+from . import flight_recorder
+
+
+class ReplayConnection:  # pylint: disable=too-many-instance-attributes
+    """
+    Receives the recorded inbound messages, paced by their recorded times scaled by the speed,
+    and counts sent messages instead of sending them.
+    Speed 0 replays as fast as possible.
+    """
+
+    __private_key = object()
+
+    @classmethod
+    def create(
+        cls, path: str | pathlib.Path, speed: float = 1.0
+    ) -> Tuple[bool, Union["ReplayConnection", None]]:
+        """
+        Falliable create (instantiation) method to create a ReplayConnection object.
+
+        path: Recording name, as passed to `flight_recorder.FlightRecorder.create()`.
+        speed: Multiple of real time, 0 for as fast as possible.
+        """
+        if speed < 0.0:
+            return False, None
+
+        result, reader = flight_recorder.FlightLogReader.create(path)
+        if not result:
+            return False, None
+
+        return True, ReplayConnection(cls.__private_key, reader, speed)
+
+    def __init__(self, key: object, reader: flight_recorder.FlightLogReader, speed: float) -> None:
+        assert key is ReplayConnection.__private_key, "Use create() method"
+
+        self.__reader = reader
+        self.__speed = speed
+        self.__records = reader.read()
+        self.__decoder = mavutil.mavlink.MAVLink(None)
+        # Next inbound message and its recorded time
+        self.__next_msg = None
+        self.__next_time = 0.0
+        # Recorded time and monotonic time replay started at
+        self.__start_time = None
+        self.__start_clock = 0.0
+        self.__finished = False
+
+        # No file descriptor to wait on, readers block in recv_match()
+        self.fd = None
+        self.mav = mavutil.mavlink.MAVLink(self, srcSystem=255)
+        # Latest message of each type, for conditions
+        self.messages = {}
+        self.received_count = 0
+        self.sent_count = 0
+
+    def write(self, buf: bytes) -> None:  # pylint: disable=unused-argument
+        """
+        Called by `mav` to send, only counts.
+        """
+        self.sent_count += 1
+
+    def is_finished(self) -> bool:
+        """
+        Whether every recorded message has been received.
+        """
+        self.__peek()
+        return self.__finished
+
+    def recv_msg(self) -> "mavutil.mavlink.MAVLink_message | None":
+        """
+        Receives the next message if it is due, without waiting.
+        """
+        if self.__wait_time() > 0.0:
+            return None
+
+        return self.__take()
+
+    def recv_match(
+        self,
+        condition: "str | None" = None,
+        type: "str | list[str] | set[str] | None" = None,  # pylint: disable=redefined-builtin
+        blocking: bool = False,
+        timeout: "float | None" = None,
+    ) -> "mavutil.mavlink.MAVLink_message | None":
+        """
+        Receives the next message matching the condition and type, discarding any others.
+        Same arguments as `mavutil.mavfile.recv_match()`.
+
+        Returns None if nothing matched in time or the recording ended.
+        """
+        if type is not None and not isinstance(type, (list, set)):
+            type = [type]
+
+        deadline = None
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+
+        while True:
+            wait = self.__wait_time()
+            if wait > 0.0:
+                if not blocking:
+                    return None
+
+                if deadline is not None:
+                    wait = min(wait, deadline - time.monotonic())
+                    if wait <= 0.0:
+                        return None
+
+                time.sleep(wait)
+                continue
+
+            msg = self.__take()
+            if msg is None:
+                return None
+
+            if type is not None and msg.get_type() not in type:
+                continue
+
+            if not mavutil.evaluate_condition(condition, self.messages):
+                continue
+
+            return msg
+
+    def close(self) -> None:
+        """
+        Closes the recording.
+        """
+        self.__next_msg = None
+        self.__records.close()
+        self.__reader.close()
+
+    def __peek(self) -> None:
+        """
+        Decodes the next inbound message if not already.
+        """
+        while self.__next_msg is None and not self.__finished:
+            record = next(self.__records, None)
+            if record is None:
+                self.__finished = True
+                return
+
+            record_time, direction, frame = record
+            if direction != flight_recorder.DIRECTION_INBOUND:
+                continue
+
+            try:
+                self.__next_msg = self.__decoder.decode(bytearray(frame))
+            except mavutil.mavlink.MAVError:
+                continue
+
+            self.__next_time = record_time
+
+    def __wait_time(self) -> float:
+        """
+        Time in seconds until the next message is due, 0 if due or there are none.
+        """
+        self.__peek()
+        if self.__next_msg is None or self.__speed == 0.0:
+            return 0.0
+
+        if self.__start_time is None:
+            self.__start_time = self.__next_time
+            self.__start_clock = time.monotonic()
+
+        due = self.__start_clock + (self.__next_time - self.__start_time) / self.__speed
+        return max(due - time.monotonic(), 0.0)
+
+    def __take(self) -> "mavutil.mavlink.MAVLink_message | None":
+        """
+        Receives the next message.
+        """
+        self.__peek()
+        msg = self.__next_msg
+        if msg is None:
+            return None
+
+        self.__next_msg = None
+        self.messages[msg.get_type()] = msg
+        self.received_count += 1
+        return msg
@@ -2,59 +2,100 @@
 Heartbeat receiving logic.
 """
 
+import time
 from typing import Tuple, Union
 from pymavlink import mavutil
 from modules.common.modules.logger import logger
 
 
-HEARTBEAT_PERIOD = 1.0
+# Shared with the sender so the two cannot drift apart
+HEARTBEAT_PERIOD = 1.0  # seconds
+# Heartbeat periods without a heartbeat before the connection is lost
+DISCONNECT_THRESHOLD = 5
 
 
 # =================================================================================================
 #                            ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
 # =================================================================================================
-class HeartbeatReceiver:
+class HeartbeatReceiver:  # pylint: disable=too-many-instance-attributes
     """
-    HeartbeatReceiver class to receive a heartbeat
+    HeartbeatReceiver class to receive a heartbeat.
+
+    The connection is lost once no heartbeat has been seen for the loss deadline.
+    Checking never waits on the connection, so it can run as often as needed
+    to detect the loss promptly.
     """
 
     __private_key = object()
 
     @classmethod
     def create(
-        cls, connection: mavutil.mavfile, local_logger: logger
+        cls,
+        connection: mavutil.mavfile,
+        local_logger: logger,
+        loss_deadline: float = DISCONNECT_THRESHOLD * HEARTBEAT_PERIOD,
     ) -> Tuple[bool, Union["HeartbeatReceiver", None]]:
         """
         Falliable create (instantiation) method to create a HeartbeatReceiver object.
+
+        loss_deadline: Time in seconds since the last heartbeat before the connection is lost.
         """
+        if loss_deadline <= 0.0:
+            return False, None
+
         # Create a HeartbeatReceiver object
-        return True, HeartbeatReceiver(cls.__private_key, connection, local_logger)
+        return True, HeartbeatReceiver(cls.__private_key, connection, local_logger, loss_deadline)
 
     def __init__(
-        self, key: object, connection: mavutil.mavfile, local_logger: logger.Logger
+        self,
+        key: object,
+        connection: mavutil.mavfile,
+        local_logger: logger.Logger,
+        loss_deadline: float,
     ) -> None:
         assert key is HeartbeatReceiver.__private_key, "Use create() method"
 
         # Initialization
         self.connection = connection
         self.__log = local_logger
+        self.__loss_deadline = loss_deadline
+        self.__heartbeat_period = loss_deadline / DISCONNECT_THRESHOLD
+        self.__start = time.monotonic()
 
         self.__log.info("HeartbeatReceiver initialized")
+        # Heartbeat periods since the last heartbeat, or since creation if never received
         self.missed = 0
         self.state = "DISCONNECTED"
+        # Monotonic time of the latest heartbeat, None if never received
+        self.last_seen = None
+        # Time in seconds from the last heartbeat to detecting the loss, None if never lost
+        self.detection_latency = None
 
     def run_hb_receiver(self) -> str:
         """
-        Checks if the heartbeat received is a heartbeat message
+        Takes every heartbeat already received and updates the connection state.
         """
-        msg = self.connection.recv_match(type="HEARTBEAT")
-        if not msg:
-            self.missed += 1
-            self.__log.warning("Missed heartbeat! " + str(self.missed) + " in a row.")
-            if self.missed >= 5:
-                self.state = "DISCONNECTED"
-        else:
-            self.missed = 0
+        received = False
+        while self.connection.recv_match(type="HEARTBEAT", blocking=False) is not None:
+            received = True
+
+        now = time.monotonic()
+        if received:
+            self.last_seen = now
+
+        since = self.__start if self.last_seen is None else self.last_seen
+        self.missed = int((now - since) / self.__heartbeat_period)
+
+        if self.last_seen is not None and now - self.last_seen <= self.__loss_deadline:
             self.state = "CONNECTED"
-        self.__log.info("STATUS: " + self.state)
+            return self.state
+
+        if self.state == "CONNECTED":
+            self.detection_latency = now - self.last_seen
+            self.__log.warning(
+                f"Heartbeat lost, last seen {self.detection_latency:.3f}s ago, "
+                f"{self.detection_latency - self.__loss_deadline:.3f}s after the deadline"
+            )
+
+        self.state = "DISCONNECTED"
         return self.state
@@ -7,11 +7,23 @@ import pathlib
 import time
 from pymavlink import mavutil
 
+from utilities.logging_tools import sampled_logger
+from utilities.mavlink import header_filter
+from utilities.scheduling import timer_wheel
 from utilities.workers import queue_proxy_wrapper
 from utilities.workers import worker_controller
 from modules.heartbeat import heartbeat_receiver
 from ..common.modules.logger import logger
 
+
+# Checking often bounds how late a loss is detected
+LIVENESS_CHECK_PERIOD = 0.1  # seconds
+STATISTICS_PERIOD = 60.0  # seconds
+# An unchanged status is logged at most this often
+STATUS_LOG_INTERVAL = 10.0  # seconds
+WHEEL_TICK = 0.01  # seconds
+WHEEL_SLOT_COUNT = 128
+
 # =================================================================================================
 #                            ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
 # =================================================================================================
@@ -54,20 +66,61 @@ def heartbeat_receiver_worker(
     # =============================================================================================
     # Instantiate class object (heartbeat_receiver.HeartbeatReceiver)
     check, hb_receiver_instance = heartbeat_receiver.HeartbeatReceiver.create(
-        connection, local_logger
+        connection, local_logger, heartbeat_receiver.DISCONNECT_THRESHOLD * heartbeat_time
     )
     if not check:
         local_logger.error("Failed to create Heartbeat Receiver (invalid connection or logger).")
         return
 
-    status = "DISCONNECTED"
+    # Decode only heartbeats, unless the router already filters
+    hb_filter = None
+    if isinstance(connection, mavutil.mavfile):
+        _, hb_filter = header_filter.HeaderFilter.create(["HEARTBEAT"])
+        hb_filter.attach(connection)
+
+    result, wheel = timer_wheel.TimerWheel.create(WHEEL_TICK, WHEEL_SLOT_COUNT)
+    if not result:
+        local_logger.error("Failed to create TimerWheel.")
+        return
+
+    # Get Pylance to stop complaining
+    assert wheel is not None
+
+    _, status_logger = sampled_logger.SampledLogger.create(local_logger, STATUS_LOG_INTERVAL)
+    logged_status = None
+
+    def check_liveness() -> None:
+        hb_receiver_instance.run_hb_receiver()
+
+    def report_status() -> None:
+        nonlocal logged_status
+        status = hb_receiver_instance.state
+        if status != logged_status:
+            local_logger.info(f"STATUS: {status}")
+            logged_status = status
+        else:
+            status_logger.info("STATUS: {}", status)
+        output_queue.put((status, time.strftime("%H:%M:%S")))
+
+    def log_statistics() -> None:
+        for name, statistics in wheel.get_statistics().items():
+            local_logger.info(f"Task {name}: {statistics}")
+
+    wheel.add_task("liveness check", LIVENESS_CHECK_PERIOD, check_liveness, 0.0)
+    wheel.add_task("status report", heartbeat_time, report_status)
+    wheel.add_task("statistics", STATISTICS_PERIOD, log_statistics)
+
     # Worker starts
     local_logger.info("HeartbeatReceiver worker started.")
-    # Do work in infinite loop
-    while not controller.is_exit_requested():
-        controller.check_pause()
-        status = hb_receiver_instance.run_hb_receiver()
-        if status:
-            output_queue.queue.put(f"{status} at {time.strftime('%H:%M:%S')}")
-        time.sleep(heartbeat_time)
+    # Check at fixed deadlines, waking immediately on exit
+    wheel.run(controller)
+
+    log_statistics()
+    local_logger.info(f"Status logging: {status_logger}")
+    if hb_filter is not None:
+        local_logger.info(f"Header filter: {hb_filter}")
+    if hb_receiver_instance.detection_latency is not None:
+        local_logger.info(
+            f"Last loss detected {hb_receiver_instance.detection_latency:.3f}s after last heartbeat"
+        )
     local_logger.info("HeartbeatReceiver worker stopped.")
@@ -2,6 +2,7 @@
 Heartbeat sending logic.
 """
 
+from typing import Tuple, Union
 from pymavlink import mavutil
 from modules.common.modules.logger import logger
 
@@ -16,7 +17,7 @@ class HeartbeatSender:
     @classmethod
     def create(
         cls, connection: mavutil.mavfile, local_logger: logger
-    ) -> "tuple[True, HeartbeatSender] | tuple[False, None]":
+    ) -> Tuple[bool, Union["HeartbeatSender", None]]:
         """
         Falliable create (instantiation) method to create a HeartbeatSender object.
         """
@@ -4,15 +4,21 @@ Heartbeat worker that sends heartbeats periodically.
 
 import os
 import pathlib
-import time
 
 from pymavlink import mavutil
 
+from utilities.scheduling import timer_wheel
 from utilities.workers import worker_controller
+from modules.heartbeat import heartbeat_receiver
 from modules.heartbeat import heartbeat_sender
 from modules.common.modules.logger import logger
 
 
+STATISTICS_PERIOD = 60.0  # seconds
+WHEEL_TICK = 0.01  # seconds
+WHEEL_SLOT_COUNT = 128
+
+
 # =================================================================================================
 #                            ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
 # =================================================================================================
@@ -56,15 +62,30 @@ def heartbeat_sender_worker(
         local_logger.error("Failed to create HeartbeatSender (invalid connection or logger).")
         return
 
-    local_logger.info("HeartbeatSender worker started.")
+    result, wheel = timer_wheel.TimerWheel.create(WHEEL_TICK, WHEEL_SLOT_COUNT)
+    if not result:
+        local_logger.error("Failed to create TimerWheel.")
+        return
+
+    # Get Pylance to stop complaining
+    assert wheel is not None
 
-    # Main loop: do work.
-    while not controller.is_exit_requested():
-        controller.check_pause()
+    def send_heartbeat() -> None:
         sent = hb_sender_instance.run_hb_sender()
         if not sent:
             local_logger.error("Failed to send heartbeat.")
 
-        # wait until next heartbeat
-        time.sleep(1.0)
+    def log_statistics() -> None:
+        for name, statistics in wheel.get_statistics().items():
+            local_logger.info(f"Task {name}: {statistics}")
+
+    wheel.add_task("heartbeat send", heartbeat_receiver.HEARTBEAT_PERIOD, send_heartbeat, 0.0)
+    wheel.add_task("statistics", STATISTICS_PERIOD, log_statistics)
+
+    local_logger.info("HeartbeatSender worker started.")
+
+    # Main loop: send at fixed deadlines, waking immediately on exit
+    wheel.run(controller)
+
+    log_statistics()
     local_logger.info("HeartbeatSender worker stopped.")
@@ -0,0 +1,150 @@
+"""
+Single owner of the MAVLink connection.
+"""
+
+from typing import Tuple, Union
+
+from pymavlink import mavutil
+
+from utilities.workers import queue_proxy_wrapper
+from ..common.modules.logger import logger
+
+
+# Subscription key receiving every message type
+ALL_MESSAGES = "*"
+
+
+class MavlinkRouter:  # pylint: disable=too-many-instance-attributes
+    """
+    Decodes each inbound message once and publishes it to the queues subscribed to its type,
+    and makes all outbound send calls so there is a single writer.
+
+    Subscriber queues should use an overflow policy which drops rather than blocks,
+    so a slow worker cannot stall the others.
+    """
+
+    __private_key = object()
+
+    __RECEIVE_TIMEOUT = 0.01  # seconds
+    # Limits how long outbound calls wait behind a burst of inbound messages
+    __MAX_RECEIVE_BATCH = 64
+
+    @classmethod
+    def create(
+        cls,
+        connection: mavutil.mavfile,
+        subscriptions: "dict[str, list[queue_proxy_wrapper.QueueProxyWrapper]]",
+        outbound_queue: queue_proxy_wrapper.QueueProxyWrapper,
+        local_logger: logger.Logger,
+    ) -> Tuple[bool, Union["MavlinkRouter", None]]:
+        """
+        Falliable create (instantiation) method to create a MavlinkRouter object.
+
+        connection: Connection owned by the router.
+        subscriptions: Queues for each message type, ALL_MESSAGES for every type.
+        outbound_queue: Send calls from `router_connection.RouterConnection`.
+        """
+        if connection is None or outbound_queue is None:
+            return False, None
+
+        return True, MavlinkRouter(
+            cls.__private_key, connection, subscriptions, outbound_queue, local_logger
+        )
+
+    def __init__(
+        self,
+        key: object,
+        connection: mavutil.mavfile,
+        subscriptions: "dict[str, list[queue_proxy_wrapper.QueueProxyWrapper]]",
+        outbound_queue: queue_proxy_wrapper.QueueProxyWrapper,
+        local_logger: logger.Logger,
+    ) -> None:
+        assert key is MavlinkRouter.__private_key, "Use create() method"
+
+        self.connection = connection
+        self.__subscriptions = subscriptions
+        self.__all_subscribers = subscriptions.get(ALL_MESSAGES, [])
+        self.__outbound_queue = outbound_queue
+        self.__log = local_logger
+
+        self.received_count = 0
+        self.unrouted_count = 0
+        self.sent_count = 0
+        # Set once the outbound queue sends the sentinel (None) or is shut down
+        self.outbound_closed = False
+
+        self.__log.info("MavlinkRouter initialized")
+
+    def run(self) -> bool:
+        """
+        Makes pending send calls, then waits briefly for inbound messages and publishes them.
+        Send calls stop at the sentinel (None), while inbound messages are still published.
+
+        Returns False if the connection failed, such as the drone closing it.
+        """
+        if not self.outbound_closed:
+            for call in self.__outbound_queue.get_many(timeout=0.0):
+                if call is None:
+                    self.outbound_closed = True
+                    self.__log.info("Outbound queue closed, no longer sending")
+                    break
+
+                name, args, kwargs = call
+                if not self.__send(name, args, kwargs):
+                    return False
+
+        try:
+            msg = self.connection.recv_match(blocking=True, timeout=self.__RECEIVE_TIMEOUT)
+            count = 0
+            while msg is not None:
+                self.__publish(msg)
+                count += 1
+                if count >= self.__MAX_RECEIVE_BATCH:
+                    break
+
+                # Already buffered messages
+                msg = self.connection.recv_msg()
+        except OSError as exception:
+            self.__log.error(f"Connection failed while receiving: {exception}")
+            return False
+
+        return True
+
+    def __send(self, name: str, args: "tuple", kwargs: "dict") -> bool:
+        """
+        Makes a forwarded send call on the connection.
+        A call which does not match a send method is logged and skipped.
+
+        Returns False if the connection failed.
+        """
+        try:
+            getattr(self.connection.mav, name)(*args, **kwargs)
+        except (AttributeError, TypeError) as exception:
+            self.__log.error(f"Failed to send {name}: {exception}")
+            return True
+        except OSError as exception:
+            self.__log.error(f"Connection failed while sending {name}: {exception}")
+            return False
+
+        self.sent_count += 1
+        return True
+
+    def __publish(self, msg: mavutil.mavlink.MAVLink_message) -> None:
+        """
+        Puts the message on every subscribed queue.
+        """
+        msg_type = msg.get_type()
+        if msg_type == "BAD_DATA":
+            return
+
+        self.received_count += 1
+        subscribers = self.__subscriptions.get(msg_type, [])
+        if len(subscribers) == 0 and len(self.__all_subscribers) == 0:
+            self.unrouted_count += 1
+            return
+
+        for subscriber in subscribers:
+            subscriber.put(msg)
+
+        for subscriber in self.__all_subscribers:
+            subscriber.put(msg)
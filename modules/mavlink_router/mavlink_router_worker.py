@@ -0,0 +1,101 @@
+"""
+Router worker that owns the MAVLink connection.
+"""
+
+import os
+import pathlib
+
+from pymavlink import mavutil
+
+from utilities.mavlink import header_filter
+from utilities.workers import queue_proxy_wrapper
+from utilities.workers import worker_controller
+from . import mavlink_router
+from ..common.modules.logger import logger
+from ..flight_recorder import flight_recorder
+
+
+def mavlink_router_worker(
+    connection: mavutil.mavfile,
+    subscriptions: "dict[str, list[queue_proxy_wrapper.QueueProxyWrapper]]",
+    recording_path: "str | None",
+    outbound_queue: queue_proxy_wrapper.QueueProxyWrapper,
+    controller: worker_controller.WorkerController,
+) -> None:
+    """
+    Worker process.
+
+    connection: connection instance, only used by this worker
+    subscriptions: output queues for each message type
+    recording_path: record all traffic to this path, None to not record
+    outbound_queue: send calls from other workers
+    controller: how the main process communicates to this worker process.
+    """
+    # Instantiate logger
+    worker_name = pathlib.Path(__file__).stem
+    process_id = os.getpid()
+    result, local_logger = logger.Logger.create(f"{worker_name}_{process_id}", True)
+    if not result:
+        print("ERROR: Worker failed to create logger")
+        return
+
+    # Get Pylance to stop complaining
+    assert local_logger is not None
+
+    local_logger.info("Logger initialized", True)
+
+    result, router = mavlink_router.MavlinkRouter.create(
+        connection, subscriptions, outbound_queue, local_logger
+    )
+    if not result:
+        local_logger.error("Failed to create MavlinkRouter")
+        return
+
+    # Get Pylance to stop complaining
+    assert router is not None
+
+    recorder = None
+    if recording_path is not None:
+        result, recorder = flight_recorder.FlightRecorder.create(recording_path)
+        if not result:
+            local_logger.error(f"Failed to create FlightRecorder at {recording_path}")
+            return
+
+        # Get Pylance to stop complaining
+        assert recorder is not None
+
+        recorder.attach(connection)
+
+    # The recorder needs every message, and so do subscribers to all messages
+    router_filter = None
+    if recorder is None and mavlink_router.ALL_MESSAGES not in subscriptions:
+        result, router_filter = header_filter.HeaderFilter.create(list(subscriptions))
+        if not result:
+            local_logger.error(f"Unknown message types in subscriptions: {list(subscriptions)}")
+            return
+
+        # Get Pylance to stop complaining
+        assert router_filter is not None
+
+        router_filter.attach(connection)
+
+    local_logger.info("MavlinkRouter worker started.")
+
+    while not controller.is_exit_requested():
+        controller.check_pause()
+        if not router.run():
+            # Workers stop receiving, so the heartbeat receiver reports the loss to main
+            local_logger.error("Connection lost, stopping")
+            break
+
+    if router_filter is not None:
+        local_logger.info(f"Header filter: {router_filter}")
+
+    if recorder is not None:
+        recorder.close()
+        local_logger.info(f"Recorded {recorder.recorded_count} frames to {recording_path}")
+
+    local_logger.info(
+        f"MavlinkRouter worker stopped. Received: {router.received_count}, "
+        f"unrouted: {router.unrouted_count}, sent: {router.sent_count}"
+    )
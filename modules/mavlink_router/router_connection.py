@@ -0,0 +1,118 @@
+"""
+Worker side of the MAVLink router.
+"""
+
+import collections.abc
+import time
+
+from pymavlink import mavutil
+
+from utilities.workers import queue_proxy_wrapper
+
+
+class OutboundMav:
+    """
+    Stands in for `mavfile.mav` and forwards each `*_send()` call to the router,
+    which makes the call on the real connection.
+    """
+
+    def __init__(self, outbound_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        """
+        outbound_queue: Calls to the router.
+        """
+        self.__outbound_queue = outbound_queue
+
+    def __getattr__(self, name: str) -> collections.abc.Callable[..., bool]:
+        """
+        Only send methods are forwarded.
+        """
+        if not name.endswith("send"):
+            raise AttributeError(name)
+
+        def forward(*args: object, **kwargs: object) -> bool:
+            return self.__outbound_queue.put((name, args, kwargs))
+
+        return forward
+
+
+class RouterConnection:
+    """
+    The parts of `mavutil.mavfile` the workers use, backed by router queues.
+    Only receives the message types the queue is subscribed to.
+    """
+
+    def __init__(
+        self,
+        inbound_queue: "queue_proxy_wrapper.QueueProxyWrapper | None",
+        outbound_queue: queue_proxy_wrapper.QueueProxyWrapper,
+    ) -> None:
+        """
+        inbound_queue: Messages published by the router, None if the worker only sends.
+        outbound_queue: Calls to the router shared by all workers.
+        """
+        self.inbound_queue = inbound_queue
+        self.mav = OutboundMav(outbound_queue)
+        # Latest message of each type, for conditions
+        self.messages = {}
+
+    def recv_msg(self) -> "mavutil.mavlink.MAVLink_message | None":
+        """
+        Receives the next message without waiting.
+        """
+        return self.__receive(0.0)
+
+    def recv_match(
+        self,
+        condition: "str | None" = None,
+        type: "str | list[str] | set[str] | None" = None,  # pylint: disable=redefined-builtin
+        blocking: bool = False,
+        timeout: "float | None" = None,
+    ) -> "mavutil.mavlink.MAVLink_message | None":
+        """
+        Receives the next message matching the condition and type, discarding any others.
+        Same arguments as `mavutil.mavfile.recv_match()`.
+
+        Returns None if nothing matched in time or the router stopped.
+        """
+        if type is not None and not isinstance(type, (list, set)):
+            type = [type]
+
+        deadline = None
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+
+        while True:
+            wait = 0.0
+            if blocking:
+                if deadline is not None:
+                    wait = deadline - time.monotonic()
+                    if wait <= 0.0:
+                        return None
+                else:
+                    wait = None
+
+            msg = self.__receive(wait)
+            if msg is None:
+                return None
+
+            if type is not None and msg.get_type() not in type:
+                continue
+
+            if not mavutil.evaluate_condition(condition, self.messages):
+                continue
+
+            return msg
+
+    def __receive(self, timeout: "float | None") -> "mavutil.mavlink.MAVLink_message | None":
+        """
+        Gets a message from the router.
+        """
+        if self.inbound_queue is None:
+            return None
+
+        result, msg = self.inbound_queue.get(timeout)
+        if not result or msg is None:
+            return None
+
+        self.messages[msg.get_type()] = msg
+        return msg
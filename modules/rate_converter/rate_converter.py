@@ -0,0 +1,175 @@
+"""
+Reduces telemetry to the rate a consumer needs.
+"""
+
+import enum
+import math
+import time
+from typing import Tuple, Union
+
+import numpy as np
+
+from ..telemetry import telemetry
+
+
+class RateMode(enum.Enum):
+    """
+    What is output for each period.
+    """
+
+    # Latest telemetry
+    LATEST = 0
+    # Mean of each field, circular for angles
+    AVERAGE = 1
+    # Minimum then maximum of each field, for angles the ends of their arc going anticlockwise
+    # from the minimum, so the minimum is greater than the maximum if the arc crosses +/- pi
+    MIN_MAX = 2
+
+
+class RateConverter:  # pylint: disable=too-many-instance-attributes
+    """
+    Collects telemetry for one consumer and outputs it at most at the target rate.
+    Periods are measured with the telemetry time since boot, or the local clock if it is missing.
+    Every output has the time of the latest telemetry in its period.
+    """
+
+    __private_key = object()
+
+    # Averaged and ranged on the circle so values either side of +/- pi are close together
+    __ANGLE_INDICES = [
+        telemetry.TelemetryData.FIELDS.index(name) for name in ("roll", "pitch", "yaw")
+    ]
+
+    @classmethod
+    def create(cls, rate: float, mode: RateMode) -> Tuple[bool, Union["RateConverter", None]]:
+        """
+        Falliable create (instantiation) method to create a RateConverter object.
+
+        rate: Target rate in Hz, 0 to output every telemetry unchanged.
+        mode: What is output for each period, ignored if the rate is 0 .
+        """
+        if rate < 0.0:
+            return False, None
+
+        return True, RateConverter(cls.__private_key, rate, mode)
+
+    def __init__(self, key: object, rate: float, mode: RateMode) -> None:
+        assert key is RateConverter.__private_key, "Use create() method"
+
+        self.__period = 0.0 if rate == 0.0 else 1000 / rate  # ms
+        self.__mode = mode
+        self.__period_start = None
+        self.__latest = None
+
+        # Running totals of the period, over values which are not None
+        field_count = len(telemetry.TelemetryData.FIELDS)
+        self.__sums = np.zeros(field_count)
+        self.__counts = np.zeros(field_count, np.int64)
+        self.__mins = np.full(field_count, math.nan)
+        self.__maxs = np.full(field_count, math.nan)
+        self.__sin_sums = np.zeros(len(self.__ANGLE_INDICES))
+        self.__cos_sums = np.zeros(len(self.__ANGLE_INDICES))
+        # First angles of the period, which angle minimums and maximums are offsets from
+        self.__angle_references = np.full(len(self.__ANGLE_INDICES), math.nan)
+
+        self.input_count = 0
+        self.output_count = 0
+
+    def run(self, data: telemetry.TelemetryData) -> "list[telemetry.TelemetryData]":
+        """
+        Adds telemetry to the current period.
+
+        Returns the outputs of the period if it ended, otherwise nothing.
+        """
+        self.input_count += 1
+        if self.__period == 0.0:
+            self.output_count += 1
+            return [data]
+
+        now = data.time_since_boot
+        if now is None:
+            now = time.monotonic() * 1000
+
+        if self.__period_start is None or now < self.__period_start:
+            self.__period_start = now
+
+        self.__latest = data
+        if self.__mode != RateMode.LATEST:
+            row = np.array(data.to_row().tolist())
+            valid = ~np.isnan(row)
+            self.__sums += np.where(valid, row, 0.0)
+            self.__counts += valid
+            angles = row[self.__ANGLE_INDICES]
+            angles_valid = valid[self.__ANGLE_INDICES]
+            self.__sin_sums += np.where(angles_valid, np.sin(angles), 0.0)
+            self.__cos_sums += np.where(angles_valid, np.cos(angles), 0.0)
+            self.__angle_references = np.where(
+                np.isnan(self.__angle_references), angles, self.__angle_references
+            )
+            # Assumes the angles of a period are within pi of the first
+            row[self.__ANGLE_INDICES] = self.__wrap(angles - self.__angle_references)
+            np.fmin(self.__mins, row, out=self.__mins)
+            np.fmax(self.__maxs, row, out=self.__maxs)
+
+        if now - self.__period_start < self.__period:
+            return []
+
+        outputs = self.__outputs()
+        self.output_count += len(outputs)
+        self.__period_start = now
+        self.__reset()
+        return outputs
+
+    def __outputs(self) -> "list[telemetry.TelemetryData]":
+        """
+        Telemetry for the period which just ended.
+        """
+        if self.__mode == RateMode.LATEST:
+            return [self.__latest]
+
+        if self.__mode == RateMode.AVERAGE:
+            with np.errstate(invalid="ignore"):
+                means = self.__sums / self.__counts
+                # Dividing both sums by the count does not change the angle
+                counts = self.__counts[self.__ANGLE_INDICES]
+                means[self.__ANGLE_INDICES] = np.where(
+                    counts > 0, np.arctan2(self.__sin_sums, self.__cos_sums), math.nan
+                )
+            rows = [means]
+        else:
+            rows = [self.__mins.copy(), self.__maxs.copy()]
+            for row in rows:
+                row[self.__ANGLE_INDICES] = self.__wrap(
+                    self.__angle_references + row[self.__ANGLE_INDICES]
+                )
+
+        outputs = []
+        for row in rows:
+            fields = [None if math.isnan(value) else value for value in row.tolist()]
+            fields[0] = self.__latest.time_since_boot
+            outputs.append(telemetry.TelemetryData(*fields))
+
+        return outputs
+
+    def __reset(self) -> None:
+        """
+        Starts a new period.
+        """
+        self.__latest = None
+        self.__sums.fill(0.0)
+        self.__counts.fill(0)
+        self.__mins.fill(math.nan)
+        self.__maxs.fill(math.nan)
+        self.__sin_sums.fill(0.0)
+        self.__cos_sums.fill(0.0)
+        self.__angle_references.fill(math.nan)
+
+    @staticmethod
+    def __wrap(angles: np.ndarray) -> np.ndarray:
+        """
+        Wraps angles in radians to [-pi, pi) .
+        """
+        return (angles + math.pi) % (2 * math.pi) - math.pi
+
+    def __str__(self) -> str:
+        return f"mode: {self.__mode.name}, in: {self.input_count}, out: {self.output_count}"
@@ -0,0 +1,66 @@
+"""
+Rate converter worker between telemetry and its consumers.
+"""
+
+import os
+import pathlib
+
+from utilities.workers import queue_proxy_wrapper
+from utilities.workers import worker_controller
+from . import rate_converter
+from ..common.modules.logger import logger
+
+
+def rate_converter_worker(
+    subscriptions: "list[tuple[queue_proxy_wrapper.QueueProxyWrapper, float, rate_converter.RateMode]]",
+    input_queue: queue_proxy_wrapper.QueueProxyWrapper,
+    controller: worker_controller.WorkerController,
+) -> None:
+    """
+    Worker process.
+
+    subscriptions: output queue, target rate in Hz (0 for every telemetry) and mode of each consumer
+    input_queue: receive telemetry data
+    controller: how the main process communicates to this worker process.
+    """
+    # Instantiate logger
+    worker_name = pathlib.Path(__file__).stem
+    process_id = os.getpid()
+    result, local_logger = logger.Logger.create(f"{worker_name}_{process_id}", True)
+    if not result:
+        print("ERROR: Worker failed to create logger")
+        return
+
+    # Get Pylance to stop complaining
+    assert local_logger is not None
+
+    local_logger.info("Logger initialized", True)
+
+    converters = []
+    for output_queue, rate, mode in subscriptions:
+        result, converter = rate_converter.RateConverter.create(rate, mode)
+        if not result:
+            local_logger.error(f"Failed to create RateConverter at {rate} Hz")
+            return
+
+        # Get Pylance to stop complaining
+        assert converter is not None
+
+        converters.append((converter, output_queue))
+
+    local_logger.info("Rate converter worker started.")
+
+    # Sleeps in the queue until telemetry arrives, stops on exit or sentinel
+    for data in input_queue.consume(controller):
+        controller.check_pause()
+        for converter, output_queue in converters:
+            outputs = converter.run(data)
+            if len(outputs) == 1:
+                output_queue.put(outputs[0])
+            elif len(outputs) > 1:
+                output_queue.put_many(outputs)
+
+    for converter, _ in converters:
+        local_logger.info(f"Rate converter: {converter}")
+
+    local_logger.info("Rate converter worker stopped.")
@@ -0,0 +1,162 @@
+"""
+Vectorized decoding of LOCAL_POSITION_NED and ATTITUDE frames into NumPy structured arrays.
+"""
+
+import numpy as np
+
+
+LOCAL_POSITION_NED_ID = 32
+ATTITUDE_ID = 30
+
+# Payload layouts, named as in TelemetryData
+POSITION_DTYPE = np.dtype(
+    [
+        ("time_since_boot", "<u4"),
+        ("x", "<f4"),
+        ("y", "<f4"),
+        ("z", "<f4"),
+        ("x_velocity", "<f4"),
+        ("y_velocity", "<f4"),
+        ("z_velocity", "<f4"),
+    ]
+)
+ATTITUDE_DTYPE = np.dtype(
+    [
+        ("time_since_boot", "<u4"),
+        ("roll", "<f4"),
+        ("pitch", "<f4"),
+        ("yaw", "<f4"),
+        ("roll_speed", "<f4"),
+        ("pitch_speed", "<f4"),
+        ("yaw_speed", "<f4"),
+    ]
+)
+
+# Message ID to (payload layout, CRC extra)
+_MESSAGES = {
+    LOCAL_POSITION_NED_ID: (POSITION_DTYPE, 185),
+    ATTITUDE_ID: (ATTITUDE_DTYPE, 39),
+}
+_PAYLOAD_LENGTH = 28
+
+_STX_V1 = 0xFE
+_STX_V2 = 0xFD
+_HEADER_LENGTH_V1 = 6
+_HEADER_LENGTH_V2 = 10
+_CRC_LENGTH = 2
+_SIGNATURE_LENGTH = 13
+_INCOMPAT_FLAG_SIGNED = 0x01
+# Longest frame of a decoded message
+_MAX_FRAME_LENGTH = _HEADER_LENGTH_V2 + _PAYLOAD_LENGTH + _CRC_LENGTH + _SIGNATURE_LENGTH
+
+
+def _x25_crc(
+    data: np.ndarray, starts: np.ndarray, lengths: np.ndarray, crc_extras: np.ndarray
+) -> np.ndarray:
+    """
+    MAVLink checksum of each frame, computed for all frames at once one byte position at a time.
+
+    data: Buffer with room past the end of the last frame.
+    starts: Index of the first checksummed byte, after the start byte.
+    lengths: Number of checksummed bytes, excluding the CRC extra.
+    """
+    crcs = np.full(len(starts), 0xFFFF, dtype=np.uint32)
+    for position in range(int(lengths.max(initial=0)) + 1):
+        byte = data[starts + position].astype(np.uint32)
+        # The CRC extra follows the payload
+        byte = np.where(position == lengths, crc_extras, byte)
+        tmp = byte ^ (crcs & 0xFF)
+        tmp = (tmp ^ (tmp << 4)) & 0xFF
+        updated = ((crcs >> 8) ^ (tmp << 8) ^ (tmp << 3) ^ (tmp >> 4)) & 0xFFFF
+        crcs = np.where(position <= lengths, updated, crcs)
+
+    return crcs
+
+
+def decode(buffer: "bytes | bytearray | memoryview") -> "tuple[np.ndarray, np.ndarray, int]":
+    """
+    Finds every valid LOCAL_POSITION_NED and ATTITUDE frame, MAVLink 1 or 2,
+    and skips everything else.
+
+    Returns the positions and attitudes as arrays of POSITION_DTYPE and ATTITUDE_DTYPE
+    in buffer order, and the number of bytes consumed.
+    Bytes after that may be the start of an incomplete frame and should be kept for the next call.
+    """
+    size = len(buffer)
+    # Padding so indexing past the end of a truncated frame stays in bounds
+    data = np.concatenate(
+        [np.frombuffer(buffer, dtype=np.uint8), np.zeros(_MAX_FRAME_LENGTH, dtype=np.uint8)]
+    )
+
+    starts = np.flatnonzero((data[:size] == _STX_V1) | (data[:size] == _STX_V2))
+    is_v2 = data[starts] == _STX_V2
+    payload_lengths = data[starts + 1].astype(np.int64)
+    msg_ids = np.where(
+        is_v2,
+        data[starts + 7].astype(np.int64)
+        | (data[starts + 8].astype(np.int64) << 8)
+        | (data[starts + 9].astype(np.int64) << 16),
+        data[starts + 5].astype(np.int64),
+    )
+    header_lengths = np.where(is_v2, _HEADER_LENGTH_V2, _HEADER_LENGTH_V1)
+    signed = is_v2 & ((data[starts + 2] & _INCOMPAT_FLAG_SIGNED) != 0)
+    frame_lengths = (
+        header_lengths + payload_lengths + _CRC_LENGTH + np.where(signed, _SIGNATURE_LENGTH, 0)
+    )
+
+    # MAVLink 1 payloads are never truncated
+    candidates = (
+        np.isin(msg_ids, list(_MESSAGES))
+        & (payload_lengths <= _PAYLOAD_LENGTH)
+        & (is_v2 | (payload_lengths == _PAYLOAD_LENGTH))
+        & (starts + frame_lengths <= size)
+    )
+    starts = starts[candidates]
+    is_v2 = is_v2[candidates]
+    payload_lengths = payload_lengths[candidates]
+    msg_ids = msg_ids[candidates]
+    header_lengths = header_lengths[candidates]
+    frame_lengths = frame_lengths[candidates]
+
+    crc_extras = np.zeros(len(starts), dtype=np.uint32)
+    for msg_id, (_, crc_extra) in _MESSAGES.items():
+        crc_extras[msg_ids == msg_id] = crc_extra
+
+    crc_starts = starts + header_lengths + payload_lengths
+    received_crcs = data[crc_starts].astype(np.uint32) | (
+        data[crc_starts + 1].astype(np.uint32) << 8
+    )
+    valid = (
+        _x25_crc(data, starts + 1, header_lengths - 1 + payload_lengths, crc_extras)
+        == received_crcs
+    )
+    starts = starts[valid]
+    payload_lengths = payload_lengths[valid]
+    msg_ids = msg_ids[valid]
+    header_lengths = header_lengths[valid]
+    ends = starts + frame_lengths[valid]
+
+    # Start bytes inside an earlier frame are not frames
+    if len(starts) > 0:
+        previous_ends = np.concatenate([[0], np.maximum.accumulate(ends)[:-1]])
+        outside = starts >= previous_ends
+        starts = starts[outside]
+        payload_lengths = payload_lengths[outside]
+        msg_ids = msg_ids[outside]
+        header_lengths = header_lengths[outside]
+        ends = ends[outside]
+
+    # Truncated MAVLink 2 payloads are zero extended
+    columns = np.arange(_PAYLOAD_LENGTH)
+    payloads = data[(starts + header_lengths)[:, np.newaxis] + columns]
+    payloads[columns >= payload_lengths[:, np.newaxis]] = 0
+
+    positions = payloads[msg_ids == LOCAL_POSITION_NED_ID].view(POSITION_DTYPE).reshape(-1)
+    attitudes = payloads[msg_ids == ATTITUDE_ID].view(ATTITUDE_DTYPE).reshape(-1)
+
+    # Frames starting before this are complete, and any decoded frame is not decoded again
+    consumed = max(size - _MAX_FRAME_LENGTH, 0)
+    if len(ends) > 0:
+        consumed = max(consumed, int(ends[-1]))
+
+    return positions, attitudes, consumed
@@ -2,17 +2,48 @@
 Telemetry gathering logic.
 """
 
+import math
+import operator
+import select
+import struct
 import time
 from typing import Tuple, Union, Optional
+import numpy as np
 from pymavlink import mavutil
 from ..common.modules.logger import logger
 
 
+# Wire format of TelemetryData, little endian without padding:
+# version (uint8), None mask (uint16), time_since_boot (uint32), remaining fields (float64)
+# Bit i of the None mask is set if field i is None, and the value is then 0 or NaN
+TELEMETRY_DATA_WIRE_VERSION = 1
+TELEMETRY_DATA_WIRE_FORMAT = struct.Struct("<BHI12d")
+
+
 class TelemetryData:  # pylint: disable=too-many-instance-attributes
     """
     Python struct to represent Telemtry Data. Contains the most recent attitude and position reading.
+    Slots only, without a per instance dictionary.
     """
 
+    FIELDS = (
+        "time_since_boot",
+        "x",
+        "y",
+        "z",
+        "x_velocity",
+        "y_velocity",
+        "z_velocity",
+        "roll",
+        "pitch",
+        "yaw",
+        "roll_speed",
+        "pitch_speed",
+        "yaw_speed",
+    )
+
+    __slots__ = FIELDS
+
     def __init__(
         self,
         time_since_boot: int | None = None,  # ms
@@ -60,71 +91,261 @@ class TelemetryData:  # pylint: disable=too-many-instance-attributes
             yaw_speed: {self.yaw_speed}
         }}"""
 
+    def __reduce__(self) -> "tuple":
+        """
+        Pickle as the binary wire format, so queues carry the compact encoding.
+        Falls back to the field values if the time does not fit the wire format.
+        """
+        values = _FIELD_GETTER(self)
+        time_since_boot = _wire_time(values[0])
+        if time_since_boot is None and values[0] is not None:
+            return TelemetryData, values
+
+        return _telemetry_data_from_wire, (self.__pack(time_since_boot, values),)
+
+    def to_bytes(self) -> bytes:
+        """
+        Encodes into the fixed layout binary wire format.
+
+        Raises ValueError if time_since_boot is not a whole number of ms in [0, 2^32) .
+        """
+        values = _FIELD_GETTER(self)
+        time_since_boot = _wire_time(values[0])
+        if time_since_boot is None and values[0] is not None:
+            raise ValueError(f"time_since_boot {values[0]} does not fit the wire format")
+
+        return self.__pack(time_since_boot, values)
+
+    @staticmethod
+    def __pack(time_since_boot: "int | None", values: "tuple") -> bytes:
+        """
+        Encodes the field values with the time already checked.
+        """
+        if None not in values:
+            return TELEMETRY_DATA_WIRE_FORMAT.pack(
+                TELEMETRY_DATA_WIRE_VERSION, 0, time_since_boot, *values[1:]
+            )
+
+        none_mask = 0
+        encoded = [0 if time_since_boot is None else time_since_boot]
+        if time_since_boot is None:
+            none_mask = 1
+        for i, value in enumerate(values[1:], 1):
+            if value is None:
+                none_mask |= 1 << i
+                value = math.nan
+
+            encoded.append(value)
+
+        return TELEMETRY_DATA_WIRE_FORMAT.pack(TELEMETRY_DATA_WIRE_VERSION, none_mask, *encoded)
+
+    @classmethod
+    def from_buffer(
+        cls, buffer: "bytes | bytearray | memoryview", offset: int = 0
+    ) -> "tuple[bool, TelemetryData | None]":
+        """
+        Decodes the binary wire format in place from a buffer, without copying.
+
+        buffer: Buffer containing an encoded TelemetryData.
+        offset: Start of the encoding in bytes.
+
+        Returns whether the buffer contains a supported encoding and the TelemetryData.
+        """
+        if len(buffer) - offset < TELEMETRY_DATA_WIRE_FORMAT.size:
+            return False, None
+
+        version, none_mask, *values = TELEMETRY_DATA_WIRE_FORMAT.unpack_from(buffer, offset)
+        if version != TELEMETRY_DATA_WIRE_VERSION:
+            return False, None
+
+        if none_mask == 0:
+            return True, cls(*values)
+
+        fields = [None if none_mask & (1 << i) else value for i, value in enumerate(values)]
+
+        return True, cls(*fields)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "tuple[bool, TelemetryData | None]":
+        """
+        Decodes the binary wire format.
+
+        data: Exactly one encoded TelemetryData.
+
+        Returns whether the data is a supported encoding and the TelemetryData.
+        """
+        if len(data) != TELEMETRY_DATA_WIRE_FORMAT.size:
+            return False, None
+
+        return cls.from_buffer(data)
+
+    def to_row(self, row: "np.void | None" = None) -> np.void:
+        """
+        Converts into a NumPy row, with None as NaN.
+
+        row: Row of a TELEMETRY_DATA_DTYPE array to fill in place, None for a new row.
+
+        Returns the row.
+        """
+        if row is None:
+            row = np.zeros((), TELEMETRY_DATA_DTYPE)[()]
+
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            row[name] = math.nan if value is None else value
+
+        return row
+
+    @classmethod
+    def from_row(cls, row: np.void) -> "TelemetryData":
+        """
+        Converts from a NumPy row, with NaN as None.
+
+        row: Row with any of the fields of TELEMETRY_DATA_DTYPE, such as from the bulk decoder.
+        Missing fields are None.
+        """
+        fields = []
+        for name in cls.FIELDS:
+            if name not in row.dtype.names:
+                fields.append(None)
+                continue
+
+            value = row[name].item()
+            fields.append(None if isinstance(value, float) and math.isnan(value) else value)
+
+        if fields[0] is not None:
+            fields[0] = int(fields[0])
+
+        return cls(*fields)
+
+    @classmethod
+    def to_array(cls, items: "list[TelemetryData]") -> np.ndarray:
+        """
+        Converts many into a TELEMETRY_DATA_DTYPE array for batch consumers, with None as NaN.
+        """
+        return np.array(
+            [
+                tuple(
+                    math.nan if getattr(item, name) is None else getattr(item, name)
+                    for name in cls.FIELDS
+                )
+                for item in items
+            ],
+            TELEMETRY_DATA_DTYPE,
+        )
+
+
+_FIELD_GETTER = operator.attrgetter(*TelemetryData.FIELDS)
+_WIRE_TIME_MAX = 2**32 - 1  # ms
+
+
+def _wire_time(time_since_boot: "int | float | None") -> "int | None":
+    """
+    Time since boot as the wire format's uint32, accepting floats with whole values.
+
+    Returns None if the time is missing or does not fit.
+    """
+    if isinstance(time_since_boot, float):
+        if not time_since_boot.is_integer():
+            return None
+
+        time_since_boot = int(time_since_boot)
+
+    if not isinstance(time_since_boot, int) or not 0 <= time_since_boot <= _WIRE_TIME_MAX:
+        return None
+
+    return time_since_boot
+
+
+# One row per TelemetryData, every field float64 so None is NaN
+TELEMETRY_DATA_DTYPE = np.dtype([(name, "<f8") for name in TelemetryData.FIELDS])
+
+
+def _telemetry_data_from_wire(data: bytes) -> TelemetryData:
+    """
+    Unpickles TelemetryData.
+    """
+    result, telemetry_data = TelemetryData.from_bytes(data)
+    if not result:
+        raise ValueError("Unsupported TelemetryData wire format")
+
+    return telemetry_data
+
 
 # =================================================================================================
 #                            ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
 # =================================================================================================
-class Telemetry:
+class Telemetry:  # pylint: disable=too-many-instance-attributes
     """
     Telemetry class to read position and attitude (orientation).
     """
 
     __private_key = object()
 
+    __MESSAGE_TYPES = ["LOCAL_POSITION_NED", "ATTITUDE"]
+    __TIMEOUT = 1.0  # seconds
+    # Fusion does not extrapolate a component older than this
+    __MAX_EXTRAPOLATION = 1000  # ms
+
     @classmethod
     def create(
         cls,
         connection: mavutil.mavfile,
         local_logger: logger.Logger,
+        event_driven: bool = True,
+        fusion: bool = False,
     ) -> Tuple[bool, Union["Telemetry", None]]:
         """
         Falliable create (instantiation) method to create a Telemetry object.
+
+        event_driven: Sleep until the connection is readable instead of polling it.
+        fusion: Output on every message, extrapolating to the newest timestamp.
         """
-        return True, Telemetry(cls.__private_key, connection, local_logger)
+        return True, Telemetry(cls.__private_key, connection, local_logger, event_driven, fusion)
 
     def __init__(
         self,
         key: object,
         connection: mavutil.mavfile,
         local_logger: logger.Logger,
+        event_driven: bool,
+        fusion: bool,
     ) -> None:
         assert key is Telemetry.__private_key, "Use create() method"
 
         # Do any intializiation here
         self.connection = connection
         self.__log = local_logger
+        self.__event_driven = event_driven
+        self.__fusion = fusion
         self.position_msg = None
         self.attitude_msg = None
+        # Age in ms of each message at the time of the last output, set by fusion
+        self.position_age = None
+        self.attitude_age = None
+        # Messages replaced by a newer one of the same type before the pair was complete
+        self.dropped_count = 0
         self.__log.info("Telemetry initialized")
 
     def run_telemetry(self) -> Optional[TelemetryData]:
         """
         Receive LOCAL_POSITION_NED and ATTITUDE messages from the drone,
         combining them together to form a single TelemetryData object.
+        Returns as soon as both have arrived, so each call outputs the next pair and later
+        messages are left for the next call. A message followed by another of the same type
+        before the pair is complete is dropped and counted in `dropped_count`.
         """
         # Read MAVLink message LOCAL_POSITION_NED (32)
         # Read MAVLink message ATTITUDE (30)
         # Return the most recent of both, and use the most recent message's timestamp
 
-        start = time.time()
-        timeout_period = 1.0
+        if self.__fusion:
+            return self.__fuse()
 
-        temp_position_msg = None
-        temp_attitude_msg = None
-
-        while time.time() - start < timeout_period:
-            msg = self.connection.recv_match(
-                type=["LOCAL_POSITION_NED", "ATTITUDE"], blocking=False, timeout=0.1
-            )
-            if not msg:
-                continue
-            if msg.get_type() == "LOCAL_POSITION_NED":
-                temp_position_msg = msg
-            if msg.get_type() == "ATTITUDE":
-                temp_attitude_msg = msg
-
-            if temp_position_msg and temp_attitude_msg:
-                break
+        if self.__event_driven:
+            temp_position_msg, temp_attitude_msg = self.__wait_for_messages()
+        else:
+            temp_position_msg, temp_attitude_msg = self.__poll_for_messages()
 
         if temp_position_msg and temp_attitude_msg:
             self.position_msg = temp_position_msg
@@ -148,6 +369,169 @@ class Telemetry:
             return telemetry_data
         return None
 
+    def __fuse(self) -> Optional[TelemetryData]:
+        """
+        Receives one message and combines it with the latest of the other type,
+        both extrapolated linearly to the newer of their timestamps using their rates,
+        so output times never go backwards.
+
+        Returns None until both types have been received, if the message is older than
+        the latest of its type, or if a message is too old to extrapolate.
+        """
+        msg = self.__receive_one()
+        if msg is None:
+            return None
+
+        if msg.get_type() == "LOCAL_POSITION_NED":
+            if self.position_msg is not None and msg.time_boot_ms < self.position_msg.time_boot_ms:
+                return None
+
+            self.position_msg = msg
+        else:
+            if self.attitude_msg is not None and msg.time_boot_ms < self.attitude_msg.time_boot_ms:
+                return None
+
+            self.attitude_msg = msg
+
+        if self.position_msg is None or self.attitude_msg is None:
+            return None
+
+        time_since_boot = max(self.position_msg.time_boot_ms, self.attitude_msg.time_boot_ms)
+        self.position_age = time_since_boot - self.position_msg.time_boot_ms
+        self.attitude_age = time_since_boot - self.attitude_msg.time_boot_ms
+        if max(abs(self.position_age), abs(self.attitude_age)) > self.__MAX_EXTRAPOLATION:
+            return None
+
+        position_dt = self.position_age / 1000
+        attitude_dt = self.attitude_age / 1000
+
+        return TelemetryData(
+            time_since_boot=time_since_boot,
+            x=self.position_msg.x + self.position_msg.vx * position_dt,
+            y=self.position_msg.y + self.position_msg.vy * position_dt,
+            z=self.position_msg.z + self.position_msg.vz * position_dt,
+            x_velocity=self.position_msg.vx,
+            y_velocity=self.position_msg.vy,
+            z_velocity=self.position_msg.vz,
+            roll=_wrap_angle(self.attitude_msg.roll + self.attitude_msg.rollspeed * attitude_dt),
+            pitch=_wrap_angle(self.attitude_msg.pitch + self.attitude_msg.pitchspeed * attitude_dt),
+            yaw=_wrap_angle(self.attitude_msg.yaw + self.attitude_msg.yawspeed * attitude_dt),
+            roll_speed=self.attitude_msg.rollspeed,
+            pitch_speed=self.attitude_msg.pitchspeed,
+            yaw_speed=self.attitude_msg.yawspeed,
+        )
+
+    def __receive_one(self) -> "object | None":
+        """
+        Next position or attitude message, sleeping until one arrives or the timeout.
+
+        Returns None if nothing arrived.
+        """
+        fd = getattr(self.connection, "fd", None)
+        if not self.__event_driven or fd is None:
+            return self.connection.recv_match(
+                type=self.__MESSAGE_TYPES, blocking=True, timeout=self.__TIMEOUT
+            )
+
+        deadline = time.monotonic() + self.__TIMEOUT
+        while True:
+            msg = self.connection.recv_match(type=self.__MESSAGE_TYPES, blocking=False)
+            if msg is not None:
+                return msg
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0.0:
+                return None
+
+            select.select([fd], [], [], remaining)
+
+    def __poll_for_messages(self) -> "tuple[object | None, object | None]":
+        """
+        Busy polls the connection until both messages arrive or the timeout.
+
+        Returns the position and attitude messages, None if not received.
+        """
+        start = time.time()
+
+        temp_position_msg = None
+        temp_attitude_msg = None
+
+        while time.time() - start < self.__TIMEOUT:
+            msg = self.connection.recv_match(type=self.__MESSAGE_TYPES, blocking=False)
+            if not msg:
+                continue
+            if msg.get_type() == "LOCAL_POSITION_NED":
+                if temp_position_msg:
+                    self.dropped_count += 1
+                temp_position_msg = msg
+            if msg.get_type() == "ATTITUDE":
+                if temp_attitude_msg:
+                    self.dropped_count += 1
+                temp_attitude_msg = msg
+
+            if temp_position_msg and temp_attitude_msg:
+                break
+
+        return temp_position_msg, temp_attitude_msg
+
+    def __wait_for_messages(self) -> "tuple[object | None, object | None]":
+        """
+        Handles already received messages, sleeping until the connection is readable
+        when there are none, until both messages arrive or the timeout.
+        Connections without a file descriptor block in `recv_match()` instead.
+
+        Returns the position and attitude messages, None if not received.
+        """
+        deadline = time.monotonic() + self.__TIMEOUT
+        fd = getattr(self.connection, "fd", None)
+
+        received = {}
+        while len(received) < len(self.__MESSAGE_TYPES):
+            # Already received message, without waiting
+            msg = self.connection.recv_msg()
+            if msg is not None:
+                self.__add_to_pair(received, msg)
+                continue
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0.0:
+                break
+
+            if fd is not None:
+                select.select([fd], [], [], remaining)
+                continue
+
+            msg = self.connection.recv_match(
+                type=self.__MESSAGE_TYPES, blocking=True, timeout=remaining
+            )
+            if msg is None:
+                break
+
+            self.__add_to_pair(received, msg)
+
+        return received.get("LOCAL_POSITION_NED"), received.get("ATTITUDE")
+
+    def __add_to_pair(self, received: "dict[str, object]", msg: object) -> None:
+        """
+        Adds a position or attitude message to the pair, replacing and counting
+        an earlier one of the same type. Other messages are ignored.
+        """
+        msg_type = msg.get_type()
+        if msg_type not in self.__MESSAGE_TYPES:
+            return
+
+        if msg_type in received:
+            self.dropped_count += 1
+
+        received[msg_type] = msg
+
+
+def _wrap_angle(angle: float) -> float:
+    """
+    Wraps an angle in radians to [-pi, pi) .
+    """
+    return (angle + math.pi) % (2 * math.pi) - math.pi
+
 
 # =================================================================================================
 #                            ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
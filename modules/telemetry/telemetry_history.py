@@ -0,0 +1,169 @@
+"""
+Bounded history of telemetry, held as NumPy columns.
+"""
+
+import math
+from typing import Tuple, Union
+
+import numpy as np
+
+from . import telemetry
+
+
+class TelemetryHistory:
+    """
+    Ring buffer of the most recent TelemetryData in time order, one float64 column per field
+    with None as NaN. Lookups by time are binary searches and windows are views.
+
+    Columns are twice the capacity and the newest rows are moved to the front when the end
+    is reached, so every window is contiguous. Views are only valid until the next append.
+    """
+
+    __private_key = object()
+
+    __COLUMN_COUNT = len(telemetry.TelemetryData.FIELDS)
+    # Bytes of one row, twice for the room to append before moving
+    __ROW_COST = 2 * __COLUMN_COUNT * np.dtype(np.float64).itemsize
+
+    @classmethod
+    def create(cls, memory_budget: int) -> Tuple[bool, Union["TelemetryHistory", None]]:
+        """
+        Falliable create (instantiation) method to create a TelemetryHistory object.
+
+        memory_budget: Bytes of column storage, which sets the number of rows kept.
+        """
+        capacity = memory_budget // cls.__ROW_COST
+        if capacity < 1:
+            return False, None
+
+        return True, TelemetryHistory(cls.__private_key, capacity)
+
+    def __init__(self, key: object, capacity: int) -> None:
+        assert key is TelemetryHistory.__private_key, "Use create() method"
+
+        self.capacity = capacity
+        self.__storage = np.empty((self.__COLUMN_COUNT, 2 * capacity))
+        self.__start = 0
+        self.__end = 0
+
+        # Lifetime sums and counts of values which are not None, including evicted rows
+        self.__sums = np.zeros(self.__COLUMN_COUNT)
+        self.__counts = np.zeros(self.__COLUMN_COUNT, np.int64)
+
+    def __len__(self) -> int:
+        return self.__end - self.__start
+
+    def append(self, data: telemetry.TelemetryData) -> bool:
+        """
+        Adds the newest telemetry, evicting the oldest if full.
+        A missing time takes the latest time, so rows stay in time order.
+
+        Returns False if the time is older than the latest time.
+        """
+        values = [
+            math.nan if getattr(data, name) is None else getattr(data, name)
+            for name in telemetry.TelemetryData.FIELDS
+        ]
+        if len(self) > 0:
+            latest_time = self.__storage[0, self.__end - 1]
+            if math.isnan(values[0]):
+                values[0] = latest_time
+            elif values[0] < latest_time:
+                return False
+        elif math.isnan(values[0]):
+            values[0] = 0
+
+        if self.__end == self.__storage.shape[1]:
+            # Move the newest capacity - 1 rows to the front
+            kept = self.capacity - 1
+            self.__storage[:, :kept] = self.__storage[:, self.__end - kept : self.__end]
+            self.__start = 0
+            self.__end = kept
+
+        self.__storage[:, self.__end] = values
+        self.__end += 1
+        if len(self) > self.capacity:
+            self.__start += 1
+
+        row = self.__storage[:, self.__end - 1]
+        valid = ~np.isnan(row)
+        self.__sums += np.where(valid, row, 0.0)
+        self.__counts += valid
+
+        return True
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        View of every kept value of a field, oldest first.
+
+        name: Field of TelemetryData.
+        """
+        return self.__storage[self.__index(name), self.__start : self.__end]
+
+    def find(self, time_since_boot: float) -> int:
+        """
+        Index of the newest row at or before the time, counting from the oldest row.
+
+        Returns -1 if every row is after the time.
+        """
+        times = self.column("time_since_boot")
+        return int(np.searchsorted(times, time_since_boot, side="right")) - 1
+
+    def at(self, time_since_boot: float) -> "tuple[bool, telemetry.TelemetryData | None]":
+        """
+        Newest telemetry at or before the time.
+        """
+        index = self.find(time_since_boot)
+        if index < 0:
+            return False, None
+
+        return True, self.get(index)
+
+    def get(self, index: int) -> telemetry.TelemetryData:
+        """
+        Telemetry at an index counting from the oldest row, negative counting from the newest.
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TelemetryHistory index out of range")
+
+        values = self.__storage[:, self.__start + index].tolist()
+        fields = [None if math.isnan(value) else value for value in values]
+        fields[0] = int(fields[0])
+        return telemetry.TelemetryData(*fields)
+
+    def window(self, start_time: float, end_time: float) -> "dict[str, np.ndarray]":
+        """
+        Views of every field for rows with start_time <= time < end_time.
+
+        Returns field names and their views.
+        """
+        times = self.column("time_since_boot")
+        start = self.__start + int(np.searchsorted(times, start_time, side="left"))
+        end = self.__start + int(np.searchsorted(times, end_time, side="left"))
+        return {
+            name: self.__storage[i, start:end]
+            for i, name in enumerate(telemetry.TelemetryData.FIELDS)
+        }
+
+    def mean(self, name: str) -> "float | None":
+        """
+        Mean of a field over every row ever appended, ignoring None.
+
+        name: Field of TelemetryData.
+
+        Returns None if the field was always None.
+        """
+        i = self.__index(name)
+        if self.__counts[i] == 0:
+            return None
+
+        return float(self.__sums[i] / self.__counts[i])
+
+    @staticmethod
+    def __index(name: str) -> int:
+        """
+        Row of the field in storage.
+        """
+        return telemetry.TelemetryData.FIELDS.index(name)
@@ -7,17 +7,24 @@ import pathlib
 
 from pymavlink import mavutil
 
+from utilities.logging_tools import sampled_logger
+from utilities.mavlink import header_filter
 from utilities.workers import queue_proxy_wrapper
 from utilities.workers import worker_controller
 from . import telemetry
 from ..common.modules.logger import logger
 
 
+# Telemetry is logged at most this often
+TELEMETRY_LOG_INTERVAL = 1.0  # seconds
+
+
 # =================================================================================================
 #                            ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
 # =================================================================================================
 def telemetry_worker(
     connection: mavutil.mavfile,
+    fusion: bool,
     output_queue: queue_proxy_wrapper.QueueProxyWrapper,
     controller: worker_controller.WorkerController,
     # Add other necessary worker arguments here
@@ -26,6 +33,7 @@ def telemetry_worker(
     Worker process.
 
     connection: connection instance
+    fusion: output on every message instead of waiting for both
     output_queue: output to other process
     controller: how the main process communicates to this worker process.
     """
@@ -50,21 +58,48 @@ def telemetry_worker(
     #                          ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
     # =============================================================================================
     # Instantiate class object (telemetry.Telemetry)
-    check, telemetry_instance = telemetry.Telemetry.create(connection, local_logger)
+    check, telemetry_instance = telemetry.Telemetry.create(connection, local_logger, fusion=fusion)
     if not check:
         local_logger.error("Error with creating instance")
 
+    # Decode only what telemetry reads, unless the router already filters
+    telemetry_filter = None
+    if isinstance(connection, mavutil.mavfile):
+        _, telemetry_filter = header_filter.HeaderFilter.create(["LOCAL_POSITION_NED", "ATTITUDE"])
+        telemetry_filter.attach(connection)
+
+    _, telemetry_logger = sampled_logger.SampledLogger.create(local_logger, TELEMETRY_LOG_INTERVAL)
+
     # Main loop: do work.
 
     local_logger.info("Telemetry worker started.")
 
+    dropped_count = 0
     while not controller.is_exit_requested():
         controller.check_pause()
         data = telemetry_instance.run_telemetry()
+        if telemetry_instance.dropped_count > dropped_count:
+            dropped_count = telemetry_instance.dropped_count
+            telemetry_logger.warning(
+                "Dropped {} messages replaced before pairing, in total", dropped_count
+            )
         if not data:
             continue
-        output_queue.queue.put(data)
-        local_logger.info(f"Telemetry data: {data}")
+        output_queue.put(data)
+        telemetry_logger.info("Telemetry data: {}", data)
+        if fusion:
+            telemetry_logger.info(
+                "Position age: {} ms, attitude age: {} ms",
+                telemetry_instance.position_age,
+                telemetry_instance.attitude_age,
+            )
+
+    local_logger.info(
+        f"Dropped {telemetry_instance.dropped_count} messages replaced before pairing"
+    )
+    local_logger.info(f"Telemetry logging: {telemetry_logger}")
+    if telemetry_filter is not None:
+        local_logger.info(f"Header filter: {telemetry_filter}")
     local_logger.info("Telemetry worker stopped.")
 
 
@@ -0,0 +1,97 @@
+"""
+Compare frames per second of vectorized bulk decoding and per message `recv_match()` decoding.
+
+To run:
+```
+python -m tests.benchmarks.benchmark_bulk_decoder
+```
+"""
+
+import pathlib
+import tempfile
+import time
+
+from pymavlink import mavutil
+
+from modules.telemetry import bulk_decoder
+
+
+NUM_FRAMES = 100000
+# Other traffic on the link, one heartbeat per this many telemetry frames
+HEARTBEAT_EVERY = 20
+
+
+def make_buffer() -> bytes:
+    """
+    NUM_FRAMES alternating position and attitude frames with some heartbeats.
+    """
+    mav = mavutil.mavlink.MAVLink(None, srcSystem=1)
+    frames = []
+    for i in range(NUM_FRAMES):
+        if i % 2 == 0:
+            msg = mavutil.mavlink.MAVLink_local_position_ned_message(
+                i, 1.0, 2.0, i * 0.01, 0.1, 0.2, 0.3
+            )
+        else:
+            msg = mavutil.mavlink.MAVLink_attitude_message(i, 0.1, 0.2, i * 0.001, 0.0, 0.0, 0.0)
+        frames.append(msg.pack(mav))
+
+        if i % HEARTBEAT_EVERY == 0:
+            frames.append(mavutil.mavlink.MAVLink_heartbeat_message(0, 0, 0, 0, 0, 3).pack(mav))
+
+    return b"".join(frames)
+
+
+def run_recv_match(path: pathlib.Path) -> int:
+    """
+    Decodes one message object at a time.
+    """
+    connection = mavutil.mavlink_connection(str(path), notimestamps=True)
+    count = 0
+    while connection.recv_match(type=["LOCAL_POSITION_NED", "ATTITUDE"]) is not None:
+        count += 1
+
+    connection.close()
+    return count
+
+
+def run_bulk(buffer: bytes) -> int:
+    """
+    Decodes the whole buffer at once.
+    """
+    positions, attitudes, _ = bulk_decoder.decode(buffer)
+    return len(positions) + len(attitudes)
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    buffer = make_buffer()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = pathlib.Path(directory) / "frames.raw"
+        path.write_bytes(buffer)
+
+        start = time.perf_counter()
+        count = run_recv_match(path)
+        elapsed = time.perf_counter() - start
+        print(f"recv_match: {count} frames, {count / elapsed:.0f} frames/s")
+
+    start = time.perf_counter()
+    count = run_bulk(buffer)
+    elapsed = time.perf_counter() - start
+    print(f"Bulk decoder: {count} frames, {count / elapsed:.0f} frames/s")
+
+    if count != NUM_FRAMES:
+        return -1
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Success!")
@@ -0,0 +1,107 @@
+"""
+Compare items per second of single item and batched queue operations.
+
+To run:
+```
+python -m tests.benchmarks.benchmark_queue_batching
+```
+"""
+
+import multiprocessing as mp
+import time
+
+from utilities.workers import queue_proxy_wrapper
+
+
+NUM_ITEMS = 20000
+QUEUE_MAX_SIZE = 64
+BATCH_SIZE = 32
+# Similar size to a telemetry frame
+PAYLOAD = tuple(float(i) for i in range(13))
+
+
+def single_producer(output_queue: queue_proxy_wrapper.QueueProxyWrapper, count: int) -> None:
+    """
+    Puts one item per queue operation followed by the sentinel.
+    """
+    for _ in range(count):
+        output_queue.queue.put(PAYLOAD)
+
+    output_queue.queue.put(None)
+
+
+def batch_producer(output_queue: queue_proxy_wrapper.QueueProxyWrapper, count: int) -> None:
+    """
+    Puts BATCH_SIZE items per queue operation followed by the sentinel.
+    """
+    for _ in range(count // BATCH_SIZE):
+        output_queue.put_many([PAYLOAD] * BATCH_SIZE)
+
+    output_queue.put_many([PAYLOAD] * (count % BATCH_SIZE) + [None])
+
+
+def consume_single(input_queue: queue_proxy_wrapper.QueueProxyWrapper) -> int:
+    """
+    Gets one item per queue operation until the sentinel.
+    """
+    count = 0
+    while input_queue.queue.get() is not None:
+        count += 1
+
+    return count
+
+
+def consume_batch(input_queue: queue_proxy_wrapper.QueueProxyWrapper) -> int:
+    """
+    Gets up to the batch size per call until the sentinel.
+    """
+    count = 0
+    while True:
+        for item in input_queue.get_many():
+            if item is None:
+                return count
+
+            count += 1
+
+
+def run_benchmark(
+    name: str,
+    mp_manager: mp.Manager,  # type: ignore
+    producer: "(...) -> None",  # type: ignore
+    consumer: "(...) -> int",  # type: ignore
+) -> None:
+    """
+    Consumes from a producer process and prints the results.
+    """
+    input_queue = queue_proxy_wrapper.QueueProxyWrapper(
+        mp_manager, QUEUE_MAX_SIZE, batch_size=BATCH_SIZE
+    )
+    process = mp.Process(target=producer, args=(input_queue, NUM_ITEMS))
+
+    start = time.perf_counter()
+    process.start()
+    count = consumer(input_queue)
+    elapsed = time.perf_counter() - start
+    process.join()
+
+    print(f"{name}: {count / elapsed:.0f} items/s")
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    mp_manager = mp.Manager()
+    run_benchmark("Single put, single get", mp_manager, single_producer, consume_single)
+    run_benchmark("Single put, get_many", mp_manager, single_producer, consume_batch)
+    run_benchmark("put_many, get_many", mp_manager, batch_producer, consume_batch)
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Success!")
@@ -0,0 +1,97 @@
+"""
+Compare throughput and latency of the manager queue and the shared memory queue.
+
+To run:
+```
+python -m tests.benchmarks.benchmark_queue_transport
+```
+"""
+
+import multiprocessing as mp
+import statistics
+import time
+
+from utilities.workers import queue_proxy_wrapper
+from utilities.workers import shared_memory_queue
+
+
+NUM_ITEMS = 20000
+# Time between items when paced, so latency is the wakeup rather than time spent queued
+PACED_INTERVAL = 0.0005  # seconds
+QUEUE_MAX_SIZE = 64
+# Similar size to a telemetry frame
+PAYLOAD = tuple(float(i) for i in range(13))
+
+
+def producer(
+    output_queue: queue_proxy_wrapper.QueueProxyWrapper, count: int, interval: float
+) -> None:
+    """
+    Puts timestamped payloads followed by the sentinel.
+
+    interval: Time in seconds between items, 0 to put as fast as possible.
+    """
+    for _ in range(count):
+        output_queue.queue.put((time.perf_counter_ns(), PAYLOAD))
+        if interval > 0.0:
+            time.sleep(interval)
+
+    output_queue.queue.put(None)
+
+
+def run_benchmark(
+    name: str, input_queue: queue_proxy_wrapper.QueueProxyWrapper, count: int, interval: float
+) -> None:
+    """
+    Consumes from a producer process and prints the results.
+    """
+    process = mp.Process(target=producer, args=(input_queue, count, interval))
+
+    latencies = []
+    start = time.perf_counter()
+    process.start()
+    while True:
+        item = input_queue.queue.get()
+        if item is None:
+            break
+
+        sent_ns, _ = item
+        latencies.append(time.perf_counter_ns() - sent_ns)
+
+    elapsed = time.perf_counter() - start
+    process.join()
+
+    latencies.sort()
+    print(
+        f"{name}: {len(latencies) / elapsed:.0f} items/s, "
+        f"latency median {statistics.median(latencies) / 1000:.1f} us, "
+        f"p99 {latencies[int(len(latencies) * 0.99)] / 1000:.1f} us"
+    )
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    mp_manager = mp.Manager()
+    for interval in (0.0, PACED_INTERVAL):
+        # Paced runs take longer per item
+        count = NUM_ITEMS if interval == 0.0 else NUM_ITEMS // 10
+        mode = "saturated" if interval == 0.0 else f"paced {interval * 1e6:.0f} us"
+
+        manager_queue = queue_proxy_wrapper.QueueProxyWrapper(mp_manager, QUEUE_MAX_SIZE)
+        run_benchmark(f"Manager queue, {mode}", manager_queue, count, interval)
+
+        shared_queue = shared_memory_queue.SharedMemoryQueueWrapper(mp_manager, QUEUE_MAX_SIZE)
+        run_benchmark(f"Shared memory queue, {mode}", shared_queue, count, interval)
+        shared_queue.unlink()
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Success!")
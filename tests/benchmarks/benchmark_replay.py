@@ -0,0 +1,112 @@
+"""
+Maximum sustainable telemetry frame rate of Telemetry and Command, replaying a recording
+as fast as possible.
+
+To run with a synthetic recording or a recording from the flight recorder:
+```
+python -m tests.benchmarks.benchmark_replay
+python -m tests.benchmarks.benchmark_replay logs/recordings/flight_20250101_000000
+```
+"""
+
+import pathlib
+import sys
+import tempfile
+import time
+
+from pymavlink import mavutil
+
+from modules.command import command
+from modules.common.modules.logger import logger
+from modules.flight_recorder import flight_recorder
+from modules.flight_recorder import replay_connection
+from modules.telemetry import telemetry
+
+
+NUM_FRAMES = 2000
+TARGET_POSITION = command.Position(10.0, 20.0, 30.0)
+# 0 for as fast as possible
+REPLAY_SPEED = 0.0
+
+
+def write_recording(path: pathlib.Path) -> None:
+    """
+    Records NUM_FRAMES pairs of position and attitude.
+    """
+    mav = mavutil.mavlink.MAVLink(None)
+    _, recorder = flight_recorder.FlightRecorder.create(path)
+    assert recorder is not None
+    for i in range(NUM_FRAMES):
+        position = mavutil.mavlink.MAVLink_local_position_ned_message(
+            i, 0.0, 0.0, i * 0.01, 0.0, 0.0, 0.1
+        )
+        attitude = mavutil.mavlink.MAVLink_attitude_message(i, 0.0, 0.0, i * 0.001, 0.0, 0.0, 0.0)
+        recorder.record(flight_recorder.DIRECTION_INBOUND, position.get_msgId(), position.pack(mav))
+        recorder.record(flight_recorder.DIRECTION_INBOUND, attitude.get_msgId(), attitude.pack(mav))
+
+    recorder.close()
+
+
+def run_benchmark(path: pathlib.Path, local_logger: logger.Logger) -> int:
+    """
+    Replays the recording into Telemetry and Command and prints the results.
+    """
+    result, connection = replay_connection.ReplayConnection.create(path, REPLAY_SPEED)
+    if not result:
+        print(f"Failed to open recording {path}")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert connection is not None
+
+    _, telemetry_instance = telemetry.Telemetry.create(connection, local_logger)
+    _, command_instance = command.Command.create(connection, TARGET_POSITION, local_logger)
+
+    frames = 0
+    start = time.perf_counter()
+    while not connection.is_finished():
+        data = telemetry_instance.run_telemetry()
+        if data is None:
+            continue
+
+        command_instance.run_cmd(data)
+        frames += 1
+
+    elapsed = time.perf_counter() - start
+    connection.close()
+
+    print(
+        f"Messages: {connection.received_count}, frames: {frames}, "
+        f"dropped: {telemetry_instance.dropped_count}, commands: {connection.sent_count}"
+    )
+    print(f"Telemetry and Command: {frames / elapsed:.0f} frames/s")
+    return 0
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    result, local_logger = logger.Logger.create("benchmark_replay", False)
+    if not result:
+        print("Failed to create logger")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert local_logger is not None
+
+    if len(sys.argv) > 1:
+        return run_benchmark(pathlib.Path(sys.argv[1]), local_logger)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = pathlib.Path(directory) / "flight"
+        write_recording(path)
+        return run_benchmark(path, local_logger)
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Success!")
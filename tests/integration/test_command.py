@@ -75,10 +75,9 @@ def read_queue(
     """
     Read and print the output queue.
     """
-    while not controller.is_exit_requested():
+    for data in output_queue.consume(controller):
         controller.check_pause()
-        if not output_queue.queue.empty():
-            main_logger.info(output_queue.queue.get())
+        main_logger.info(data)
 
 
 def put_queue(path: List[object], input_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
@@ -86,7 +85,7 @@ def put_queue(path: List[object], input_queue: queue_proxy_wrapper.QueueProxyWra
     Place mocked inputs into the input queue periodically with period TELEMETRY_PERIOD.
     """
     for point in path:
-        input_queue.queue.put(point)
+        input_queue.put(point)
         time.sleep(TELEMETRY_PERIOD)
 
 
@@ -237,7 +236,7 @@ def main() -> int:
     # Read the main queue (worker outputs)
     threading.Thread(target=read_queue, args=(main_logger, controller, output_queue)).start()
 
-    command_worker.command_worker(connection, TARGET, input_queue, output_queue, controller)
+    command_worker.command_worker(connection, TARGET, None, input_queue, output_queue, controller)
     # =============================================================================================
     #                          ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
     # =============================================================================================
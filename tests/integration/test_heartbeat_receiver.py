@@ -68,9 +68,10 @@ def read_queue(
     Read from output queue and print it using logger
     """
     while not output_queue.queue.empty():
-        status = output_queue.queue.get()
-        if status is not None:
-            main_logger.info("STATUS: " + status)
+        report = output_queue.queue.get()
+        if report is not None:
+            status, checked_time = report
+            main_logger.info(f"STATUS: {status} at {checked_time}")
 
 
 # =================================================================================================
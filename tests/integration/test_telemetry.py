@@ -64,11 +64,9 @@ def read_queue(
     """
     Read and print the output queue.
     """
-    while not controller.is_exit_requested():
+    for data in output_queue.consume(controller):
         controller.check_pause()
-        if not output_queue.queue.empty():
-            data = output_queue.queue.get()
-            main_logger.info(f"Telemetry data: {data}")
+        main_logger.info(f"Telemetry data: {data}")
 
 
 # =================================================================================================
@@ -130,7 +128,7 @@ def main() -> int:
     # Read the main queue (worker outputs)
     threading.Thread(target=read_queue, args=(output_queue, main_logger, controller)).start()
 
-    telemetry_worker.telemetry_worker(connection, output_queue, controller)
+    telemetry_worker.telemetry_worker(connection, False, output_queue, controller)
     return 0
 
 
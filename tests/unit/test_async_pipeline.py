@@ -0,0 +1,148 @@
+"""
+Test the asyncio pipeline.
+"""
+
+import asyncio
+import time
+
+import pytest
+from pymavlink import mavutil
+
+from modules.async_pipeline import async_pipeline
+from modules.command import command
+from modules.common.modules.logger import logger
+
+
+PIPELINE_ADDRESS = "127.0.0.1:14597"
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+@pytest.fixture()
+def drone() -> mavutil.mavfile:  # type: ignore
+    """
+    Sends to and receives from the pipeline over loopback.
+    """
+    connection = mavutil.mavlink_connection(f"udpout:{PIPELINE_ADDRESS}")
+    yield connection  # type: ignore
+    connection.close()
+
+
+@pytest.fixture()
+def ground() -> mavutil.mavfile:  # type: ignore
+    """
+    Connection used by the pipeline.
+    """
+    connection = mavutil.mavlink_connection(f"udpin:{PIPELINE_ADDRESS}")
+    yield connection  # type: ignore
+    connection.close()
+
+
+class TestBufferedConnection:
+    """
+    Messages buffered for a component.
+    """
+
+    def test_wait_for_types(self, ground: mavutil.mavfile) -> None:
+        """
+        Waits until every type is buffered.
+        """
+
+        async def run() -> "tuple[bool, bool]":
+            connection = async_pipeline.BufferedConnection(ground)
+            connection.push(mavutil.mavlink.MAVLink_heartbeat_message(0, 0, 0, 0, 0, 3))
+            first = await connection.wait_for_types(["HEARTBEAT", "SYSTEM_TIME"], 0.01)
+            connection.push(mavutil.mavlink.MAVLink_system_time_message(0, 0))
+            second = await connection.wait_for_types(["HEARTBEAT", "SYSTEM_TIME"], 0.01)
+            return first, second
+
+        # Run
+        first, second = asyncio.run(run())
+
+        # Test
+        assert not first
+        assert second
+
+    def test_recv_match_never_blocks(self, ground: mavutil.mavfile) -> None:
+        """
+        Returns immediately even if blocking.
+        """
+        # Setup
+        connection = async_pipeline.BufferedConnection(ground)
+
+        # Run
+        msg = connection.recv_match(type="HEARTBEAT", blocking=True)
+
+        # Test
+        assert msg is None
+
+
+class TestAsyncPipeline:
+    """
+    Whole pipeline in one event loop.
+    """
+
+    def test_requires_file_descriptor(self) -> None:
+        """
+        Connections without a file descriptor cannot be waited on.
+        """
+        # Setup
+        _, local_logger = logger.Logger.create("test_async_pipeline", False)
+
+        # Run
+        result, pipeline = async_pipeline.AsyncPipeline.create(
+            object(), command.Position(0.0, 0.0, 0.0), 1.0, local_logger
+        )
+
+        # Test
+        assert not result
+        assert pipeline is None
+
+    def test_commands_and_heartbeats(self, drone: mavutil.mavfile, ground: mavutil.mavfile) -> None:
+        """
+        Telemetry results in a command, and heartbeats are sent.
+        """
+        # Setup
+        _, local_logger = logger.Logger.create("test_async_pipeline", False)
+        result, pipeline = async_pipeline.AsyncPipeline.create(
+            ground, command.Position(0.0, 0.0, 5.0), 0.1, local_logger
+        )
+        assert result
+        assert pipeline is not None
+        drone.mav.heartbeat_send(0, 0, 0, 0, 0)
+        drone.mav.attitude_send(100, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        drone.mav.local_position_ned_send(100, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+        # Run
+        asyncio.run(pipeline.run(0.5))
+        command_msg = drone.recv_match(type="COMMAND_LONG", blocking=True, timeout=1.0)
+        heartbeat_msg = drone.recv_match(type="HEARTBEAT", blocking=True, timeout=1.0)
+
+        # Test
+        assert command_msg is not None
+        assert command_msg.command == mavutil.mavlink.MAV_CMD_CONDITION_CHANGE_ALT
+        assert heartbeat_msg is not None
+
+    def test_stops_on_disconnect(self, drone: mavutil.mavfile, ground: mavutil.mavfile) -> None:
+        """
+        Losing heartbeats after connecting ends the run, using the heartbeat time.
+        """
+        # Setup
+        _, local_logger = logger.Logger.create("test_async_pipeline", False)
+        result, pipeline = async_pipeline.AsyncPipeline.create(
+            ground, command.Position(0.0, 0.0, 0.0), 0.05, local_logger
+        )
+        assert result
+        assert pipeline is not None
+        drone.mav.heartbeat_send(0, 0, 0, 0, 0)
+
+        # Run
+        start = time.monotonic()
+        asyncio.run(pipeline.run(5.0))
+        elapsed = time.monotonic() - start
+
+        # Test
+        assert elapsed < 2.0
@@ -0,0 +1,112 @@
+"""
+Test vectorized decoding of telemetry frames.
+"""
+
+import pytest
+from pymavlink import mavutil
+
+from modules.telemetry import bulk_decoder
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+@pytest.fixture()
+def mav() -> mavutil.mavlink.MAVLink:  # type: ignore
+    """
+    Packs frames.
+    """
+    yield mavutil.mavlink.MAVLink(None, srcSystem=1)  # type: ignore
+
+
+def position(time_boot_ms: int) -> mavutil.mavlink.MAVLink_message:
+    """
+    Position with every field set.
+    """
+    return mavutil.mavlink.MAVLink_local_position_ned_message(
+        time_boot_ms, 1.0, 2.0, 3.0, 0.5, 0.25, 0.125
+    )
+
+
+def attitude(time_boot_ms: int) -> mavutil.mavlink.MAVLink_message:
+    """
+    Attitude with zero trailing fields, which MAVLink 2 truncates.
+    """
+    return mavutil.mavlink.MAVLink_attitude_message(time_boot_ms, 0.5, -0.5, 1.5, 0.0, 0.0, 0.0)
+
+
+class TestDecode:
+    """
+    Scanning buffers for frames.
+    """
+
+    def test_mixed_versions(self, mav: mavutil.mavlink.MAVLink) -> None:
+        """
+        Both versions decode and other messages are skipped.
+        """
+        # Setup
+        buffer = (
+            position(1).pack(mav)
+            + mavutil.mavlink.MAVLink_heartbeat_message(0, 0, 0, 0, 0, 3).pack(mav)
+            + attitude(2).pack(mav, force_mavlink1=True)
+            + attitude(3).pack(mav)
+        )
+
+        # Run
+        positions, attitudes, consumed = bulk_decoder.decode(buffer)
+
+        # Test
+        assert consumed == len(buffer)
+        assert len(positions) == 1
+        assert positions[0]["time_since_boot"] == 1
+        assert positions[0]["z_velocity"] == 0.125
+        assert list(attitudes["time_since_boot"]) == [2, 3]
+        assert list(attitudes["yaw"]) == [1.5, 1.5]
+        assert list(attitudes["yaw_speed"]) == [0.0, 0.0]
+
+    def test_bad_crc(self, mav: mavutil.mavlink.MAVLink) -> None:
+        """
+        Frames with a wrong checksum are skipped.
+        """
+        # Setup
+        frame = bytearray(position(1).pack(mav))
+        frame[-1] ^= 0xFF
+        buffer = bytes(frame) + position(2).pack(mav)
+
+        # Run
+        positions, _, _ = bulk_decoder.decode(buffer)
+
+        # Test
+        assert list(positions["time_since_boot"]) == [2]
+
+    def test_incomplete_frame(self, mav: mavutil.mavlink.MAVLink) -> None:
+        """
+        A partial frame at the end is left for the next call.
+        """
+        # Setup
+        first = position(1).pack(mav)
+        second = position(2).pack(mav)
+        buffer = first + second[:10]
+
+        # Run
+        positions, _, consumed = bulk_decoder.decode(buffer)
+        rest, _, _ = bulk_decoder.decode(buffer[consumed:] + second[10:])
+
+        # Test
+        assert consumed == len(first)
+        assert list(positions["time_since_boot"]) == [1]
+        assert list(rest["time_since_boot"]) == [2]
+
+    def test_empty(self) -> None:
+        """
+        Nothing to decode.
+        """
+        # Run
+        positions, attitudes, consumed = bulk_decoder.decode(b"")
+
+        # Test
+        assert len(positions) == 0
+        assert len(attitudes) == 0
+        assert consumed == 0
@@ -0,0 +1,98 @@
+"""
+Test the outbound command gate.
+"""
+
+import time
+
+import pytest
+
+from modules.command import command_gate
+
+
+COMMAND_ID = 113
+TOLERANCE = 0.5
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+@pytest.fixture()
+def gate() -> command_gate.CommandGate:  # type: ignore
+    """
+    Short intervals for testing.
+    """
+    result, instance = command_gate.CommandGate.create(0.01, 0.05)
+    assert result
+    yield instance  # type: ignore
+
+
+class TestCommandGate:
+    """
+    Suppressing repeated commands.
+    """
+
+    def test_invalid_intervals(self) -> None:
+        """
+        In flight timeout must be at least the minimum interval.
+        """
+        # Run
+        result, instance = command_gate.CommandGate.create(1.0, 0.5)
+
+        # Test
+        assert not result
+        assert instance is None
+
+    def test_equivalent_in_flight(self, gate: command_gate.CommandGate) -> None:
+        """
+        Equivalent commands are suppressed until the in flight timeout.
+        """
+        # Run
+        first = gate.should_send(COMMAND_ID, (5.0,), TOLERANCE)
+        time.sleep(0.02)
+        repeated = gate.should_send(COMMAND_ID, (5.2,), TOLERANCE)
+        time.sleep(0.05)
+        expired = gate.should_send(COMMAND_ID, (5.2,), TOLERANCE)
+
+        # Test
+        assert first
+        assert not repeated
+        assert expired
+        assert gate.sent_counts[COMMAND_ID] == 2
+        assert gate.suppressed_counts[COMMAND_ID] == 1
+
+    def test_min_interval(self, gate: command_gate.CommandGate) -> None:
+        """
+        A different target waits for the minimum interval.
+        """
+        # Run
+        first = gate.should_send(COMMAND_ID, (5.0,), TOLERANCE)
+        immediate = gate.should_send(COMMAND_ID, (10.0,), TOLERANCE)
+        time.sleep(0.02)
+        later = gate.should_send(COMMAND_ID, (10.0,), TOLERANCE)
+        other = gate.should_send(COMMAND_ID + 2, (10.0,), TOLERANCE)
+
+        # Test
+        assert first
+        assert not immediate
+        assert later
+        assert other
+
+    def test_angle_wraps(self, gate: command_gate.CommandGate) -> None:
+        """
+        Angles either side of 180 degrees are equivalent.
+        """
+        # Run
+        first = gate.should_send(COMMAND_ID, (179.9,), 5.0, is_angle=True)
+        time.sleep(0.02)
+        wrapped = gate.should_send(COMMAND_ID, (-179.9,), 5.0, is_angle=True)
+        linear = gate.should_send(COMMAND_ID + 2, (179.9,), 5.0)
+        time.sleep(0.02)
+        not_wrapped = gate.should_send(COMMAND_ID + 2, (-179.9,), 5.0)
+
+        # Test
+        assert first
+        assert not wrapped
+        assert linear
+        assert not_wrapped
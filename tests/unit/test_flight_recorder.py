@@ -0,0 +1,115 @@
+"""
+Test recording and reading raw MAVLink frames.
+"""
+
+import pathlib
+import time
+
+import pytest
+from pymavlink import mavutil
+
+from modules.flight_recorder import flight_recorder
+
+
+RECORDER_ADDRESS = "127.0.0.1:14595"
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+@pytest.fixture()
+def recording_path(tmp_path: pathlib.Path) -> pathlib.Path:  # type: ignore
+    """
+    Recording in a temporary directory.
+    """
+    yield tmp_path / "flight"  # type: ignore
+
+
+def frame(mav: mavutil.mavlink.MAVLink, time_boot_ms: int) -> bytes:
+    """
+    Packed SYSTEM_TIME message.
+    """
+    return mavutil.mavlink.MAVLink_system_time_message(0, time_boot_ms).pack(mav)
+
+
+class TestFlightRecorder:
+    """
+    Writing and reading recordings.
+    """
+
+    def test_attach(self, recording_path: pathlib.Path) -> None:
+        """
+        Inbound and outbound frames on a connection are recorded.
+        """
+        # Setup
+        drone = mavutil.mavlink_connection(f"udpout:{RECORDER_ADDRESS}")
+        ground = mavutil.mavlink_connection(f"udpin:{RECORDER_ADDRESS}")
+        result, recorder = flight_recorder.FlightRecorder.create(recording_path)
+        assert result
+        assert recorder is not None
+        recorder.attach(ground)
+
+        # Run
+        drone.mav.heartbeat_send(0, 0, 0, 0, 0)
+        received = ground.recv_match(type="HEARTBEAT", blocking=True, timeout=1.0)
+        ground.mav.system_time_send(0, 0)
+        recorder.close()
+        result, reader = flight_recorder.FlightLogReader.create(recording_path)
+        drone.close()
+        ground.close()
+
+        # Test
+        assert received is not None
+        assert result
+        assert reader is not None
+        directions = [direction for _, direction, _ in reader.read()]
+        assert directions == [
+            flight_recorder.DIRECTION_INBOUND,
+            flight_recorder.DIRECTION_OUTBOUND,
+        ]
+        reader.close()
+
+    def test_time_range(self, recording_path: pathlib.Path) -> None:
+        """
+        Reading starts at the first frame in the range and decodes.
+        """
+        # Setup
+        mav = mavutil.mavlink.MAVLink(None)
+        _, recorder = flight_recorder.FlightRecorder.create(recording_path)
+        assert recorder is not None
+        for i in range(5):
+            recorder.record(flight_recorder.DIRECTION_INBOUND, 2, frame(mav, i))
+            time.sleep(0.01)
+        recorder.close()
+        _, reader = flight_recorder.FlightLogReader.create(recording_path)
+        assert reader is not None
+        start_time = reader[2][0]
+        end_time = reader[4][0]
+
+        # Run
+        frames = [bytes(data) for _, _, data in reader.read(start_time, end_time)]
+        missing = list(reader.read(msg_ids={0}))
+        reader.close()
+
+        # Test
+        assert len(frames) == 2
+        assert [mav.decode(bytearray(data)).time_boot_ms for data in frames] == [2, 3]
+        assert len(missing) == 0
+
+    def test_existing_recording(self, recording_path: pathlib.Path) -> None:
+        """
+        Recordings are never overwritten.
+        """
+        # Setup
+        _, first = flight_recorder.FlightRecorder.create(recording_path)
+        assert first is not None
+        first.close()
+
+        # Run
+        result, second = flight_recorder.FlightRecorder.create(recording_path)
+
+        # Test
+        assert not result
+        assert second is None
@@ -0,0 +1,120 @@
+"""
+Test skipping decoding of unwanted messages.
+"""
+
+import os
+
+import pytest
+from pymavlink import mavutil
+from pymavlink.dialects.v20 import all as mavlink_v2
+
+from utilities.mavlink import header_filter
+
+
+FILTER_ADDRESS = "127.0.0.1:14594"
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+@pytest.fixture()
+def drone() -> mavutil.mavfile:  # type: ignore
+    """
+    Sends over loopback.
+    """
+    connection = mavutil.mavlink_connection(f"udpout:{FILTER_ADDRESS}")
+    yield connection  # type: ignore
+    connection.close()
+
+
+@pytest.fixture()
+def ground() -> mavutil.mavfile:  # type: ignore
+    """
+    Receives over loopback.
+    """
+    connection = mavutil.mavlink_connection(f"udpin:{FILTER_ADDRESS}")
+    yield connection  # type: ignore
+    connection.close()
+
+
+@pytest.fixture()
+def restore_dialect() -> None:  # type: ignore
+    """
+    Switches back to MAVLink 1 after a connection switches every later one to MAVLink 2.
+    """
+    yield  # type: ignore
+    os.environ.pop("MAVLINK20", None)
+    mavutil.set_dialect(mavutil.current_dialect)
+
+
+class TestHeaderFilter:
+    """
+    Filtering frames by message ID.
+    """
+
+    def test_unknown_type(self) -> None:
+        """
+        Message types must exist.
+        """
+        # Run
+        result, instance = header_filter.HeaderFilter.create(["NOT_A_MESSAGE"])
+
+        # Test
+        assert not result
+        assert instance is None
+
+    def test_skips_unwanted(self, drone: mavutil.mavfile, ground: mavutil.mavfile) -> None:
+        """
+        Only wanted messages are received, including ones after skipped frames.
+        """
+        # Setup
+        result, instance = header_filter.HeaderFilter.create(["ATTITUDE"])
+        assert result
+        assert instance is not None
+        instance.attach(ground)
+        drone.mav.heartbeat_send(0, 0, 0, 0, 0)
+        drone.mav.system_time_send(0, 0)
+        drone.mav.attitude_send(0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0)
+        drone.mav.heartbeat_send(0, 0, 0, 0, 0)
+
+        # Run
+        msg = ground.recv_match(blocking=True, timeout=1.0)
+        after = ground.recv_match(blocking=True, timeout=0.1)
+
+        # Test
+        assert msg is not None
+        assert msg.get_type() == "ATTITUDE"
+        assert after is None
+        assert instance.decoded_count == 1
+        assert instance.skipped_count == 3
+
+    @pytest.mark.usefixtures("restore_dialect")
+    def test_filters_after_version_switch(
+        self, drone: mavutil.mavfile, ground: mavutil.mavfile
+    ) -> None:
+        """
+        Filtering continues after the first MAVLink 2 frame replaces the parser.
+        """
+        # Setup
+        result, instance = header_filter.HeaderFilter.create(["ATTITUDE"])
+        assert result
+        assert instance is not None
+        instance.attach(ground)
+        mav_v2 = mavlink_v2.MAVLink(drone)
+        mav_v2.heartbeat_send(0, 0, 0, 0, 0)
+        mav_v2.attitude_send(0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0)
+        mav_v2.system_time_send(0, 0)
+
+        # Run
+        msg = ground.recv_match(blocking=True, timeout=1.0)
+        after = ground.recv_match(blocking=True, timeout=0.1)
+
+        # Test
+        assert ground.WIRE_PROTOCOL_VERSION == "2.0"
+        assert msg is not None
+        assert msg.get_type() == "ATTITUDE"
+        assert after is None
+        assert instance.decoded_count == 1
+        assert instance.skipped_count == 2
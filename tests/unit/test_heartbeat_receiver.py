@@ -0,0 +1,114 @@
+"""
+Test heartbeat loss detection.
+"""
+
+import time
+
+import pytest
+from pymavlink import mavutil
+
+from modules.common.modules.logger import logger
+from modules.heartbeat import heartbeat_receiver
+
+
+RECEIVER_ADDRESS = "127.0.0.1:14596"
+LOSS_DEADLINE = 0.05  # seconds
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+@pytest.fixture()
+def drone() -> mavutil.mavfile:  # type: ignore
+    """
+    Sends heartbeats over loopback.
+    """
+    connection = mavutil.mavlink_connection(f"udpout:{RECEIVER_ADDRESS}")
+    yield connection  # type: ignore
+    connection.close()
+
+
+@pytest.fixture()
+def receiver() -> heartbeat_receiver.HeartbeatReceiver:  # type: ignore
+    """
+    Receiver with a short loss deadline.
+    """
+    connection = mavutil.mavlink_connection(f"udpin:{RECEIVER_ADDRESS}")
+    _, local_logger = logger.Logger.create("test_heartbeat_receiver", False)
+    result, instance = heartbeat_receiver.HeartbeatReceiver.create(
+        connection, local_logger, LOSS_DEADLINE
+    )
+    assert result
+    yield instance  # type: ignore
+    connection.close()
+
+
+def heartbeat(connection: mavutil.mavfile) -> None:
+    """
+    Sends a heartbeat and gives it time to arrive.
+    """
+    connection.mav.heartbeat_send(0, 0, 0, 0, 0)
+    time.sleep(0.01)
+
+
+class TestLossDetection:
+    """
+    Connection state from the last seen heartbeat.
+    """
+
+    def test_never_seen(self, receiver: heartbeat_receiver.HeartbeatReceiver) -> None:
+        """
+        Disconnected without blocking until the first heartbeat.
+        """
+        # Setup
+        start = time.monotonic()
+
+        # Run
+        state = receiver.run_hb_receiver()
+        elapsed = time.monotonic() - start
+
+        # Test
+        assert state == "DISCONNECTED"
+        assert receiver.detection_latency is None
+        assert elapsed < LOSS_DEADLINE
+
+    def test_connected_within_deadline(
+        self, drone: mavutil.mavfile, receiver: heartbeat_receiver.HeartbeatReceiver
+    ) -> None:
+        """
+        Checks between heartbeats stay connected.
+        """
+        # Setup
+        heartbeat(drone)
+
+        # Run
+        first = receiver.run_hb_receiver()
+        second = receiver.run_hb_receiver()
+
+        # Test
+        assert first == "CONNECTED"
+        assert second == "CONNECTED"
+        assert receiver.missed == 0
+
+    def test_loss_after_deadline(
+        self, drone: mavutil.mavfile, receiver: heartbeat_receiver.HeartbeatReceiver
+    ) -> None:
+        """
+        Loss is detected after the deadline and the latency is measured.
+        """
+        # Setup
+        heartbeat(drone)
+        receiver.run_hb_receiver()
+
+        # Run
+        time.sleep(LOSS_DEADLINE * 2)
+        state = receiver.run_hb_receiver()
+
+        # Test
+        assert state == "DISCONNECTED"
+        assert receiver.detection_latency is not None
+        assert receiver.detection_latency >= LOSS_DEADLINE * 2
+        # Periods of LOSS_DEADLINE / DISCONNECT_THRESHOLD
+        assert receiver.missed >= heartbeat_receiver.DISCONNECT_THRESHOLD * 2
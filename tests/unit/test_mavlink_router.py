@@ -0,0 +1,241 @@
+"""
+Test the MAVLink router and its worker side connection.
+"""
+
+import multiprocessing as mp
+
+import pytest
+from pymavlink import mavutil
+
+from modules.common.modules.logger import logger
+from modules.mavlink_router import mavlink_router
+from modules.mavlink_router import router_connection
+from utilities.workers import queue_proxy_wrapper
+
+
+ROUTER_ADDRESS = "127.0.0.1:14599"
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+@pytest.fixture(scope="module")
+def mp_manager() -> mp.Manager:  # type: ignore
+    """
+    Manager shared by all tests.
+    """
+    manager = mp.Manager()
+    yield manager  # type: ignore
+    manager.shutdown()
+
+
+@pytest.fixture()
+def drone() -> mavutil.mavfile:  # type: ignore
+    """
+    Sends to and receives from the router over loopback.
+    """
+    connection = mavutil.mavlink_connection(f"udpout:{ROUTER_ADDRESS}", source_system=1)
+    yield connection  # type: ignore
+    connection.close()
+
+
+@pytest.fixture()
+def ground() -> mavutil.mavfile:  # type: ignore
+    """
+    Connection owned by the router.
+    """
+    connection = mavutil.mavlink_connection(f"udpin:{ROUTER_ADDRESS}", source_system=255)
+    yield connection  # type: ignore
+    connection.close()
+
+
+def heartbeat(connection: "mavutil.mavfile | router_connection.RouterConnection") -> None:
+    """
+    Sends a heartbeat.
+    """
+    connection.mav.heartbeat_send(
+        mavutil.mavlink.MAV_TYPE_GCS,
+        mavutil.mavlink.MAV_AUTOPILOT_INVALID,
+        0,
+        0,
+        mavutil.mavlink.MAV_STATE_ACTIVE,
+    )
+
+
+class ResetConnection:
+    """
+    Connection the drone has closed.
+    """
+
+    def recv_match(self, **kwargs: object) -> None:
+        """
+        Fails as a reset TCP socket does.
+        """
+        raise ConnectionResetError("Connection reset by peer")
+
+
+class TestRouterConnection:
+    """
+    Worker side of the router.
+    """
+
+    def test_forwards_send(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        Send calls are queued for the router.
+        """
+        # Setup
+        outbound_queue = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
+        connection = router_connection.RouterConnection(None, outbound_queue)
+
+        # Run
+        heartbeat(connection)
+        result, call = outbound_queue.get(0.0)
+
+        # Test
+        assert result
+        assert call[0] == "heartbeat_send"
+        assert len(call[1]) == 5
+
+    def test_only_send_forwarded(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        Other attributes do not exist.
+        """
+        # Setup
+        outbound_queue = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
+        connection = router_connection.RouterConnection(None, outbound_queue)
+
+        # Run and test
+        with pytest.raises(AttributeError):
+            connection.mav.decode(b"")
+
+    def test_recv_match_type(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        Messages of other types are discarded.
+        """
+        # Setup
+        inbound_queue = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
+        outbound_queue = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
+        connection = router_connection.RouterConnection(inbound_queue, outbound_queue)
+        inbound_queue.put(mavutil.mavlink.MAVLink_system_time_message(0, 0))
+        inbound_queue.put(mavutil.mavlink.MAVLink_heartbeat_message(0, 0, 0, 0, 0, 3))
+
+        # Run
+        msg = connection.recv_match(type="HEARTBEAT")
+        empty = connection.recv_match(type="HEARTBEAT", blocking=True, timeout=0.01)
+
+        # Test
+        assert msg is not None
+        assert msg.get_type() == "HEARTBEAT"
+        assert empty is None
+
+
+class TestMavlinkRouter:
+    """
+    Routing between the connection and workers.
+    """
+
+    def test_routes_by_type(
+        self,
+        mp_manager: mp.Manager,  # type: ignore
+        drone: mavutil.mavfile,
+        ground: mavutil.mavfile,
+    ) -> None:
+        """
+        Inbound messages reach their subscribers and outbound calls reach the drone.
+        """
+        # Setup
+        heartbeat_queue = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
+        all_queue = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
+        outbound_queue = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
+        _, local_logger = logger.Logger.create("test_mavlink_router", False)
+        result, router = mavlink_router.MavlinkRouter.create(
+            ground,
+            {"HEARTBEAT": [heartbeat_queue], mavlink_router.ALL_MESSAGES: [all_queue]},
+            outbound_queue,
+            local_logger,
+        )
+        assert result
+        assert router is not None
+        worker_connection = router_connection.RouterConnection(heartbeat_queue, outbound_queue)
+
+        # Run
+        heartbeat(drone)
+        drone.mav.system_time_send(0, 0)
+        for _ in range(100):
+            router.run()
+            if router.received_count == 2:
+                break
+        received = worker_connection.recv_match(type="HEARTBEAT", blocking=True, timeout=1.0)
+        heartbeat(worker_connection)
+        router.run()
+        sent = drone.recv_match(type="HEARTBEAT", blocking=True, timeout=1.0)
+
+        # Test
+        assert received is not None
+        assert received.get_srcSystem() == 1
+        assert all_queue.queue.qsize() == 2
+        assert router.sent_count == 1
+        assert sent is not None
+        assert sent.get_srcSystem() == 255
+
+    def test_outbound_sentinel(
+        self, mp_manager: mp.Manager, ground: mavutil.mavfile  # type: ignore
+    ) -> None:
+        """
+        Calls after the sentinel are not sent.
+        """
+        # Setup
+        outbound_queue = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
+        _, local_logger = logger.Logger.create("test_mavlink_router", False)
+        _, router = mavlink_router.MavlinkRouter.create(ground, {}, outbound_queue, local_logger)
+        worker_connection = router_connection.RouterConnection(None, outbound_queue)
+        heartbeat(worker_connection)
+        outbound_queue.put(None)
+        heartbeat(worker_connection)
+
+        # Run
+        router.run()
+        router.run()
+
+        # Test
+        assert router.outbound_closed
+        assert router.sent_count == 1
+
+    def test_outbound_shut_down(
+        self, mp_manager: mp.Manager, ground: mavutil.mavfile  # type: ignore
+    ) -> None:
+        """
+        Running after the outbound queue is shut down does not fail.
+        """
+        # Setup
+        outbound_queue = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
+        _, local_logger = logger.Logger.create("test_mavlink_router", False)
+        _, router = mavlink_router.MavlinkRouter.create(ground, {}, outbound_queue, local_logger)
+        outbound_queue.shutdown(1.0)
+
+        # Run
+        router.run()
+        router.run()
+
+        # Test
+        assert router.outbound_closed
+        assert router.sent_count == 0
+
+    def test_connection_reset(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        A failed connection stops the router without raising.
+        """
+        # Setup
+        outbound_queue = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
+        _, local_logger = logger.Logger.create("test_mavlink_router", False)
+        _, router = mavlink_router.MavlinkRouter.create(
+            ResetConnection(), {}, outbound_queue, local_logger
+        )
+
+        # Run
+        result = router.run()
+
+        # Test
+        assert not result
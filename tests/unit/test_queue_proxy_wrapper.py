@@ -0,0 +1,472 @@
+"""
+Test the queue proxy wrapper.
+"""
+
+import multiprocessing as mp
+import queue
+import threading
+import time
+
+import pytest
+
+from utilities.workers import queue_proxy_wrapper
+from utilities.workers import worker_controller
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+class DepthRecordingQueue(queue.Queue):
+    """
+    Records the instrumented depth at each put.
+    """
+
+    def __init__(self, wrapper: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        super().__init__()
+        self.__wrapper = wrapper
+        self.depths = []
+
+    def put(self, item: object, block: bool = True, timeout: "float | None" = None) -> None:
+        """
+        Records the depth, then puts.
+        """
+        _, statistics = self.__wrapper.get_statistics()
+        self.depths.append(statistics.depth)
+        super().put(item, block, timeout)
+
+
+@pytest.fixture(scope="module")
+def mp_manager() -> mp.Manager:  # type: ignore
+    """
+    Manager shared by all tests.
+    """
+    manager = mp.Manager()
+    yield manager  # type: ignore
+    manager.shutdown()
+
+
+class TestBatch:
+    """
+    Batched put and get.
+    """
+
+    def test_put_many_single_entry(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        A batch takes a single queue entry.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(mp_manager, 1)
+
+        # Run
+        result = wrapper.put_many([1, 2, 3])
+
+        # Test
+        assert result
+        assert wrapper.queue.qsize() == 1
+
+    def test_get_many_mixed(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        Batches and single items come out in order.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
+        wrapper.queue.put(0)
+        wrapper.put_many([1, 2, 3])
+        wrapper.queue.put(4)
+        expected = [0, 1, 2, 3, 4]
+
+        # Run
+        actual = wrapper.get_many(10, 0.0)
+
+        # Test
+        assert actual == expected
+
+    def test_get_many_limit(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        Items beyond the limit are kept for the next call.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(mp_manager, batch_size=2)
+        wrapper.put_many([1, 2, 3])
+
+        # Run
+        first = wrapper.get_many(timeout=0.0)
+        second = wrapper.get_many(timeout=0.0)
+
+        # Test
+        assert first == [1, 2]
+        assert second == [3]
+
+    def test_get_many_timeout(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        Returns nothing if nothing arrives before the timeout.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
+
+        # Run
+        actual = wrapper.get_many(timeout=0.01)
+
+        # Test
+        assert len(actual) == 0
+
+
+class TestConsume:
+    """
+    Blocking consumption.
+    """
+
+    def test_get_from_batch(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        Single gets unpack batches.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
+        wrapper.put_many([1, 2])
+
+        # Run
+        first = wrapper.get(0.0)
+        second = wrapper.get(0.0)
+        third = wrapper.get(0.0)
+
+        # Test
+        assert first == (True, 1)
+        assert second == (True, 2)
+        assert third == (False, None)
+
+    def test_consume_until_sentinel(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        Stops at the sentinel.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
+        controller = worker_controller.WorkerController()
+        wrapper.put_many([1, 2, None, 3])
+        expected = [1, 2]
+
+        # Run
+        actual = list(wrapper.consume(controller))
+
+        # Test
+        assert actual == expected
+
+    def test_consume_until_exit(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        Stops when exit is requested.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
+        controller = worker_controller.WorkerController()
+        controller.request_exit()
+
+        # Run
+        actual = list(wrapper.consume(controller, 0.01))
+
+        # Test
+        assert len(actual) == 0
+
+
+class TestConflate:
+    """
+    Latest value only mode.
+    """
+
+    def test_put_supersedes(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        Consumer gets only the latest item.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(mp_manager, 10, conflate=True)
+
+        # Run
+        for item in range(5):
+            wrapper.put(item)
+        actual = wrapper.get_many(timeout=0.0)
+
+        # Test
+        assert actual == [4]
+        assert wrapper.get_superseded_count() == 4
+
+    def test_sentinel_not_superseded(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        The sentinel stays in the queue.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(mp_manager, conflate=True)
+        wrapper.put(None)
+
+        # Run
+        result = wrapper.put(1)
+        actual = wrapper.get(0.0)
+
+        # Test
+        assert not result
+        assert actual == (True, None)
+
+
+def get_once(input_queue: queue_proxy_wrapper.QueueProxyWrapper, output: list) -> None:
+    """
+    Consumer blocked without a timeout.
+    """
+    output.append(input_queue.get())
+
+
+def put_once(output_queue: queue_proxy_wrapper.QueueProxyWrapper, output: list) -> None:
+    """
+    Producer blocked without a timeout.
+    """
+    output.append(output_queue.put(1))
+
+
+class TestShutdown:
+    """
+    Closing queues.
+    """
+
+    def test_discards_items(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        Items and batches are counted as discarded.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
+        wrapper.put(1)
+        wrapper.put_many([2, 3])
+
+        # Run
+        result, discarded = wrapper.shutdown(1.0)
+
+        # Test
+        assert result
+        assert discarded == 3
+        assert not wrapper.put(4)
+        assert wrapper.get(0.0) == (True, None)
+
+    def test_wakes_blocked_consumer(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        A consumer waiting forever receives the sentinel.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
+        output = []
+        consumer = threading.Thread(target=get_once, args=(wrapper, output))
+        consumer.start()
+        while wrapper._QueueProxyWrapper__waiting_getters.value == 0:
+            time.sleep(0.001)
+
+        # Run
+        result, _ = wrapper.shutdown(1.0)
+        consumer.join(1.0)
+
+        # Test
+        assert result
+        assert output == [(True, None)]
+
+    def test_wakes_blocked_producer(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        A producer waiting forever on a full queue returns.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(mp_manager, 1)
+        wrapper.put(0)
+        output = []
+        producer = threading.Thread(target=put_once, args=(wrapper, output))
+        producer.start()
+        while wrapper._QueueProxyWrapper__waiting_putters.value == 0:
+            time.sleep(0.001)
+
+        # Run
+        result, discarded = wrapper.shutdown(1.0)
+        producer.join(1.0)
+
+        # Test
+        assert result
+        assert discarded == 2
+        assert output == [True]
+
+
+class TestInstrumentation:
+    """
+    Queue statistics.
+    """
+
+    def test_not_instrumented(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        No statistics by default.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
+
+        # Run
+        result, statistics = wrapper.get_statistics()
+
+        # Test
+        assert not result
+        assert statistics is None
+
+    def test_counts(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        Items in and out, depth and latency are recorded.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(mp_manager, instrument=True)
+        wrapper.put(1)
+        wrapper.put_many([2, 3])
+
+        # Run
+        first = wrapper.get(0.0)
+        result, statistics = wrapper.get_statistics()
+
+        # Test
+        assert first == (True, 1)
+        assert result
+        assert statistics is not None
+        assert statistics.items_in == 3
+        assert statistics.items_out == 1
+        assert statistics.depth == 2
+        assert statistics.peak_depth == 3
+        assert sum(statistics.latency_histogram) == 1
+        assert statistics.latency_percentile(100) > 0.0
+
+    def test_depth_before_put(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        Items are in the depth before a consumer can get them.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(mp_manager, instrument=True)
+        wrapper.queue = DepthRecordingQueue(wrapper)
+
+        # Run
+        wrapper.put(1)
+        wrapper.put_many([2, 3])
+
+        # Test
+        assert wrapper.queue.depths == [1, 3]
+
+    def test_failed_put_not_counted(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        A put which times out leaves the depth and peak depth unchanged.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(
+            mp_manager,
+            1,
+            instrument=True,
+            overflow_policy=queue_proxy_wrapper.OverflowPolicy.BLOCK_TIMEOUT,
+            put_timeout=0.01,
+        )
+        wrapper.put(0)
+
+        # Run
+        result = wrapper.put(1)
+        _, statistics = wrapper.get_statistics()
+
+        # Test
+        assert not result
+        assert statistics is not None
+        assert statistics.items_in == 1
+        assert statistics.depth == 1
+        assert statistics.peak_depth == 1
+
+    def test_shutdown_removes(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        Discarded items leave the depth.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(mp_manager, instrument=True)
+        wrapper.put_many([1, 2])
+
+        # Run
+        wrapper.shutdown(1.0)
+        _, statistics = wrapper.get_statistics()
+
+        # Test
+        assert statistics is not None
+        assert statistics.items_removed == 2
+        assert statistics.depth == 0
+
+
+class TestOverflowPolicy:
+    """
+    Behaviour when full.
+    """
+
+    def test_drop_newest(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        Queued items are kept and the new item is counted.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(
+            mp_manager, 2, overflow_policy=queue_proxy_wrapper.OverflowPolicy.DROP_NEWEST
+        )
+
+        # Run
+        results = [wrapper.put(item) for item in range(4)]
+        actual = wrapper.get_many(timeout=0.0)
+
+        # Test
+        assert results == [True, True, False, False]
+        assert actual == [0, 1]
+        assert wrapper.get_drop_counts()[queue_proxy_wrapper.OverflowPolicy.DROP_NEWEST] == 2
+
+    def test_drop_oldest(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        The newest items are kept.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(
+            mp_manager, 2, overflow_policy=queue_proxy_wrapper.OverflowPolicy.DROP_OLDEST
+        )
+
+        # Run
+        for item in range(4):
+            wrapper.put(item)
+        actual = wrapper.get_many(timeout=0.0)
+
+        # Test
+        assert actual == [2, 3]
+        assert wrapper.get_drop_counts()[queue_proxy_wrapper.OverflowPolicy.DROP_OLDEST] == 2
+
+    def test_block_timeout(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        Gives up after the put timeout.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(
+            mp_manager,
+            1,
+            overflow_policy=queue_proxy_wrapper.OverflowPolicy.BLOCK_TIMEOUT,
+            put_timeout=0.01,
+        )
+        wrapper.put(0)
+
+        # Run
+        result = wrapper.put(1)
+
+        # Test
+        assert not result
+        assert wrapper.get_drop_counts()[queue_proxy_wrapper.OverflowPolicy.BLOCK_TIMEOUT] == 1
+
+    def test_sample(self, mp_manager: mp.Manager) -> None:  # type: ignore
+        """
+        Every Nth item replaces the oldest, batches count each item.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(
+            mp_manager,
+            1,
+            overflow_policy=queue_proxy_wrapper.OverflowPolicy.SAMPLE,
+            sample_every=3,
+        )
+        wrapper.put(0)
+
+        # Run
+        for item in range(1, 4):
+            wrapper.put(item)
+        wrapper.put_many([4, 5])
+        actual = wrapper.get_many(timeout=0.0)
+
+        # Test
+        assert actual == [3]
+        assert wrapper.get_drop_counts()[queue_proxy_wrapper.OverflowPolicy.SAMPLE] == 5
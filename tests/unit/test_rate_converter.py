@@ -0,0 +1,141 @@
+"""
+Test the telemetry rate converter.
+"""
+
+import math
+
+import pytest
+
+from modules.rate_converter import rate_converter
+from modules.telemetry import telemetry
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+def run_all(converter: rate_converter.RateConverter, count: int) -> "list[telemetry.TelemetryData]":
+    """
+    Runs telemetry every 100 ms with x equal to the telemetry number.
+    """
+    outputs = []
+    for i in range(count):
+        outputs += converter.run(telemetry.TelemetryData(i * 100, float(i)))
+
+    return outputs
+
+
+class TestRateConverter:
+    """
+    Output rates and modes.
+    """
+
+    def test_negative_rate(self) -> None:
+        """
+        Rates cannot be negative.
+        """
+        # Run
+        result, instance = rate_converter.RateConverter.create(-1.0, rate_converter.RateMode.LATEST)
+
+        # Test
+        assert not result
+        assert instance is None
+
+    def test_full_rate(self) -> None:
+        """
+        Every telemetry is output unchanged.
+        """
+        # Setup
+        _, converter = rate_converter.RateConverter.create(0.0, rate_converter.RateMode.AVERAGE)
+        data = telemetry.TelemetryData(0, 1.0)
+
+        # Run
+        outputs = converter.run(data)
+
+        # Test
+        assert outputs == [data]
+
+    def test_latest(self) -> None:
+        """
+        One telemetry per period.
+        """
+        # Setup
+        _, converter = rate_converter.RateConverter.create(2.0, rate_converter.RateMode.LATEST)
+
+        # Run
+        outputs = run_all(converter, 11)
+
+        # Test
+        assert [data.x for data in outputs] == [5.0, 10.0]
+        assert converter.input_count == 11
+        assert converter.output_count == 2
+
+    def test_average(self) -> None:
+        """
+        Mean of each field over the period, at the latest time.
+        """
+        # Setup
+        _, converter = rate_converter.RateConverter.create(2.0, rate_converter.RateMode.AVERAGE)
+
+        # Run
+        outputs = run_all(converter, 11)
+
+        # Test
+        assert len(outputs) == 2
+        assert outputs[0].time_since_boot == 500
+        assert outputs[0].x == pytest.approx(2.5)
+        assert outputs[0].y is None
+        assert outputs[1].x == pytest.approx(8.0)
+
+    def test_average_angle(self) -> None:
+        """
+        Angles either side of +/- pi average to about pi, not 0 .
+        """
+        # Setup
+        _, converter = rate_converter.RateConverter.create(2.0, rate_converter.RateMode.AVERAGE)
+
+        # Run
+        outputs = []
+        for i in range(6):
+            yaw = 3.13 if i % 2 == 0 else -3.13
+            outputs += converter.run(telemetry.TelemetryData(i * 100, yaw=yaw))
+
+        # Test
+        assert len(outputs) == 1
+        assert abs(outputs[0].yaw) == pytest.approx(math.pi, abs=0.01)
+        assert outputs[0].roll is None
+
+    def test_min_max(self) -> None:
+        """
+        Minimum then maximum of each field over the period.
+        """
+        # Setup
+        _, converter = rate_converter.RateConverter.create(2.0, rate_converter.RateMode.MIN_MAX)
+
+        # Run
+        outputs = run_all(converter, 6)
+
+        # Test
+        assert len(outputs) == 2
+        assert outputs[0].x == 0.0
+        assert outputs[1].x == 5.0
+        assert outputs[1].time_since_boot == 500
+
+    def test_min_max_angle(self) -> None:
+        """
+        The range of angles either side of +/- pi is the short arc across it.
+        """
+        # Setup
+        _, converter = rate_converter.RateConverter.create(2.0, rate_converter.RateMode.MIN_MAX)
+
+        # Run
+        outputs = []
+        for i, yaw in enumerate([3.12, -3.13, 3.13, -3.12, 3.12, 3.12]):
+            outputs += converter.run(telemetry.TelemetryData(i * 100, yaw=yaw))
+
+        # Test
+        assert len(outputs) == 2
+        assert outputs[0].yaw == pytest.approx(3.12)
+        assert outputs[1].yaw == pytest.approx(-3.12)
+        assert outputs[0].roll is None
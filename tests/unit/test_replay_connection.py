@@ -0,0 +1,103 @@
+"""
+Test replaying recordings.
+"""
+
+import pathlib
+import time
+
+import pytest
+from pymavlink import mavutil
+
+from modules.flight_recorder import flight_recorder
+from modules.flight_recorder import replay_connection
+
+
+RECORD_INTERVAL = 0.1  # seconds
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+@pytest.fixture()
+def recording_path(tmp_path: pathlib.Path) -> pathlib.Path:  # type: ignore
+    """
+    Recording of two inbound heartbeats with an outbound message between.
+    """
+    path = tmp_path / "flight"
+    mav = mavutil.mavlink.MAVLink(None)
+    heartbeat = mavutil.mavlink.MAVLink_heartbeat_message(0, 0, 0, 0, 0, 3)
+    system_time = mavutil.mavlink.MAVLink_system_time_message(0, 0)
+    _, recorder = flight_recorder.FlightRecorder.create(path)
+    assert recorder is not None
+    recorder.record(flight_recorder.DIRECTION_INBOUND, 0, heartbeat.pack(mav))
+    recorder.record(flight_recorder.DIRECTION_OUTBOUND, 2, system_time.pack(mav))
+    time.sleep(RECORD_INTERVAL)
+    recorder.record(flight_recorder.DIRECTION_INBOUND, 0, heartbeat.pack(mav))
+    recorder.close()
+    yield path  # type: ignore
+
+
+class TestReplayConnection:
+    """
+    Pacing recorded messages.
+    """
+
+    def test_as_fast_as_possible(self, recording_path: pathlib.Path) -> None:
+        """
+        Every inbound message is received immediately.
+        """
+        # Setup
+        result, connection = replay_connection.ReplayConnection.create(recording_path, 0.0)
+        assert result
+        assert connection is not None
+
+        # Run
+        first = connection.recv_msg()
+        second = connection.recv_msg()
+        third = connection.recv_msg()
+
+        # Test
+        assert first is not None
+        assert first.get_type() == "HEARTBEAT"
+        assert second is not None
+        assert third is None
+        assert connection.is_finished()
+        connection.close()
+
+    def test_speed(self, recording_path: pathlib.Path) -> None:
+        """
+        Messages are due at their recorded times scaled by the speed.
+        """
+        # Setup
+        _, connection = replay_connection.ReplayConnection.create(recording_path, 2.0)
+        assert connection is not None
+        connection.recv_msg()
+        start = time.monotonic()
+
+        # Run
+        early = connection.recv_msg()
+        msg = connection.recv_match(type="HEARTBEAT", blocking=True, timeout=1.0)
+        elapsed = time.monotonic() - start
+
+        # Test
+        assert early is None
+        assert msg is not None
+        assert elapsed == pytest.approx(RECORD_INTERVAL / 2, abs=0.02)
+        connection.close()
+
+    def test_send_counted(self, recording_path: pathlib.Path) -> None:
+        """
+        Sent messages are counted.
+        """
+        # Setup
+        _, connection = replay_connection.ReplayConnection.create(recording_path)
+        assert connection is not None
+
+        # Run
+        connection.mav.heartbeat_send(0, 0, 0, 0, 0)
+
+        # Test
+        assert connection.sent_count == 1
+        connection.close()
@@ -0,0 +1,141 @@
+"""
+Test the sampled logger.
+"""
+
+import logging
+
+import pytest
+
+from utilities.logging_tools import sampled_logger
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+class RecordingLogger:
+    """
+    Keeps logged messages.
+    """
+
+    def __init__(self) -> None:
+        self.messages = []
+        self.logger = logging.getLogger("test_sampled_logger")
+        self.logger.setLevel(logging.DEBUG)
+
+    def debug(self, message: str, log_with_frame_info: bool = True) -> None:
+        """
+        Records a debug message.
+        """
+        self.messages.append(("debug", message, log_with_frame_info))
+
+    def info(self, message: str, log_with_frame_info: bool = True) -> None:
+        """
+        Records an info message.
+        """
+        self.messages.append(("info", message, log_with_frame_info))
+
+
+class Unformattable:
+    """
+    Fails if formatted.
+    """
+
+    def __format__(self, format_spec: str) -> str:
+        raise AssertionError("Formatted")
+
+
+@pytest.fixture()
+def recording_logger() -> RecordingLogger:  # type: ignore
+    """
+    Logger to check what is logged.
+    """
+    yield RecordingLogger()  # type: ignore
+
+
+class TestSampledLogger:
+    """
+    Rate limiting and lazy formatting.
+    """
+
+    def test_negative_interval(self, recording_logger: RecordingLogger) -> None:
+        """
+        The interval cannot be negative.
+        """
+        # Run
+        result, instance = sampled_logger.SampledLogger.create(recording_logger, -1.0)
+
+        # Test
+        assert not result
+        assert instance is None
+
+    def test_rate_limited_per_site(self, recording_logger: RecordingLogger) -> None:
+        """
+        Each call site logs once per interval and counts the rest.
+        """
+        # Setup
+        _, instance = sampled_logger.SampledLogger.create(recording_logger, 60.0)
+
+        # Run
+        for i in range(3):
+            instance.info("first {}", i)
+            instance.info("second {}", i)
+            instance.info("second {}", i)
+
+        # Test
+        assert recording_logger.messages == [
+            ("info", "first 0", False),
+            ("info", "second 0", False),
+            ("info", "second 0", False),
+        ]
+        assert sorted(instance.suppressed_counts.values()) == [2, 2, 2]
+
+    def test_reports_suppressed(self, recording_logger: RecordingLogger) -> None:
+        """
+        A message after suppressed ones says how many were suppressed.
+        """
+        # Setup
+        _, instance = sampled_logger.SampledLogger.create(recording_logger, 60.0)
+
+        # Run
+        for i in range(3):
+            if i == 2:
+                instance._SampledLogger__next_times.clear()
+            instance.info("value {}", i)
+
+        # Test
+        assert recording_logger.messages[-1] == ("info", "value 2 (1 suppressed)", False)
+
+    def test_lazy(self, recording_logger: RecordingLogger) -> None:
+        """
+        Arguments are not formatted when suppressed or below the level.
+        """
+        # Setup
+        _, instance = sampled_logger.SampledLogger.create(recording_logger, 60.0, logging.INFO)
+
+        # Run
+        for value in [0, Unformattable()]:
+            instance.info("value {}", value)
+        instance.debug("debug {}", Unformattable())
+
+        # Test
+        assert len(recording_logger.messages) == 1
+        assert list(instance.suppressed_counts.values()) == [1]
+
+    def test_logger_level(self, recording_logger: RecordingLogger) -> None:
+        """
+        Messages the logger would filter are dropped without counting.
+        """
+        # Setup
+        _, instance = sampled_logger.SampledLogger.create(recording_logger, 60.0, logging.DEBUG)
+        recording_logger.logger.setLevel(logging.WARNING)
+
+        # Run
+        for i in range(3):
+            instance.info("value {}", Unformattable())
+            instance.debug("debug {}", i)
+
+        # Test
+        assert len(recording_logger.messages) == 0
+        assert len(instance.suppressed_counts) == 0
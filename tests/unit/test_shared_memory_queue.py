@@ -0,0 +1,201 @@
+"""
+Test the shared memory queue.
+"""
+
+import queue
+import threading
+import time
+
+import pytest
+
+from utilities.workers import shared_memory_queue
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+@pytest.fixture()
+def shared_queue() -> shared_memory_queue.SharedMemoryQueueWrapper:  # type: ignore
+    """
+    Shared memory queue with 2 slots.
+    """
+    wrapper = shared_memory_queue.SharedMemoryQueueWrapper(None, 2, slot_size=256)
+    yield wrapper  # type: ignore
+    wrapper.unlink()
+
+
+class TestSharedMemoryQueue:
+    """
+    Ring buffer behaves like a bounded queue.
+    """
+
+    def test_put_get_in_order(
+        self, shared_queue: shared_memory_queue.SharedMemoryQueueWrapper
+    ) -> None:
+        """
+        Items come out in the order they are put.
+        """
+        # Setup
+        expected = [1, "two"]
+
+        # Run
+        for item in expected:
+            shared_queue.queue.put(item)
+        actual = [shared_queue.queue.get(), shared_queue.queue.get()]
+
+        # Test
+        assert actual == expected
+
+    def test_full(self, shared_queue: shared_memory_queue.SharedMemoryQueueWrapper) -> None:
+        """
+        Put raises when all slots are used.
+        """
+        # Setup
+        shared_queue.queue.put(1)
+        shared_queue.queue.put(2)
+
+        # Run and test
+        with pytest.raises(queue.Full):
+            shared_queue.queue.put(3, timeout=0.01)
+
+    def test_empty(self, shared_queue: shared_memory_queue.SharedMemoryQueueWrapper) -> None:
+        """
+        Get raises when there is nothing.
+        """
+        with pytest.raises(queue.Empty):
+            shared_queue.queue.get(timeout=0.01)
+
+    def test_item_too_large(
+        self, shared_queue: shared_memory_queue.SharedMemoryQueueWrapper
+    ) -> None:
+        """
+        Items must fit in a slot.
+        """
+        with pytest.raises(ValueError):
+            shared_queue.queue.put(bytes(1024))
+
+    def test_wraparound(self, shared_queue: shared_memory_queue.SharedMemoryQueueWrapper) -> None:
+        """
+        Slots are reused after being read.
+        """
+        # Setup
+        expected = list(range(10))
+
+        # Run
+        actual = []
+        for item in expected:
+            shared_queue.queue.put(item)
+            actual.append(shared_queue.queue.get())
+
+        # Test
+        assert actual == expected
+
+    def test_closed_returns_sentinel(
+        self, shared_queue: shared_memory_queue.SharedMemoryQueueWrapper
+    ) -> None:
+        """
+        Closing wakes the consumer with the sentinel.
+        """
+        # Setup
+        shared_queue.queue.put(1)
+
+        # Run
+        result, discarded = shared_queue.shutdown()
+        actual = shared_queue.queue.get()
+
+        # Test
+        assert result
+        assert discarded == 1
+        assert actual is None
+        with pytest.raises(queue.Full):
+            shared_queue.queue.put(2)
+
+    def test_put_refused_after_shutdown(self) -> None:
+        """
+        Puts fail once shut down, and discarded items leave the depth.
+        """
+        # Setup
+        instrumented = shared_memory_queue.SharedMemoryQueueWrapper(
+            None, 2, instrument=True, slot_size=256
+        )
+        instrumented.put(1)
+
+        # Run
+        instrumented.shutdown()
+        result = instrumented.put(2)
+        _, statistics = instrumented.get_statistics()
+        instrumented.unlink()
+
+        # Test
+        assert not result
+        assert statistics is not None
+        assert statistics.items_in == 1
+        assert statistics.items_removed == 1
+        assert statistics.depth == 0
+
+    def test_blocked_producer_not_counted(self) -> None:
+        """
+        A producer blocked when shut down fails, and its item is not counted as put.
+        """
+        # Setup
+        instrumented = shared_memory_queue.SharedMemoryQueueWrapper(
+            None, 2, instrument=True, slot_size=256
+        )
+        instrumented.put(1)
+        instrumented.put(2)
+        output = []
+        producer = threading.Thread(target=lambda: output.append(instrumented.put(3)))
+        producer.start()
+
+        # Run
+        time.sleep(0.01)
+        instrumented.shutdown()
+        producer.join(1.0)
+        _, statistics = instrumented.get_statistics()
+        instrumented.unlink()
+
+        # Test
+        assert output == [False]
+        assert statistics is not None
+        assert statistics.items_in == 2
+        assert statistics.depth == 0
+
+    def test_main_helpers_shut_down(
+        self, shared_queue: shared_memory_queue.SharedMemoryQueueWrapper
+    ) -> None:
+        """
+        Filling and draining from main close the ring buffer instead of using it.
+        """
+        # Setup
+        shared_queue.put(1)
+
+        # Run
+        shared_queue.fill_queue_with_sentinel()
+        shared_queue.drain_queue()
+        result, item = shared_queue.get(0.0)
+
+        # Test
+        assert shared_queue.queue.qsize() == 1
+        assert result
+        assert item is None
+
+    def test_blocked_consumer_wakes(
+        self, shared_queue: shared_memory_queue.SharedMemoryQueueWrapper
+    ) -> None:
+        """
+        A consumer blocked without a timeout wakes when an item is published.
+        """
+        # Setup
+        output = []
+        consumer = threading.Thread(target=lambda: output.append(shared_queue.queue.get()))
+        consumer.start()
+
+        # Run
+        time.sleep(0.01)
+        shared_queue.queue.put(1)
+        consumer.join(1.0)
+
+        # Test
+        assert output == [1]
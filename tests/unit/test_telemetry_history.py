@@ -0,0 +1,126 @@
+"""
+Test the columnar telemetry history.
+"""
+
+import numpy as np
+import pytest
+
+from modules.telemetry import telemetry
+from modules.telemetry import telemetry_history
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+# 4 rows, at 2 columns of 13 float64 per row
+HISTORY_MEMORY_BUDGET = 4 * 2 * 13 * 8
+
+
+@pytest.fixture()
+def history() -> telemetry_history.TelemetryHistory:  # type: ignore
+    """
+    History of 4 rows.
+    """
+    result, instance = telemetry_history.TelemetryHistory.create(HISTORY_MEMORY_BUDGET)
+    assert result
+    assert instance is not None
+    yield instance  # type: ignore
+
+
+def fill(history: telemetry_history.TelemetryHistory, count: int) -> None:
+    """
+    Appends rows every 10 ms with x equal to the row number.
+    """
+    for i in range(count):
+        assert history.append(telemetry.TelemetryData(i * 10, float(i), x_velocity=1.0))
+
+
+class TestHistory:
+    """
+    Appending and querying.
+    """
+
+    def test_budget_too_small(self) -> None:
+        """
+        The budget must fit a row.
+        """
+        # Run
+        result, instance = telemetry_history.TelemetryHistory.create(1)
+
+        # Test
+        assert not result
+        assert instance is None
+
+    def test_keeps_newest(self, history: telemetry_history.TelemetryHistory) -> None:
+        """
+        The oldest rows are evicted, across moves to the front.
+        """
+        # Run
+        fill(history, 11)
+
+        # Test
+        assert len(history) == 4
+        assert list(history.column("x")) == [7.0, 8.0, 9.0, 10.0]
+        assert history.get(-1).time_since_boot == 100
+
+    def test_find(self, history: telemetry_history.TelemetryHistory) -> None:
+        """
+        Finds the newest row at or before a time.
+        """
+        # Setup
+        fill(history, 4)
+
+        # Run
+        result, data = history.at(25)
+        before = history.find(-1)
+
+        # Test
+        assert result
+        assert data is not None
+        assert data.x == 2.0
+        assert data.y is None
+        assert before == -1
+
+    def test_window_is_view(self, history: telemetry_history.TelemetryHistory) -> None:
+        """
+        Windows share storage with the history.
+        """
+        # Setup
+        fill(history, 4)
+
+        # Run
+        window = history.window(10, 30)
+
+        # Test
+        assert list(window["x"]) == [1.0, 2.0]
+        assert np.shares_memory(window["x"], history.column("x"))
+
+    def test_rejects_older(self, history: telemetry_history.TelemetryHistory) -> None:
+        """
+        Rows stay in time order, and missing times take the latest time.
+        """
+        # Setup
+        fill(history, 2)
+
+        # Run
+        older = history.append(telemetry.TelemetryData(0))
+        missing = history.append(telemetry.TelemetryData(x=5.0))
+
+        # Test
+        assert not older
+        assert missing
+        assert history.get(-1).time_since_boot == 10
+
+    def test_lifetime_mean(self, history: telemetry_history.TelemetryHistory) -> None:
+        """
+        Means include evicted rows and ignore None.
+        """
+        # Run
+        fill(history, 10)
+
+        # Test
+        assert history.mean("x") == pytest.approx(4.5)
+        assert history.mean("x_velocity") == 1.0
+        assert history.mean("y") is None
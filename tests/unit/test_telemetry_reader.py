@@ -0,0 +1,244 @@
+"""
+Test the event driven telemetry reader.
+"""
+
+import math
+import pathlib
+import time
+
+import pytest
+from pymavlink import mavutil
+
+from modules.common.modules.logger import logger
+from modules.flight_recorder import flight_recorder
+from modules.flight_recorder import replay_connection
+from modules.telemetry import telemetry
+
+
+TELEMETRY_ADDRESS = "127.0.0.1:14598"
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+@pytest.fixture()
+def drone() -> mavutil.mavfile:  # type: ignore
+    """
+    Sends telemetry over loopback.
+    """
+    connection = mavutil.mavlink_connection(f"udpout:{TELEMETRY_ADDRESS}")
+    yield connection  # type: ignore
+    connection.close()
+
+
+@pytest.fixture()
+def reader() -> telemetry.Telemetry:  # type: ignore
+    """
+    Event driven telemetry reader.
+    """
+    connection = mavutil.mavlink_connection(f"udpin:{TELEMETRY_ADDRESS}")
+    _, local_logger = logger.Logger.create("test_telemetry_reader", False)
+    result, instance = telemetry.Telemetry.create(connection, local_logger)
+    assert result
+    yield instance  # type: ignore
+    connection.close()
+
+
+class TestEventDriven:
+    """
+    Waiting on the socket.
+    """
+
+    def test_reads_buffered(self, drone: mavutil.mavfile, reader: telemetry.Telemetry) -> None:
+        """
+        Messages already in the socket buffer are combined one pair per call.
+        """
+        # Setup
+        drone.mav.attitude_send(100, 0.1, 0.2, 0.3, 0.0, 0.0, 0.0)
+        drone.mav.local_position_ned_send(200, 1.0, 2.0, 3.0, 0.0, 0.0, 0.0)
+        drone.mav.local_position_ned_send(300, 4.0, 5.0, 6.0, 0.0, 0.0, 0.0)
+        drone.mav.attitude_send(400, 0.4, 0.5, 0.6, 0.0, 0.0, 0.0)
+
+        # Run
+        first = reader.run_telemetry()
+        second = reader.run_telemetry()
+
+        # Test
+        assert first is not None
+        assert first.time_since_boot == 200
+        assert first.x == 1.0
+        assert first.yaw == pytest.approx(0.3)
+        assert second is not None
+        assert second.time_since_boot == 400
+        assert second.x == 4.0
+        assert second.yaw == pytest.approx(0.6)
+        assert reader.dropped_count == 0
+
+    def test_counts_dropped(self, drone: mavutil.mavfile, reader: telemetry.Telemetry) -> None:
+        """
+        A message replaced before the pair is complete is counted.
+        """
+        # Setup
+        drone.mav.local_position_ned_send(100, 1.0, 2.0, 3.0, 0.0, 0.0, 0.0)
+        drone.mav.local_position_ned_send(200, 4.0, 5.0, 6.0, 0.0, 0.0, 0.0)
+        drone.mav.attitude_send(300, 0.1, 0.2, 0.3, 0.0, 0.0, 0.0)
+
+        # Run
+        data = reader.run_telemetry()
+
+        # Test
+        assert data is not None
+        assert data.x == 4.0
+        assert reader.dropped_count == 1
+
+    def test_idle_sleeps(self, reader: telemetry.Telemetry) -> None:
+        """
+        Waiting for nothing uses almost no CPU time.
+        """
+        # Setup
+        start = time.process_time()
+
+        # Run
+        data = reader.run_telemetry()
+        elapsed = time.process_time() - start
+
+        # Test
+        assert data is None
+        assert elapsed < 0.1
+
+    def test_replay_one_pair_per_call(self, tmp_path: pathlib.Path) -> None:
+        """
+        A replay as fast as possible outputs every recorded pair.
+        """
+        # Setup
+        path = tmp_path / "flight"
+        mav = mavutil.mavlink.MAVLink(None)
+        _, recorder = flight_recorder.FlightRecorder.create(path)
+        assert recorder is not None
+        for i in range(5):
+            position = mavutil.mavlink.MAVLink_local_position_ned_message(
+                i, float(i), 0.0, 0.0, 0.0, 0.0, 0.0
+            )
+            attitude = mavutil.mavlink.MAVLink_attitude_message(i, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+            recorder.record(flight_recorder.DIRECTION_INBOUND, 32, position.pack(mav))
+            recorder.record(flight_recorder.DIRECTION_INBOUND, 30, attitude.pack(mav))
+        recorder.close()
+        _, connection = replay_connection.ReplayConnection.create(path, 0.0)
+        _, local_logger = logger.Logger.create("test_telemetry_reader", False)
+        _, instance = telemetry.Telemetry.create(connection, local_logger)
+
+        # Run
+        outputs = []
+        while not connection.is_finished():
+            data = instance.run_telemetry()
+            if data is not None:
+                outputs.append(data.x)
+        connection.close()
+
+        # Test
+        assert outputs == [0.0, 1.0, 2.0, 3.0, 4.0]
+        assert instance.dropped_count == 0
+
+
+@pytest.fixture()
+def fusion_reader() -> telemetry.Telemetry:  # type: ignore
+    """
+    Telemetry reader outputting on every message.
+    """
+    connection = mavutil.mavlink_connection(f"udpin:{TELEMETRY_ADDRESS}")
+    _, local_logger = logger.Logger.create("test_telemetry_reader", False)
+    result, instance = telemetry.Telemetry.create(connection, local_logger, fusion=True)
+    assert result
+    yield instance  # type: ignore
+    connection.close()
+
+
+class TestFusion:
+    """
+    Output on every message.
+    """
+
+    def test_waits_for_both(
+        self, drone: mavutil.mavfile, fusion_reader: telemetry.Telemetry
+    ) -> None:
+        """
+        Nothing is output until both types are received.
+        """
+        # Setup
+        drone.mav.attitude_send(100, 0.1, 0.2, 0.3, 0.0, 0.0, 0.0)
+
+        # Run
+        data = fusion_reader.run_telemetry()
+
+        # Test
+        assert data is None
+
+    def test_extrapolates(self, drone: mavutil.mavfile, fusion_reader: telemetry.Telemetry) -> None:
+        """
+        Each message is output with the other extrapolated to its timestamp.
+        """
+        # Setup
+        drone.mav.local_position_ned_send(1000, 1.0, 0.0, 0.0, 2.0, 0.0, 0.0)
+        drone.mav.attitude_send(1500, 0.0, 0.0, 3.0, 0.0, 0.0, 2.0)
+        drone.mav.local_position_ned_send(1600, 5.0, 0.0, 0.0, 2.0, 0.0, 0.0)
+
+        # Run
+        first = fusion_reader.run_telemetry()
+        second = fusion_reader.run_telemetry()
+        third = fusion_reader.run_telemetry()
+
+        # Test
+        assert first is None
+        assert second is not None
+        assert second.time_since_boot == 1500
+        assert second.x == pytest.approx(2.0)
+        assert second.yaw == pytest.approx(3.0)
+        assert third is not None
+        assert third.time_since_boot == 1600
+        assert third.x == pytest.approx(5.0)
+        # Wrapped past pi
+        assert third.yaw == pytest.approx(3.2 - 2 * math.pi)
+        assert fusion_reader.position_age == 0
+        assert fusion_reader.attitude_age == 100
+
+    def test_stale_not_extrapolated(
+        self, drone: mavutil.mavfile, fusion_reader: telemetry.Telemetry
+    ) -> None:
+        """
+        A component older than the limit is not used.
+        """
+        # Setup
+        drone.mav.local_position_ned_send(0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        drone.mav.attitude_send(5000, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+        # Run
+        fusion_reader.run_telemetry()
+        data = fusion_reader.run_telemetry()
+
+        # Test
+        assert data is None
+        assert fusion_reader.position_age == 5000
+
+    def test_out_of_order(self, drone: mavutil.mavfile, fusion_reader: telemetry.Telemetry) -> None:
+        """
+        Output times never go backwards.
+        """
+        # Setup
+        drone.mav.attitude_send(1500, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        drone.mav.local_position_ned_send(1400, 1.0, 0.0, 0.0, 2.0, 0.0, 0.0)
+        drone.mav.local_position_ned_send(1300, 9.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+        # Run
+        fusion_reader.run_telemetry()
+        behind_other = fusion_reader.run_telemetry()
+        behind_own = fusion_reader.run_telemetry()
+
+        # Test
+        assert behind_other is not None
+        assert behind_other.time_since_boot == 1500
+        assert behind_other.x == pytest.approx(1.2)
+        assert fusion_reader.position_age == 100
+        assert fusion_reader.attitude_age == 0
+        assert behind_own is None
@@ -0,0 +1,84 @@
+"""
+Test the compact TelemetryData representation.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from modules.telemetry import bulk_decoder
+from modules.telemetry import telemetry
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+class TestRows:
+    """
+    Converting TelemetryData to and from NumPy rows.
+    """
+
+    def test_no_instance_dictionary(self) -> None:
+        """
+        Only the fields can be set.
+        """
+        # Setup
+        data = telemetry.TelemetryData(1)
+
+        # Run and test
+        assert not hasattr(data, "__dict__")
+        with pytest.raises(AttributeError):
+            data.altitude = 1.0  # pylint: disable=assigning-non-slot
+
+    def test_round_trip(self) -> None:
+        """
+        All fields survive, None as NaN.
+        """
+        # Setup
+        expected = telemetry.TelemetryData(1000, 1.0, 2.0, 3.0, 0.1, 0.2, 0.3, 0.5)
+
+        # Run
+        row = expected.to_row()
+        actual = telemetry.TelemetryData.from_row(row)
+
+        # Test
+        assert math.isnan(row["yaw"])
+        assert isinstance(actual.time_since_boot, int)
+        for name in telemetry.TelemetryData.FIELDS:
+            assert getattr(actual, name) == getattr(expected, name)
+
+    def test_to_array(self) -> None:
+        """
+        Fills one row per item, and rows can be written in place.
+        """
+        # Setup
+        items = [telemetry.TelemetryData(i, float(i)) for i in range(3)]
+
+        # Run
+        array = telemetry.TelemetryData.to_array(items)
+        telemetry.TelemetryData(9, 9.0).to_row(array[1])
+
+        # Test
+        assert array.dtype == telemetry.TELEMETRY_DATA_DTYPE
+        assert list(array["x"]) == [0.0, 9.0, 2.0]
+        assert np.isnan(array["y"]).all()
+
+    def test_from_bulk_decoder_row(self) -> None:
+        """
+        Fields missing from the row are None.
+        """
+        # Setup
+        positions = np.zeros(1, bulk_decoder.POSITION_DTYPE)
+        positions[0]["time_since_boot"] = 5
+        positions[0]["z"] = -10.0
+
+        # Run
+        actual = telemetry.TelemetryData.from_row(positions[0])
+
+        # Test
+        assert actual.time_since_boot == 5
+        assert actual.z == -10.0
+        assert actual.roll is None
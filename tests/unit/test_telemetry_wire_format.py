@@ -0,0 +1,132 @@
+"""
+Test the TelemetryData binary wire format.
+"""
+
+import math
+import pickle
+
+import pytest
+
+from modules.telemetry import telemetry
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+class TestWireFormat:
+    """
+    Encoding and decoding TelemetryData.
+    """
+
+    def test_round_trip(self) -> None:
+        """
+        All fields survive encoding and decoding.
+        """
+        # Setup
+        expected = telemetry.TelemetryData(1000, 1.0, 2.0, 3.0, 0.1, 0.2, 0.3, 0.5, 0.6, 0.7)
+
+        # Run
+        result, actual = telemetry.TelemetryData.from_bytes(expected.to_bytes())
+
+        # Test
+        assert result
+        assert actual is not None
+        for name in telemetry.TelemetryData.FIELDS:
+            assert getattr(actual, name) == getattr(expected, name)
+
+    def test_none_and_nan(self) -> None:
+        """
+        None and NaN are distinct after decoding.
+        """
+        # Setup
+        data = telemetry.TelemetryData(None, math.nan, None)
+
+        # Run
+        result, actual = telemetry.TelemetryData.from_bytes(data.to_bytes())
+
+        # Test
+        assert result
+        assert actual is not None
+        assert actual.time_since_boot is None
+        assert math.isnan(actual.x)
+        assert actual.y is None
+
+    def test_from_buffer_offset(self) -> None:
+        """
+        Decodes from a view into a larger buffer.
+        """
+        # Setup
+        expected = 42
+        buffer = memoryview(b"header" + telemetry.TelemetryData(expected).to_bytes())
+
+        # Run
+        result, actual = telemetry.TelemetryData.from_buffer(buffer, 6)
+
+        # Test
+        assert result
+        assert actual is not None
+        assert actual.time_since_boot == expected
+
+    def test_unsupported_version(self) -> None:
+        """
+        Other versions are rejected.
+        """
+        # Setup
+        data = bytearray(telemetry.TelemetryData(1).to_bytes())
+        data[0] = telemetry.TELEMETRY_DATA_WIRE_VERSION + 1
+
+        # Run
+        result, actual = telemetry.TelemetryData.from_bytes(bytes(data))
+
+        # Test
+        assert not result
+        assert actual is None
+
+    def test_pickle_uses_wire_format(self) -> None:
+        """
+        Queues pickle the compact encoding.
+        """
+        # Setup
+        data = telemetry.TelemetryData(7, 1.0)
+
+        # Run
+        actual = pickle.loads(pickle.dumps(data))
+
+        # Test
+        assert actual.time_since_boot == 7
+        assert actual.x == 1.0
+        assert actual.y is None
+
+    def test_time_out_of_range(self) -> None:
+        """
+        Times the wire format cannot hold are refused, but still pickle.
+        """
+        for time_since_boot in (1.5, -1, 2**32):
+            # Setup
+            data = telemetry.TelemetryData(time_since_boot, 1.0)
+
+            # Run
+            actual = pickle.loads(pickle.dumps(data))
+
+            # Test
+            with pytest.raises(ValueError):
+                data.to_bytes()
+            assert actual.time_since_boot == time_since_boot
+            assert actual.x == 1.0
+
+    def test_whole_float_time(self) -> None:
+        """
+        Whole float times are encoded as integers.
+        """
+        # Setup
+        data = telemetry.TelemetryData(2.0)
+
+        # Run
+        result, actual = telemetry.TelemetryData.from_bytes(data.to_bytes())
+
+        # Test
+        assert result
+        assert actual is not None
+        assert actual.time_since_boot == 2
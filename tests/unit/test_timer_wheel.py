@@ -0,0 +1,128 @@
+"""
+Test the timer wheel.
+"""
+
+import time
+
+import pytest
+
+from utilities.scheduling import timer_wheel
+from utilities.workers import worker_controller
+
+
+PERIOD = 0.1  # seconds
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+@pytest.fixture()
+def wheel() -> timer_wheel.TimerWheel:  # type: ignore
+    """
+    Fewer slots than ticks in a period, so tasks wrap around.
+    """
+    result, instance = timer_wheel.TimerWheel.create(0.01, 4)
+    assert result
+    yield instance  # type: ignore
+
+
+class TestTimerWheel:
+    """
+    Scheduling periodic tasks.
+    """
+
+    def test_runs_at_deadlines(self, wheel: timer_wheel.TimerWheel) -> None:
+        """
+        Tasks run once per period, and not early.
+        """
+        # Setup
+        runs = []
+        start = time.monotonic()
+        wheel.add_task("task", PERIOD, lambda: runs.append(1))
+
+        # Run
+        early = wheel.run_pending(start + PERIOD / 2)
+        first = wheel.run_pending(start + PERIOD * 1.5)
+        second = wheel.run_pending(start + PERIOD * 2.5)
+
+        # Test
+        assert early == 0
+        assert first == 1
+        assert second == 1
+        assert len(runs) == 2
+
+    def test_deadlines_do_not_drift(self, wheel: timer_wheel.TimerWheel) -> None:
+        """
+        Late runs do not delay later deadlines.
+        """
+        # Setup
+        start = time.monotonic()
+        wheel.add_task("task", PERIOD, lambda: None)
+
+        # Run
+        wheel.run_pending(start + PERIOD * 1.9)
+        deadline = wheel.next_deadline()
+
+        # Test
+        assert deadline is not None
+        assert start + PERIOD * 2 <= deadline < start + PERIOD * 2.1
+
+    def test_overrun_skips(self, wheel: timer_wheel.TimerWheel) -> None:
+        """
+        Missed deadlines are counted and skipped rather than run in a burst.
+        """
+        # Setup
+        start = time.monotonic()
+        wheel.add_task("task", PERIOD, lambda: None)
+
+        # Run
+        count = wheel.run_pending(start + PERIOD * 4.5)
+        statistics = wheel.get_statistics()["task"]
+
+        # Test
+        assert count == 1
+        assert statistics.runs == 1
+        assert statistics.overruns == 1
+        assert statistics.skipped == 3
+        assert statistics.max_jitter >= PERIOD * 3
+
+    def test_many_tasks(self, wheel: timer_wheel.TimerWheel) -> None:
+        """
+        Tasks with different periods share the wheel.
+        """
+        # Setup
+        runs = {"fast": 0, "slow": 0}
+        start = time.monotonic()
+        wheel.add_task("fast", PERIOD, lambda: runs.update(fast=runs["fast"] + 1))
+        wheel.add_task("slow", PERIOD * 3, lambda: runs.update(slow=runs["slow"] + 1))
+
+        # Run
+        for i in range(1, 7):
+            wheel.run_pending(start + PERIOD * (i + 0.5))
+
+        # Test
+        assert runs == {"fast": 6, "slow": 2}
+
+    def test_run_until_exit(self, wheel: timer_wheel.TimerWheel) -> None:
+        """
+        Runs in real time and stops on exit.
+        """
+        # Setup
+        controller = worker_controller.WorkerController()
+        runs = []
+
+        def task() -> None:
+            runs.append(time.monotonic())
+            if len(runs) == 3:
+                controller.request_exit()
+
+        wheel.add_task("task", 0.02, task, 0.0)
+
+        # Run
+        wheel.run(controller)
+
+        # Test
+        assert len(runs) == 3
+        assert runs[2] - runs[0] == pytest.approx(0.04, abs=0.015)
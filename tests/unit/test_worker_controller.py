@@ -0,0 +1,135 @@
+"""
+Test the worker controller.
+"""
+
+import multiprocessing as mp
+import time
+
+import pytest
+
+from utilities.workers import worker_controller
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+@pytest.fixture()
+def controller() -> worker_controller.WorkerController:  # type: ignore
+    """
+    New worker controller.
+    """
+    yield worker_controller.WorkerController()  # type: ignore
+
+
+def wait_then_exit(controller: worker_controller.WorkerController) -> None:
+    """
+    Worker that waits for exit for a long time.
+    """
+    if not controller.wait_for_exit(10.0):
+        raise RuntimeError("Exit was not signalled")
+
+
+class TestExit:
+    """
+    Exit requests.
+    """
+
+    def test_request_and_clear(self, controller: worker_controller.WorkerController) -> None:
+        """
+        Exit request can be cleared for reuse.
+        """
+        # Run
+        controller.request_exit()
+        requested = controller.is_exit_requested()
+        controller.clear_exit()
+        cleared = controller.is_exit_requested()
+
+        # Test
+        assert requested
+        assert not cleared
+
+    def test_wait_for_exit_timeout(self, controller: worker_controller.WorkerController) -> None:
+        """
+        Waiting returns False without a request.
+        """
+        # Run
+        actual = controller.wait_for_exit(0.01)
+
+        # Test
+        assert not actual
+
+    def test_request_wakes_worker(self, controller: worker_controller.WorkerController) -> None:
+        """
+        A worker process waiting for exit wakes immediately.
+        """
+        # Setup
+        worker = mp.Process(target=wait_then_exit, args=(controller,))
+        worker.start()
+
+        # Run
+        start = time.monotonic()
+        controller.request_exit()
+        worker.join(5.0)
+        elapsed = time.monotonic() - start
+
+        # Test
+        assert worker.exitcode == 0
+        assert elapsed < 5.0
+
+
+def check_pause_until_exit(controller: worker_controller.WorkerController) -> None:
+    """
+    Worker loop that only checks for pause.
+    """
+    while not controller.is_exit_requested():
+        controller.check_pause()
+
+
+class TestPause:
+    """
+    Pause requests.
+    """
+
+    def test_not_paused(self, controller: worker_controller.WorkerController) -> None:
+        """
+        Check returns immediately without a request.
+        """
+        # Run
+        controller.check_pause()
+
+        # Test
+        assert controller.get_parked_count() == 0
+
+    def test_pause_waits_for_workers(self, controller: worker_controller.WorkerController) -> None:
+        """
+        Pause reports when all workers are parked and resume releases them.
+        """
+        # Setup
+        workers = [mp.Process(target=check_pause_until_exit, args=(controller,)) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+
+        # Run
+        parked = controller.request_pause(len(workers), 5.0)
+        controller.request_resume()
+        controller.request_exit()
+        for worker in workers:
+            worker.join(5.0)
+
+        # Test
+        assert parked
+        assert controller.get_parked_count() == 0
+        for worker in workers:
+            assert worker.exitcode == 0
+
+    def test_pause_timeout(self, controller: worker_controller.WorkerController) -> None:
+        """
+        Pause reports failure if workers do not park in time.
+        """
+        # Run
+        parked = controller.request_pause(1, 0.01)
+
+        # Test
+        assert not parked
@@ -0,0 +1,136 @@
+"""
+Logging for hot loops, which costs almost nothing for messages that are not logged.
+"""
+
+import collections.abc
+import inspect
+import logging
+import time
+from typing import Tuple, Union
+
+from modules.common.modules.logger import logger
+
+
+class SampledLogger:
+    """
+    Wraps a logger so each call site logs at most once per interval.
+
+    Messages are a format string and its arguments, formatted only when logged.
+    Call sites are the file and line calling this wrapper. Each logged message includes the number
+    of messages from its call site suppressed since it last logged.
+    Frame info is not logged, since it would be this wrapper's.
+    """
+
+    __private_key = object()
+
+    @classmethod
+    def create(
+        cls, local_logger: logger.Logger, min_interval: float, level: int = logging.INFO
+    ) -> Tuple[bool, Union["SampledLogger", None]]:
+        """
+        Falliable create (instantiation) method to create a SampledLogger object.
+
+        local_logger: Logger which logs the messages.
+        min_interval: Time in seconds between messages from a call site, 0 to log every message.
+        level: Messages below this level (as in the logging module), or below the effective level
+            of the logger, are dropped without counting.
+        """
+        if min_interval < 0.0:
+            return False, None
+
+        return True, SampledLogger(cls.__private_key, local_logger, min_interval, level)
+
+    def __init__(
+        self, key: object, local_logger: logger.Logger, min_interval: float, level: int
+    ) -> None:
+        assert key is SampledLogger.__private_key, "Use create() method"
+
+        self.__log = local_logger
+        self.__min_interval = min_interval
+        self.__level = level
+        # Underlying logging.Logger, if any, whose effective level also filters
+        self.__logging_logger = getattr(local_logger, "logger", None)
+
+        # Call site (file, line) to monotonic time it may next log
+        self.__next_times = {}
+        # Call site to messages suppressed since it last logged
+        self.__pending_counts = {}
+        # Call site to all messages suppressed
+        self.suppressed_counts = {}
+
+    def debug(self, message_format: str, *args: object) -> None:
+        """
+        Logs at debug level unless suppressed.
+
+        message_format: `str.format()` string.
+        args: Formatted only if logged.
+        """
+        self.__log_at(logging.DEBUG, self.__log.debug, message_format, args)
+
+    def info(self, message_format: str, *args: object) -> None:
+        """
+        Logs at info level unless suppressed, see `debug()`.
+        """
+        self.__log_at(logging.INFO, self.__log.info, message_format, args)
+
+    def warning(self, message_format: str, *args: object) -> None:
+        """
+        Logs at warning level unless suppressed, see `debug()`.
+        """
+        self.__log_at(logging.WARNING, self.__log.warning, message_format, args)
+
+    def error(self, message_format: str, *args: object) -> None:
+        """
+        Logs at error level unless suppressed, see `debug()`.
+        """
+        self.__log_at(logging.ERROR, self.__log.error, message_format, args)
+
+    def __log_at(
+        self,
+        level: int,
+        log: collections.abc.Callable[[str, bool], None],
+        message_format: str,
+        args: "tuple[object, ...]",
+    ) -> None:
+        """
+        Logs unless below the level or suppressed, for the caller of the public method.
+        """
+        if level < self.__level:
+            return
+
+        if self.__logging_logger is not None and not self.__logging_logger.isEnabledFor(level):
+            return
+
+        frame = inspect.currentframe().f_back.f_back
+        call_site = (frame.f_code.co_filename, frame.f_lineno)
+        if self.__should_log(call_site):
+            log(self.__format(call_site, message_format, args), False)
+
+    def __should_log(self, call_site: "tuple[str, int]") -> bool:
+        """
+        Whether the call site may log now, counting it as suppressed if not.
+        """
+        now = time.monotonic()
+        if now < self.__next_times.get(call_site, 0.0):
+            self.__pending_counts[call_site] = self.__pending_counts.get(call_site, 0) + 1
+            self.suppressed_counts[call_site] = self.suppressed_counts.get(call_site, 0) + 1
+            return False
+
+        self.__next_times[call_site] = now + self.__min_interval
+        return True
+
+    def __format(
+        self, call_site: "tuple[str, int]", message_format: str, args: "tuple[object, ...]"
+    ) -> str:
+        """
+        Formats the message, noting messages suppressed since the call site last logged.
+        """
+        message = message_format.format(*args)
+        suppressed = self.__pending_counts.pop(call_site, 0)
+        if suppressed > 0:
+            message += f" ({suppressed} suppressed)"
+
+        return message
+
+    def __str__(self) -> str:
+        return f"suppressed: {sum(self.suppressed_counts.values())}"
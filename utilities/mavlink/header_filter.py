@@ -0,0 +1,97 @@
+"""
+Skips decoding of unwanted MAVLink messages.
+"""
+
+from typing import Tuple, Union
+
+from pymavlink import mavutil
+
+
+class HeaderFilter:
+    """
+    Reads only the message ID from the header of each frame received on a connection,
+    and only decodes frames of the wanted types.
+
+    Skipped messages never reach the connection, so they are also missing from
+    its message hooks, `messages` and packet loss statistics.
+    """
+
+    __private_key = object()
+
+    @classmethod
+    def create(cls, msg_types: "list[str]") -> Tuple[bool, Union["HeaderFilter", None]]:
+        """
+        Falliable create (instantiation) method to create a HeaderFilter object.
+
+        msg_types: Names of the message types to decode.
+        """
+        msg_ids = {
+            msg_class.msgname: msg_id for msg_id, msg_class in mavutil.mavlink.mavlink_map.items()
+        }
+        if any(msg_type not in msg_ids for msg_type in msg_types):
+            return False, None
+
+        return True, HeaderFilter(cls.__private_key, {msg_ids[msg_type] for msg_type in msg_types})
+
+    def __init__(self, key: object, msg_ids: "set[int]") -> None:
+        assert key is HeaderFilter.__private_key, "Use create() method"
+
+        self.__msg_ids = msg_ids
+        self.__skipped_last = False
+        self.decoded_count = 0
+        self.skipped_count = 0
+
+    def attach(self, connection: mavutil.mavfile) -> None:
+        """
+        Filters the frames the connection's parser receives from now on,
+        including after the connection switches to MAVLink 2 and replaces its parser.
+        """
+        self.__filter_parser(connection.mav)
+
+        auto_mavlink_version = connection.auto_mavlink_version
+
+        def filtered_auto_mavlink_version(buf: bytes) -> None:
+            mav = connection.mav
+            auto_mavlink_version(buf)
+            if connection.mav is not mav:
+                self.__filter_parser(connection.mav)
+
+        connection.auto_mavlink_version = filtered_auto_mavlink_version
+
+    def __filter_parser(self, mav: "mavutil.mavlink.MAVLink") -> None:
+        """
+        Replaces the parser's decoding with the filtered decoding.
+        """
+        decode = mav.decode
+        parse_char = mav.parse_char
+
+        def filtered_decode(msgbuf: bytearray) -> "mavutil.mavlink.MAVLink_message | None":
+            if msgbuf[0] == mavutil.mavlink.PROTOCOL_MARKER_V2:
+                msg_id = msgbuf[7] | (msgbuf[8] << 8) | (msgbuf[9] << 16)
+            else:
+                msg_id = msgbuf[5]
+
+            if msg_id not in self.__msg_ids:
+                self.skipped_count += 1
+                self.__skipped_last = True
+                return None
+
+            self.decoded_count += 1
+            return decode(msgbuf)
+
+        def filtered_parse_char(data: bytes) -> "mavutil.mavlink.MAVLink_message | None":
+            # A skipped frame looks like no message, which would leave any frames after it
+            # in the buffer until more bytes arrive
+            while True:
+                self.__skipped_last = False
+                msg = parse_char(data)
+                if msg is not None or not self.__skipped_last:
+                    return msg
+
+                data = b""
+
+        mav.decode = filtered_decode
+        mav.parse_char = filtered_parse_char
+
+    def __str__(self) -> str:
+        return f"decoded: {self.decoded_count}, skipped: {self.skipped_count}"
@@ -0,0 +1,252 @@
+"""
+Periodic tasks on a hashed timer wheel.
+"""
+
+import collections.abc
+import math
+import time
+from typing import Tuple, Union
+
+from ..workers import worker_controller
+
+
+class TaskStatistics:
+    """
+    Timing of a periodic task.
+
+    Jitter is the time from the deadline to the start of the run.
+    An overrun is a run which finished after the next deadline, and the missed deadlines are skipped.
+    """
+
+    def __init__(self) -> None:
+        self.runs = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.total_jitter = 0.0  # s
+        self.max_jitter = 0.0  # s
+
+    def record(self, jitter: float, skipped: int) -> None:
+        """
+        Records a run.
+
+        jitter: Time in seconds from the deadline to the start of the run.
+        skipped: Number of deadlines missed because of the run.
+        """
+        self.runs += 1
+        self.total_jitter += jitter
+        self.max_jitter = max(self.max_jitter, jitter)
+        if skipped > 0:
+            self.overruns += 1
+            self.skipped += skipped
+
+    def mean_jitter(self) -> float:
+        """
+        Mean jitter in seconds, 0 if never run.
+        """
+        if self.runs == 0:
+            return 0.0
+
+        return self.total_jitter / self.runs
+
+    def __str__(self) -> str:
+        return (
+            f"runs: {self.runs}, overruns: {self.overruns}, skipped: {self.skipped}, "
+            f"jitter mean: {self.mean_jitter() * 1000:.3f}ms, max: {self.max_jitter * 1000:.3f}ms"
+        )
+
+
+class _Task:
+    """
+    Periodic task and its next deadline.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        period: float,
+        callback: collections.abc.Callable[[], object],
+        deadline: float,
+    ) -> None:
+        self.name = name
+        self.period = period
+        self.callback = callback
+        # Monotonic time, advanced by the period so the schedule does not drift
+        self.deadline = deadline
+        # Wheel tick containing the deadline
+        self.tick = 0
+        self.statistics = TaskStatistics()
+
+
+class TimerWheel:
+    """
+    Runs many periodic tasks in one thread.
+
+    Each task is in the slot of the tick containing its deadline, modulo the number of slots,
+    so finding due tasks only visits the slots of elapsed ticks.
+    Deadlines are monotonic and advance by exactly one period, so periods do not stretch
+    by the time spent running tasks.
+    """
+
+    __private_key = object()
+
+    __IDLE_TIMEOUT = 1.0  # seconds
+
+    @classmethod
+    def create(cls, tick: float, slot_count: int) -> Tuple[bool, Union["TimerWheel", None]]:
+        """
+        Falliable create (instantiation) method to create a TimerWheel object.
+
+        tick: Time in seconds covered by each slot.
+        slot_count: Number of slots, periods longer than one revolution wrap around.
+        """
+        if tick <= 0.0 or slot_count <= 0:
+            return False, None
+
+        return True, TimerWheel(cls.__private_key, tick, slot_count)
+
+    def __init__(self, key: object, tick: float, slot_count: int) -> None:
+        assert key is TimerWheel.__private_key, "Use create() method"
+
+        self.__tick = tick
+        self.__slots = [[] for _ in range(slot_count)]
+        self.__origin = time.monotonic()
+        # Earliest tick which may have tasks due
+        self.__current_tick = 0
+        self.__tasks = {}
+
+    def add_task(
+        self,
+        name: str,
+        period: float,
+        callback: collections.abc.Callable[[], object],
+        first_delay: float = -1.0,
+    ) -> bool:
+        """
+        Schedules a periodic task.
+
+        name: Unique name.
+        period: Time in seconds between deadlines.
+        callback: Called at each deadline.
+        first_delay: Time in seconds until the first deadline, negative for one period.
+
+        Returns whether the task was added.
+        """
+        if name in self.__tasks or period <= 0.0:
+            return False
+
+        if first_delay < 0.0:
+            first_delay = period
+
+        task = _Task(name, period, callback, time.monotonic() + first_delay)
+        self.__tasks[name] = task
+        self.__insert(task)
+        return True
+
+    def remove_task(self, name: str) -> bool:
+        """
+        Unschedules a task.
+
+        Returns whether the task existed.
+        """
+        task = self.__tasks.pop(name, None)
+        if task is None:
+            return False
+
+        self.__slots[task.tick % len(self.__slots)].remove(task)
+        return True
+
+    def get_statistics(self) -> "dict[str, TaskStatistics]":
+        """
+        Timing of each task by name.
+        """
+        return {name: task.statistics for name, task in self.__tasks.items()}
+
+    def run_pending(self, now: "float | None" = None) -> int:
+        """
+        Runs every task whose deadline has passed.
+
+        now: Monotonic time, None for the current time.
+
+        Returns the number of tasks run.
+        """
+        if now is None:
+            now = time.monotonic()
+
+        now_tick = self.__tick_of(now)
+        # After falling more than a revolution behind every slot is visited once
+        first_tick = max(self.__current_tick, now_tick - len(self.__slots) + 1)
+
+        due = []
+        for tick in range(first_tick, now_tick + 1):
+            slot = self.__slots[tick % len(self.__slots)]
+            due += [task for task in slot if task.tick <= tick and task.deadline <= now]
+
+        for task in due:
+            self.__slots[task.tick % len(self.__slots)].remove(task)
+
+        # Tasks with later deadlines may share the current tick
+        self.__current_tick = now_tick
+
+        for task in sorted(due, key=lambda task: task.deadline):
+            deadline = task.deadline
+            start = max(time.monotonic(), now)
+            task.callback()
+            finish = max(time.monotonic(), now)
+
+            task.deadline = deadline + task.period
+            skipped = 0
+            if task.deadline <= finish:
+                skipped = math.floor((finish - task.deadline) / task.period) + 1
+                task.deadline += skipped * task.period
+
+            task.statistics.record(start - deadline, skipped)
+            # Removed by its own callback
+            if self.__tasks.get(task.name) is task:
+                self.__insert(task)
+
+        return len(due)
+
+    def next_deadline(self) -> "float | None":
+        """
+        Earliest deadline, None if there are no tasks.
+        """
+        slot_count = len(self.__slots)
+        for tick in range(self.__current_tick, self.__current_tick + slot_count):
+            deadlines = [
+                task.deadline for task in self.__slots[tick % slot_count] if task.tick <= tick
+            ]
+            if len(deadlines) > 0:
+                return min(deadlines)
+
+        # Every task is more than a revolution away
+        return min((task.deadline for task in self.__tasks.values()), default=None)
+
+    def run(self, controller: worker_controller.WorkerController) -> None:
+        """
+        Runs tasks at their deadlines until main requests exit.
+        Sleeps between deadlines, waking immediately on exit.
+        """
+        while not controller.is_exit_requested():
+            controller.check_pause()
+            self.run_pending()
+
+            deadline = self.next_deadline()
+            timeout = self.__IDLE_TIMEOUT
+            if deadline is not None:
+                timeout = deadline - time.monotonic()
+
+            if timeout > 0.0:
+                controller.wait_for_exit(timeout)
+
+    def __tick_of(self, deadline: float) -> int:
+        """
+        Tick containing the time.
+        """
+        return max(math.floor((deadline - self.__origin) / self.__tick), 0)
+
+    def __insert(self, task: _Task) -> None:
+        """
+        Puts the task in the slot of its deadline.
+        """
+        task.tick = self.__tick_of(task.deadline)
+        self.__slots[task.tick % len(self.__slots)].append(task)
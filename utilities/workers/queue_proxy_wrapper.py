@@ -2,25 +2,459 @@
 Queue.
 """
 
+import collections
+import collections.abc
+import ctypes
+import enum
+import multiprocessing as mp
 import multiprocessing.managers
 import queue
 import time
 
+from . import queue_statistics
+from . import worker_controller
 
-class QueueProxyWrapper:
+
+class OverflowPolicy(enum.Enum):
+    """
+    What `put()` does when the queue is full.
+    """
+
+    # Wait for space
+    BLOCK = 0
+    # Wait for space until the put timeout, then drop the new item
+    BLOCK_TIMEOUT = 1
+    # Drop the new item
+    DROP_NEWEST = 2
+    # Drop the oldest queued item to make space
+    DROP_OLDEST = 3
+    # Drop the new item, except every Nth which replaces the oldest queued item
+    SAMPLE = 4
+
+
+class _Batch(list):
+    """
+    Items put in a single queue entry by `put_many()`.
+    """
+
+
+class _Stamped(tuple):
+    """
+    Entry with the time it was put, (monotonic time in ns, entry), if instrumented.
+    """
+
+
+def _item_count(entry: object) -> int:
+    """
+    Number of items in an entry, where the sentinel is not an item.
+    """
+    if isinstance(entry, _Batch):
+        return sum(1 for item in entry if item is not None)
+
+    if entry is None:
+        return 0
+
+    return 1
+
+
+class QueueProxyWrapper:  # pylint: disable=too-many-instance-attributes
     """
     Wrapper for an underlying queue proxy which also stores `maxsize`.
 
     `maxsize <= 0` means infinite size.
+    A batch from `put_many()` takes a single entry of `maxsize`.
+
+    The overflow policy decides what `put()` and `put_many()` do when the queue is full,
+    and each policy counts the items it drops.
+    Conflating mode holds only the latest item, which is DROP_OLDEST with `maxsize` 1 .
+
+    Producers and consumers must use the wrapper methods rather than `queue` directly
+    for `shutdown()` to wake them and for instrumentation to record them.
     """
 
     __QUEUE_TIMEOUT = 0.1  # seconds
-    __QUEUE_DELAY = 0.1  # seconds
+    __DEFAULT_SAMPLE_EVERY = 10
+    __SHUTDOWN_TIMEOUT = 1.0  # seconds
+    __SHUTDOWN_DELAY = 0.001  # seconds
+
+    __DEFAULT_BATCH_SIZE = 32
+    __DEFAULT_BATCH_TIMEOUT = 0.01  # seconds
+    __DEFAULT_WAKE_TIMEOUT = 0.1  # seconds
+
+    def __init__(
+        self,
+        mp_manager: multiprocessing.managers.SyncManager,
+        maxsize: int = 0,
+        batch_size: int = 0,
+        batch_timeout: float = -1.0,
+        conflate: bool = False,
+        instrument: bool = False,
+        overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        put_timeout: float = 0.0,
+        sample_every: int = 0,
+    ) -> None:
+        """
+        mp_manager: Manager which owns the queue.
+        maxsize: Maximum number of entries, ignored if conflating.
+        batch_size: Default maximum number of items for `get_many()`, 0 or less for default.
+        batch_timeout: Default time in seconds `get_many()` waits, negative for default.
+        conflate: Keep only the latest item, overrides the overflow policy.
+        instrument: Record statistics, see `get_statistics()`.
+        overflow_policy: What to do when full.
+        put_timeout: Time in seconds BLOCK_TIMEOUT waits, must be greater than 0 .
+        sample_every: Every Nth item SAMPLE keeps when full, must be greater than 0 .
+        """
+        if batch_size <= 0:
+            batch_size = self.__DEFAULT_BATCH_SIZE
+
+        if batch_timeout < 0.0:
+            batch_timeout = self.__DEFAULT_BATCH_TIMEOUT
 
-    def __init__(self, mp_manager: multiprocessing.managers.SyncManager, maxsize: int = 0) -> None:
-        self.queue = mp_manager.Queue(maxsize)
+        if conflate:
+            maxsize = 1
+            overflow_policy = OverflowPolicy.DROP_OLDEST
+
+        if put_timeout <= 0.0:
+            put_timeout = self.__QUEUE_TIMEOUT
+
+        if sample_every <= 0:
+            sample_every = self.__DEFAULT_SAMPLE_EVERY
+
+        self.queue = self._create_queue(mp_manager, maxsize)
         self.maxsize = maxsize
 
+        self.__overflow_policy = overflow_policy
+        self.__put_timeout = put_timeout
+        self.__sample_every = sample_every
+        # Puts by this process while full under SAMPLE
+        self.__sample_count = 0
+        # Indexed by policy value
+        self.__drop_counts = mp.Array("Q", len(OverflowPolicy))
+
+        # Flag is read without locking, counts are of producers and consumers in a blocking call
+        self.__closed = mp.RawValue(ctypes.c_bool, False)
+        self.__waiting_putters = mp.Value("i", 0)
+        self.__waiting_getters = mp.Value("i", 0)
+
+        self.__instrumentation = queue_statistics.QueueInstrumentation() if instrument else None
+
+        self.__batch_size = batch_size
+        self.__batch_timeout = batch_timeout
+        # Items from a batch already taken off the queue by this process
+        self.__pending = collections.deque()
+
+    def _create_queue(
+        self, mp_manager: multiprocessing.managers.SyncManager, maxsize: int
+    ) -> "queue.Queue":
+        """
+        Creates the underlying queue.
+        """
+        return mp_manager.Queue(maxsize)
+
+    def put(self, item: object, timeout: "float | None" = None) -> bool:
+        """
+        Puts an item, following the overflow policy if full.
+
+        timeout: Time waiting in seconds before giving up, None for the policy default.
+            Only used by BLOCK and BLOCK_TIMEOUT, where the default is forever and the put timeout.
+
+        Returns whether the item was put.
+        """
+        return self.__put_with_policy(item, timeout)
+
+    def get_drop_counts(self) -> "dict[OverflowPolicy, int]":
+        """
+        Number of items dropped by each overflow policy.
+        """
+        with self.__drop_counts.get_lock():
+            counts = self.__drop_counts.get_obj()[:]
+
+        return {policy: counts[policy.value] for policy in OverflowPolicy}
+
+    def get_superseded_count(self) -> int:
+        """
+        Number of items replaced before the consumer got them in conflating mode.
+        """
+        return self.get_drop_counts()[OverflowPolicy.DROP_OLDEST]
+
+    def __record_drop(self, policy: OverflowPolicy, entry: object) -> None:
+        """
+        Counts the items in a dropped entry against the policy.
+        """
+        with self.__drop_counts.get_lock():
+            self.__drop_counts.get_obj()[policy.value] += _item_count(entry)
+
+    def __put_with_policy(self, entry: object, timeout: "float | None") -> bool:
+        """
+        Puts a queue entry following the overflow policy.
+
+        Returns whether the entry was put.
+        """
+        if self.__closed.value:
+            return False
+
+        policy = self.__overflow_policy
+        if policy == OverflowPolicy.BLOCK:
+            return self.__put_entry(entry, timeout)
+
+        if policy == OverflowPolicy.BLOCK_TIMEOUT:
+            if self.__put_entry(entry, self.__put_timeout if timeout is None else timeout):
+                return True
+
+            if not self.__closed.value:
+                self.__record_drop(policy, entry)
+
+            return False
+
+        if self.__put_entry(entry, 0.0):
+            return True
+
+        if self.__closed.value:
+            return False
+
+        if policy == OverflowPolicy.DROP_NEWEST:
+            self.__record_drop(policy, entry)
+            return False
+
+        if policy == OverflowPolicy.SAMPLE:
+            self.__sample_count += 1
+            if self.__sample_count % self.__sample_every != 0:
+                self.__record_drop(policy, entry)
+                return False
+
+        return self.__replace_oldest(entry, policy)
+
+    def __replace_oldest(self, entry: object, policy: OverflowPolicy) -> bool:
+        """
+        Drops the oldest queued entries until the entry fits.
+
+        Returns whether the entry was put.
+        """
+        while True:
+            try:
+                _, oldest = self.__unstamp(self.queue.get_nowait())
+            except queue.Empty:
+                # Consumer made space first
+                pass
+            else:
+                if oldest is None:
+                    # Never drop the sentinel
+                    self.queue.put_nowait(self.__stamp(oldest))
+                    self.__record_drop(policy, entry)
+                    return False
+
+                self.__record_drop(policy, oldest)
+                if self.__instrumentation is not None:
+                    self.__instrumentation.record_remove(_item_count(oldest))
+
+            if self.__put_entry(entry, 0.0):
+                return True
+
+            if self.__closed.value:
+                return False
+
+    def get_statistics(self) -> "tuple[bool, queue_statistics.QueueStatistics | None]":
+        """
+        Snapshot of the statistics, safe to call periodically from any process.
+
+        Returns whether the queue is instrumented and the statistics.
+        """
+        if self.__instrumentation is None:
+            return False, None
+
+        return True, self.__instrumentation.snapshot()
+
+    def __stamp(self, entry: object) -> object:
+        """
+        Adds the put time to the entry if instrumented.
+        """
+        if self.__instrumentation is None:
+            return entry
+
+        return _Stamped((time.monotonic_ns(), entry))
+
+    @staticmethod
+    def __unstamp(entry: object) -> "tuple[int, object]":
+        """
+        Removes the put time from the entry.
+
+        Returns the put time, -1 if not stamped, and the entry.
+        """
+        if isinstance(entry, _Stamped):
+            return entry[0], entry[1]
+
+        return -1, entry
+
+    def __put_entry(self, entry: object, timeout: "float | None") -> bool:
+        """
+        Puts a queue entry, counted as a waiting producer while blocked.
+
+        Returns whether the entry was put.
+        """
+        # Count before checking closed, so shutdown either sees this producer or it sees closed
+        with self.__waiting_putters.get_lock():
+            self.__waiting_putters.value += 1
+
+        count = _item_count(entry)
+        is_put = False
+        try:
+            if self.__closed.value:
+                return False
+
+            # Before putting, so a fast consumer cannot take the depth below 0
+            if self.__instrumentation is not None:
+                self.__instrumentation.reserve_put(count)
+
+            start = time.perf_counter_ns()
+            self.queue.put(self.__stamp(entry), timeout=timeout)
+            blocked_ns = time.perf_counter_ns() - start
+            is_put = True
+        except queue.Full:
+            return False
+        finally:
+            with self.__waiting_putters.get_lock():
+                self.__waiting_putters.value -= 1
+
+            if not is_put and self.__instrumentation is not None:
+                self.__instrumentation.cancel_put(count)
+
+        if self.__instrumentation is not None:
+            self.__instrumentation.record_put(count, blocked_ns)
+
+        return True
+
+    def __get_entry(self, timeout: "float | None") -> "tuple[bool, object]":
+        """
+        Gets a queue entry, counted as a waiting consumer while blocked.
+        Returns the sentinel (None) if shut down.
+
+        timeout: Time waiting in seconds, 0 or less does not wait, None waits forever.
+
+        Returns whether an entry was received and the entry.
+        """
+        # Count before checking closed, so shutdown either sees this consumer or it sees closed
+        with self.__waiting_getters.get_lock():
+            self.__waiting_getters.value += 1
+
+        try:
+            if self.__closed.value:
+                return True, None
+
+            start = time.perf_counter_ns()
+            if timeout is not None and timeout <= 0.0:
+                entry = self.queue.get_nowait()
+            else:
+                entry = self.queue.get(timeout=timeout)
+            blocked_ns = time.perf_counter_ns() - start
+        except queue.Empty:
+            return False, None
+        finally:
+            with self.__waiting_getters.get_lock():
+                self.__waiting_getters.value -= 1
+
+        put_ns, entry = self.__unstamp(entry)
+        if self.__instrumentation is not None:
+            latency_ns = time.monotonic_ns() - put_ns if put_ns >= 0 else -1
+            self.__instrumentation.record_get(_item_count(entry), blocked_ns, latency_ns)
+
+        return True, entry
+
+    def put_many(self, items: "list[object]", timeout: "float | None" = None) -> bool:
+        """
+        Puts all items with a single queue operation, following the overflow policy if full.
+        Consumers must use `get_many()` or `get()` to receive them.
+
+        timeout: Time waiting in seconds before giving up, None for the policy default.
+
+        Returns whether the items were put.
+        """
+        if len(items) == 0:
+            return True
+
+        return self.__put_with_policy(_Batch(items), timeout)
+
+    def get_many(self, max_items: int = 0, timeout: float = -1.0) -> "list[object]":
+        """
+        Gets up to `max_items` items, waiting until the timeout for more to arrive.
+        Items from `put_many()` and single puts are both returned in order.
+
+        max_items: Maximum number of items, the batch size of the queue if 0 or less.
+        timeout: Time waiting in seconds, the batch timeout of the queue if negative.
+
+        Returns the items, which may be empty.
+        """
+        if max_items <= 0:
+            max_items = self.__batch_size
+
+        if timeout < 0.0:
+            timeout = self.__batch_timeout
+
+        deadline = time.monotonic() + timeout
+        items = []
+        while len(items) < max_items:
+            if len(self.__pending) > 0:
+                items.append(self.__pending.popleft())
+                continue
+
+            result, item = self.__get_entry(deadline - time.monotonic())
+            if not result:
+                break
+
+            if isinstance(item, _Batch):
+                self.__pending.extend(item)
+                continue
+
+            items.append(item)
+            # Nothing more after shutdown
+            if item is None and self.__closed.value:
+                break
+
+        return items
+
+    def get(self, timeout: "float | None" = None) -> "tuple[bool, object]":
+        """
+        Gets a single item, including items from `put_many()`.
+        Blocks in the queue until an item arrives.
+
+        timeout: Time waiting in seconds before giving up, None waits forever.
+
+        Returns whether an item was received and the item.
+        """
+        while len(self.__pending) == 0:
+            result, item = self.__get_entry(timeout)
+            if not result:
+                return False, None
+
+            if not isinstance(item, _Batch):
+                return True, item
+
+            self.__pending.extend(item)
+
+        return True, self.__pending.popleft()
+
+    def consume(
+        self, controller: worker_controller.WorkerController, wake_timeout: float = 0.0
+    ) -> "collections.abc.Iterator[object]":
+        """
+        Yields items until main requests exit or the sentinel (None) is received.
+        Blocks in the queue while there is nothing, instead of polling `empty()`.
+
+        controller: Worker controller checked for exit.
+        wake_timeout: Maximum time in seconds between exit checks, must be greater than 0 .
+        """
+        if wake_timeout <= 0.0:
+            wake_timeout = self.__DEFAULT_WAKE_TIMEOUT
+
+        while not controller.is_exit_requested():
+            result, item = self.get(wake_timeout)
+            if not result:
+                continue
+
+            if item is None:
+                return
+
+            yield item
+
     def fill_queue_with_sentinel(self, timeout: float = 0.0) -> None:
         """
         Fills the queue with sentinel (None).
@@ -51,10 +485,89 @@ class QueueProxyWrapper:
         except queue.Empty:
             return
 
+    def shutdown(self, timeout: float = 0.0) -> "tuple[bool, int]":
+        """
+        Closes the queue, discarding its items.
+        Producers blocked in `put()` are unblocked and their items discarded.
+        Consumers blocked in `get()` receive the sentinel (None) exactly once.
+        Afterwards, puts are discarded and gets return the sentinel.
+        Works for any `maxsize`, and queues can be shut down in any order.
+
+        timeout: Time in seconds to finish before giving up, must be greater than 0 .
+
+        Returns whether shutdown finished before the timeout and the number of items discarded.
+        """
+        if timeout <= 0.0:
+            timeout = self.__SHUTDOWN_TIMEOUT
+
+        deadline = time.monotonic() + timeout
+        self.__closed.value = True
+
+        discarded = 0
+        while True:
+            # Producers counted here may still put, producers after see closed
+            is_producer_waiting = self.__waiting_putters.value > 0
+
+            # Draining frees space for waiting producers
+            result, count = self.__discard_entries(deadline)
+            discarded += count
+            if not result:
+                return False, discarded
+
+            if not is_producer_waiting:
+                break
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0.0:
+                return False, discarded
+
+            time.sleep(min(self.__SHUTDOWN_DELAY, remaining))
+
+        for _ in range(self.__waiting_getters.value):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0.0:
+                return False, discarded
+
+            try:
+                self.queue.put(None, timeout=remaining)
+            except queue.Full:
+                return False, discarded
+
+        return True, discarded
+
+    def _mark_closed(self, discarded: int) -> None:
+        """
+        Closes the queue for subclasses which shut down without draining,
+        so puts are refused and the discarded items leave the depth.
+
+        discarded: Number of items left in the queue.
+        """
+        self.__closed.value = True
+        if self.__instrumentation is not None:
+            self.__instrumentation.record_remove(discarded)
+
+    def __discard_entries(self, deadline: float) -> "tuple[bool, int]":
+        """
+        Removes all entries until empty or the deadline.
+
+        Returns whether the queue was emptied and the number of items discarded.
+        """
+        discarded = 0
+        while time.monotonic() < deadline:
+            try:
+                _, entry = self.__unstamp(self.queue.get_nowait())
+            except queue.Empty:
+                return True, discarded
+
+            count = _item_count(entry)
+            discarded += count
+            if self.__instrumentation is not None:
+                self.__instrumentation.record_remove(count)
+
+        return False, discarded
+
     def fill_and_drain_queue(self) -> None:
         """
-        Fill with sentinel and then drain.
+        Deprecated, use `shutdown()`.
         """
-        self.fill_queue_with_sentinel()
-        time.sleep(self.__QUEUE_DELAY)
-        self.drain_queue()
+        self.shutdown()
@@ -0,0 +1,175 @@
+"""
+Queue instrumentation.
+"""
+
+import multiprocessing as mp
+
+
+class QueueStatistics:  # pylint: disable=too-many-instance-attributes
+    """
+    Snapshot of queue statistics.
+
+    Latency bucket i counts items with enqueue to dequeue latency in [2^i, 2^(i+1)) microseconds,
+    and the last bucket also counts everything longer.
+    """
+
+    def __init__(
+        self,
+        items_in: int,
+        items_out: int,
+        items_removed: int,
+        depth: int,
+        peak_depth: int,
+        put_blocked_time: float,  # s
+        get_blocked_time: float,  # s
+        latency_histogram: "list[int]",
+    ) -> None:
+        self.items_in = items_in
+        self.items_out = items_out
+        self.items_removed = items_removed
+        self.depth = depth
+        self.peak_depth = peak_depth
+        self.put_blocked_time = put_blocked_time
+        self.get_blocked_time = get_blocked_time
+        self.latency_histogram = latency_histogram
+
+    def latency_percentile(self, percentile: float) -> float:
+        """
+        Upper bound of the latency bucket containing the percentile.
+
+        percentile: In the range [0, 100] .
+
+        Returns the latency in seconds, 0 if there are no items.
+        """
+        total = sum(self.latency_histogram)
+        if total == 0:
+            return 0.0
+
+        threshold = total * percentile / 100.0
+        count = 0
+        for i, bucket in enumerate(self.latency_histogram):
+            count += bucket
+            if count >= threshold:
+                return 2 ** (i + 1) / 1_000_000
+
+        return 2 ** len(self.latency_histogram) / 1_000_000
+
+    def __str__(self) -> str:
+        return (
+            f"in: {self.items_in}, out: {self.items_out}, removed: {self.items_removed}, "
+            f"depth: {self.depth}, peak depth: {self.peak_depth}, "
+            f"put blocked: {self.put_blocked_time:.3f}s, get blocked: {self.get_blocked_time:.3f}s, "
+            f"latency p50: {self.latency_percentile(50) * 1000:.3f}ms, "
+            f"p99: {self.latency_percentile(99) * 1000:.3f}ms"
+        )
+
+
+class QueueInstrumentation:
+    """
+    Counters shared by all processes using a queue.
+    A single uncontended lock is taken per record, so it is cheap enough to leave on.
+    """
+
+    __ITEMS_IN = 0
+    __ITEMS_OUT = 1
+    __ITEMS_REMOVED = 2
+    __DEPTH = 3
+    __PEAK_DEPTH = 4
+    __PUT_BLOCKED_NS = 5
+    __GET_BLOCKED_NS = 6
+    __HISTOGRAM_START = 7
+
+    # 2^23 us is over 8 seconds
+    __HISTOGRAM_BUCKETS = 24
+
+    def __init__(self) -> None:
+        """
+        Constructor creates the shared counters.
+        """
+        self.__counters = mp.Array("q", self.__HISTOGRAM_START + self.__HISTOGRAM_BUCKETS)
+
+    def reserve_put(self, count: int) -> None:
+        """
+        Adds items about to be put to the depth, before a consumer can get them.
+        Followed by `record_put()` if put, otherwise `cancel_put()`.
+
+        count: Number of items.
+        """
+        with self.__counters.get_lock():
+            self.__counters.get_obj()[self.__DEPTH] += count
+
+    def cancel_put(self, count: int) -> None:
+        """
+        Removes reserved items which were not put from the depth.
+
+        count: Number of items.
+        """
+        with self.__counters.get_lock():
+            self.__counters.get_obj()[self.__DEPTH] -= count
+
+    def record_put(self, count: int, blocked_ns: int) -> None:
+        """
+        Records reserved items added to the queue.
+
+        count: Number of items.
+        blocked_ns: Time spent in the put call in nanoseconds.
+        """
+        with self.__counters.get_lock():
+            counters = self.__counters.get_obj()
+            counters[self.__ITEMS_IN] += count
+            counters[self.__PUT_BLOCKED_NS] += blocked_ns
+            # Only items which were put count towards the peak
+            if counters[self.__DEPTH] > counters[self.__PEAK_DEPTH]:
+                counters[self.__PEAK_DEPTH] = counters[self.__DEPTH]
+
+    def record_get(self, count: int, blocked_ns: int, latency_ns: int) -> None:
+        """
+        Records items received by a consumer.
+
+        count: Number of items.
+        blocked_ns: Time spent in the get call in nanoseconds.
+        latency_ns: Time from put to get in nanoseconds, negative if unknown.
+        """
+        bucket = -1
+        if latency_ns >= 0 and count > 0:
+            bucket = min(
+                max(latency_ns // 1000, 1).bit_length() - 1,
+                self.__HISTOGRAM_BUCKETS - 1,
+            )
+
+        with self.__counters.get_lock():
+            counters = self.__counters.get_obj()
+            counters[self.__ITEMS_OUT] += count
+            counters[self.__DEPTH] -= count
+            counters[self.__GET_BLOCKED_NS] += blocked_ns
+            if bucket >= 0:
+                counters[self.__HISTOGRAM_START + bucket] += count
+
+    def record_remove(self, count: int) -> None:
+        """
+        Records items removed without reaching a consumer.
+
+        count: Number of items.
+        """
+        with self.__counters.get_lock():
+            counters = self.__counters.get_obj()
+            counters[self.__ITEMS_REMOVED] += count
+            counters[self.__DEPTH] -= count
+
+    def snapshot(self) -> QueueStatistics:
+        """
+        Copies the current counters.
+        """
+        with self.__counters.get_lock():
+            counters = self.__counters.get_obj()[:]
+
+        return QueueStatistics(
+            counters[self.__ITEMS_IN],
+            counters[self.__ITEMS_OUT],
+            counters[self.__ITEMS_REMOVED],
+            counters[self.__DEPTH],
+            counters[self.__PEAK_DEPTH],
+            counters[self.__PUT_BLOCKED_NS] / 1e9,
+            counters[self.__GET_BLOCKED_NS] / 1e9,
+            counters[self.__HISTOGRAM_START :],
+        )
@@ -0,0 +1,278 @@
+"""
+Shared memory queue.
+"""
+
+import multiprocessing as mp
+import multiprocessing.managers
+import multiprocessing.shared_memory
+import pickle
+import queue
+import struct
+
+from . import queue_proxy_wrapper
+
+
+class SharedMemoryRingBuffer:
+    """
+    Single producer single consumer ring buffer in shared memory.
+
+    Items are pickled into fixed size slots. A semaphore counts published slots and another
+    counts free slots, so a blocked consumer or producer sleeps until the other side releases
+    one. Releasing after writing a slot and acquiring before reading it are full memory barriers,
+    so a slot is never read before it is written, on any architecture.
+    Has the same interface as `queue.Queue` for the methods used by workers.
+    """
+
+    # Head and tail are on separate cache lines to avoid false sharing
+    __HEAD_OFFSET = 0
+    __TAIL_OFFSET = 64
+    __CLOSED_OFFSET = 128
+    __HEADER_SIZE = 192
+
+    __INDEX_FORMAT = "=Q"
+    __LENGTH_FORMAT = "=I"
+    __LENGTH_SIZE = struct.calcsize(__LENGTH_FORMAT)
+
+    def __init__(self, capacity: int, slot_size: int) -> None:
+        """
+        Constructor creates the shared memory block.
+
+        capacity: Number of slots, must be greater than 0 .
+        slot_size: Maximum pickled item size in bytes, must be greater than 0 .
+        """
+        assert capacity > 0, "Capacity must be greater than 0"
+        assert slot_size > 0, "Slot size must be greater than 0"
+
+        self.__capacity = capacity
+        self.__stride = slot_size + self.__LENGTH_SIZE
+        self.__shared_memory = multiprocessing.shared_memory.SharedMemory(
+            create=True,
+            size=self.__HEADER_SIZE + capacity * self.__stride,
+        )
+        self.__shared_memory.buf[: self.__HEADER_SIZE] = bytes(self.__HEADER_SIZE)
+
+        self.__published_slots = mp.Semaphore(0)
+        self.__free_slots = mp.Semaphore(capacity)
+
+    def __read_index(self, offset: int) -> int:
+        return struct.unpack_from(self.__INDEX_FORMAT, self.__shared_memory.buf, offset)[0]
+
+    def __write_index(self, offset: int, value: int) -> None:
+        struct.pack_into(self.__INDEX_FORMAT, self.__shared_memory.buf, offset, value)
+
+    def is_closed(self) -> bool:
+        """
+        Whether the ring buffer has been closed.
+        """
+        return self.__read_index(self.__CLOSED_OFFSET) != 0
+
+    def close(self) -> None:
+        """
+        Closes the ring buffer.
+        Blocked and future `get()` return the sentinel (None), and `put()` raises queue.Full.
+        Safe to call from any process.
+        """
+        self.__write_index(self.__CLOSED_OFFSET, 1)
+        # Wake the blocked consumer and producer, if any
+        self.__published_slots.release()
+        self.__free_slots.release()
+
+    def put(self, item: object, block: bool = True, timeout: "float | None" = None) -> None:
+        """
+        Puts an item. Only one process may put.
+
+        Raises queue.Full if there is no free slot before the timeout or if closed,
+        and ValueError if the pickled item does not fit in a slot.
+        """
+        data = pickle.dumps(item, pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.__stride - self.__LENGTH_SIZE:
+            raise ValueError(
+                f"Item of {len(data)} bytes exceeds slot size of {self.__stride - self.__LENGTH_SIZE} bytes"
+            )
+
+        if self.is_closed():
+            raise queue.Full
+
+        if not self.__free_slots.acquire(block, timeout):
+            raise queue.Full
+
+        if self.is_closed():
+            raise queue.Full
+
+        tail = self.__read_index(self.__TAIL_OFFSET)
+        offset = self.__HEADER_SIZE + (tail % self.__capacity) * self.__stride
+        buffer = self.__shared_memory.buf
+        struct.pack_into(self.__LENGTH_FORMAT, buffer, offset, len(data))
+        start = offset + self.__LENGTH_SIZE
+        buffer[start : start + len(data)] = data
+        self.__write_index(self.__TAIL_OFFSET, tail + 1)
+
+        # Publish only after the slot is written
+        self.__published_slots.release()
+
+    def get(self, block: bool = True, timeout: "float | None" = None) -> object:
+        """
+        Gets an item. Only one process may get.
+
+        Raises queue.Empty if there is no item before the timeout.
+        Returns the sentinel (None) if closed.
+        """
+        if self.is_closed():
+            return None
+
+        if not self.__published_slots.acquire(block, timeout):
+            raise queue.Empty
+
+        if self.is_closed():
+            return None
+
+        head = self.__read_index(self.__HEAD_OFFSET)
+        offset = self.__HEADER_SIZE + (head % self.__capacity) * self.__stride
+        buffer = self.__shared_memory.buf
+        length = struct.unpack_from(self.__LENGTH_FORMAT, buffer, offset)[0]
+        start = offset + self.__LENGTH_SIZE
+        item = pickle.loads(buffer[start : start + length])
+        self.__write_index(self.__HEAD_OFFSET, head + 1)
+
+        # Release the slot only after it is read
+        self.__free_slots.release()
+
+        return item
+
+    def put_nowait(self, item: object) -> None:
+        """
+        Puts an item without blocking.
+        """
+        self.put(item, block=False)
+
+    def get_nowait(self) -> object:
+        """
+        Gets an item without blocking.
+        """
+        return self.get(block=False)
+
+    def qsize(self) -> int:
+        """
+        Approximate number of items.
+        """
+        return self.__read_index(self.__TAIL_OFFSET) - self.__read_index(self.__HEAD_OFFSET)
+
+    def empty(self) -> bool:
+        """
+        Whether the ring buffer is approximately empty.
+        """
+        return self.qsize() <= 0
+
+    def full(self) -> bool:
+        """
+        Whether the ring buffer is approximately full.
+        """
+        return self.qsize() >= self.__capacity
+
+    def unlink(self) -> None:
+        """
+        Releases the shared memory block. Call once after all processes are done.
+        """
+        self.__shared_memory.close()
+        self.__shared_memory.unlink()
+
+
+class SharedMemoryQueueWrapper(queue_proxy_wrapper.QueueProxyWrapper):
+    """
+    Drop-in replacement for QueueProxyWrapper backed by a shared memory ring buffer
+    instead of a manager process.
+
+    Only one producer process and one consumer process may use the queue,
+    so conflating and overflow policies which drop queued items are not supported.
+    `maxsize <= 0` means the default capacity, since shared memory is bounded.
+    """
+
+    __DEFAULT_CAPACITY = 1024
+    __DEFAULT_SLOT_SIZE = 4096  # bytes
+
+    def __init__(
+        self,
+        mp_manager: "multiprocessing.managers.SyncManager | None" = None,
+        maxsize: int = 0,
+        batch_size: int = 0,
+        batch_timeout: float = -1.0,
+        conflate: bool = False,
+        instrument: bool = False,
+        overflow_policy: queue_proxy_wrapper.OverflowPolicy = queue_proxy_wrapper.OverflowPolicy.BLOCK,
+        put_timeout: float = 0.0,
+        slot_size: int = __DEFAULT_SLOT_SIZE,
+    ) -> None:
+        """
+        Same arguments as QueueProxyWrapper, so either can be created the same way.
+
+        mp_manager: Unused, the ring buffer does not need a manager.
+        maxsize: Number of slots.
+        batch_size: Default maximum number of items for `get_many()`, 0 or less for default.
+        batch_timeout: Default time in seconds `get_many()` waits, negative for default.
+        conflate: Not supported, must be False.
+        instrument: Record statistics, see `get_statistics()`.
+        overflow_policy: What to do when full, BLOCK, BLOCK_TIMEOUT, or DROP_NEWEST.
+        put_timeout: Time in seconds BLOCK_TIMEOUT waits, must be greater than 0 .
+        slot_size: Maximum pickled item size in bytes, a batch must fit in a slot.
+        """
+        assert not conflate, "Producer cannot drop queued items"
+        assert overflow_policy in (
+            queue_proxy_wrapper.OverflowPolicy.BLOCK,
+            queue_proxy_wrapper.OverflowPolicy.BLOCK_TIMEOUT,
+            queue_proxy_wrapper.OverflowPolicy.DROP_NEWEST,
+        ), "Producer cannot drop queued items"
+
+        self.__slot_size = slot_size
+        super().__init__(
+            mp_manager,  # type: ignore
+            maxsize,
+            batch_size,
+            batch_timeout,
+            instrument=instrument,
+            overflow_policy=overflow_policy,
+            put_timeout=put_timeout,
+        )
+
+    def _create_queue(
+        self, mp_manager: multiprocessing.managers.SyncManager, maxsize: int
+    ) -> SharedMemoryRingBuffer:
+        """
+        Creates the ring buffer.
+        """
+        capacity = maxsize if maxsize > 0 else self.__DEFAULT_CAPACITY
+        return SharedMemoryRingBuffer(capacity, self.__slot_size)
+
+    def shutdown(self, timeout: float = 0.0) -> "tuple[bool, int]":
+        """
+        Closes the ring buffer so blocked and future gets receive the sentinel (None)
+        and blocked and future puts are discarded.
+        Main draining would add a third process to the ring buffer, so items are left in place.
+
+        timeout: Unused, closing does not wait.
+
+        Returns True and the number of items discarded.
+        """
+        discarded = self.queue.qsize()
+        self._mark_closed(discarded)
+        self.queue.close()
+        return True, discarded
+
+    def fill_queue_with_sentinel(self, timeout: float = 0.0) -> None:
+        """
+        Main filling would add a second producer to the ring buffer, so closes it instead,
+        see `shutdown()`.
+        """
+        self.shutdown(timeout)
+
+    def drain_queue(self, timeout: float = 0.0) -> None:
+        """
+        Main draining would add a second consumer to the ring buffer, so closes it instead,
+        see `shutdown()`.
+        """
+        self.shutdown(timeout)
+
+    def unlink(self) -> None:
+        """
+        Releases the shared memory. Call once after joining all workers.
+        """
+        self.queue.unlink()
@@ -2,8 +2,8 @@
 For controlling workers.
 """
 
+import ctypes
 import multiprocessing as mp
-import time
 
 
 class WorkerController:
@@ -12,61 +12,101 @@ class WorkerController:
     Contains exit and pause requests.
     """
 
-    __QUEUE_DELAY = 0.1  # seconds
-
     def __init__(self) -> None:
         """
-        Constructor creates internal queue and semaphore.
+        Constructor creates internal flags, event and condition.
         """
-        self.__pause = mp.BoundedSemaphore(1)
-        self.__is_paused = False
-        self.__exit_queue = mp.Queue(1)
+        # Flags are read without locking in worker loops
+        self.__pause_flag = mp.RawValue(ctypes.c_bool, False)
+        self.__exit_flag = mp.RawValue(ctypes.c_bool, False)
+        # Event wakes workers waiting for exit
+        self.__exit_event = mp.Event()
+        # Condition protects the parked count and wakes paused workers and main
+        self.__pause_condition = mp.Condition()
+        self.__parked_count = mp.RawValue(ctypes.c_int, 0)
 
-    def request_pause(self) -> None:
+    def request_pause(self, worker_count: int = 0, timeout: "float | None" = None) -> bool:
         """
         Requests worker processes to pause.
+        Optionally waits until workers are parked in `check_pause()`.
+
+        worker_count: Number of workers to wait for, 0 or less to not wait.
+        timeout: Time waiting in seconds before giving up, None waits forever.
+
+        Returns whether the workers are parked.
         """
-        if not self.__is_paused:
-            self.__pause.acquire()
-            self.__is_paused = True
+        with self.__pause_condition:
+            self.__pause_flag.value = True
+            if worker_count <= 0:
+                return True
+
+            return self.__pause_condition.wait_for(
+                lambda: self.__parked_count.value >= worker_count, timeout
+            )
 
     def request_resume(self) -> None:
         """
         Requests worker processes to resume.
         """
-        if self.__is_paused:
-            self.__pause.release()
-            self.__is_paused = False
+        with self.__pause_condition:
+            self.__pause_flag.value = False
+            self.__pause_condition.notify_all()
 
     def check_pause(self) -> None:
         """
         Blocks worker if main has requested it to pause, otherwise continues.
+        Only reads shared memory if not paused, so it is cheap to call every loop.
+        Paused workers also continue if main requests exit.
+        """
+        if not self.__pause_flag.value:
+            return
+
+        with self.__pause_condition:
+            self.__parked_count.value += 1
+            self.__pause_condition.notify_all()
+            self.__pause_condition.wait_for(
+                lambda: not self.__pause_flag.value or self.__exit_flag.value
+            )
+            self.__parked_count.value -= 1
+
+    def get_parked_count(self) -> int:
         """
-        self.__pause.acquire()
-        self.__pause.release()
+        Returns the number of workers currently paused.
+        """
+        return self.__parked_count.value
 
     def request_exit(self) -> None:
         """
-        Requests worker processes to exit.
+        Requests worker processes to exit and wakes workers waiting for exit.
         Does nothing if already requested.
         """
-        time.sleep(self.__QUEUE_DELAY)
-        if self.__exit_queue.empty():
-            self.__exit_queue.put(None)
+        self.__exit_flag.value = True
+        self.__exit_event.set()
+        with self.__pause_condition:
+            self.__pause_condition.notify_all()
 
     def clear_exit(self) -> None:
         """
         Clears the exit request condition.
         Does nothing if already cleared.
         """
-        time.sleep(self.__QUEUE_DELAY)
-        if not self.__exit_queue.empty():
-            _ = self.__exit_queue.get()
+        self.__exit_event.clear()
+        self.__exit_flag.value = False
 
     def is_exit_requested(self) -> bool:
         """
         Returns whether main has requested the worker process to exit.
-        There is a race condition, but it's fine because the worker process
-        will do at most 1 additional loop.
+        Only reads shared memory, so it is cheap to call every loop.
+        """
+        return self.__exit_flag.value
+
+    def wait_for_exit(self, timeout: float) -> bool:
+        """
+        Sleeps until main requests exit or the timeout passes.
+        Use instead of `time.sleep()` so workers stop immediately.
+
+        timeout: Time waiting in seconds.
+
+        Returns whether main has requested the worker process to exit.
         """
-        return not self.__exit_queue.empty()
+        return self.__exit_event.wait(timeout)